@@ -0,0 +1,321 @@
+"""baseline
+
+Schema as created by ``Base.metadata.create_all`` before migrations were
+introduced. Databases that were created that way are adopted with
+``alembic stamp 0001`` followed by ``alembic upgrade head``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 04:07:02.849480
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('role', sa.Enum('ATHLETE', 'TRAINER', 'ADMIN', name='userrole'), nullable=False),
+    sa.Column('is_locked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table('activities',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('external_id', sa.String(), nullable=True),
+    sa.Column('activity_type', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('activity_date', sa.DateTime(), nullable=False),
+    sa.Column('duration_minutes', sa.Float(), nullable=True),
+    sa.Column('distance_km', sa.Float(), nullable=True),
+    sa.Column('elevation_m', sa.Float(), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=True),
+    sa.Column('heart_rate_avg', sa.Integer(), nullable=True),
+    sa.Column('heart_rate_max', sa.Integer(), nullable=True),
+    sa.Column('power_avg', sa.Integer(), nullable=True),
+    sa.Column('power_max', sa.Integer(), nullable=True),
+    sa.Column('cadence_avg', sa.Integer(), nullable=True),
+    sa.Column('speed_avg_kmh', sa.Float(), nullable=True),
+    sa.Column('speed_max_kmh', sa.Float(), nullable=True),
+    sa.Column('data_json', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_activities_external_id', 'activities', ['external_id'], unique=False)
+    op.create_index('ix_activities_id', 'activities', ['id'], unique=False)
+
+    op.create_table('goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('goal_type', sa.String(), nullable=False),
+    sa.Column('target_value', sa.Float(), nullable=True),
+    sa.Column('current_value', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('target_date', sa.DateTime(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_goals_id', 'goals', ['id'], unique=False)
+
+    op.create_table('integrations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(), nullable=False),
+    sa.Column('access_token', sa.Text(), nullable=False),
+    sa.Column('refresh_token', sa.Text(), nullable=True),
+    sa.Column('token_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('athlete_id', sa.String(), nullable=True),
+    sa.Column('connected_at', sa.DateTime(), nullable=True),
+    sa.Column('last_sync', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_integrations_id', 'integrations', ['id'], unique=False)
+
+    op.create_table('invite_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('role', sa.Enum('ATHLETE', 'TRAINER', 'ADMIN', name='userrole'), nullable=False),
+    sa.Column('created_by_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('used_at', sa.DateTime(), nullable=True),
+    sa.Column('used_by_id', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['used_by_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_invite_tokens_id', 'invite_tokens', ['id'], unique=False)
+    op.create_index('ix_invite_tokens_token', 'invite_tokens', ['token'], unique=True)
+
+    op.create_table('messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('recipient_id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_messages_id', 'messages', ['id'], unique=False)
+
+    op.create_table('nutrition_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('meal_type', sa.String(), nullable=True),
+    sa.Column('calories', sa.Integer(), nullable=True),
+    sa.Column('protein_g', sa.Float(), nullable=True),
+    sa.Column('carbs_g', sa.Float(), nullable=True),
+    sa.Column('fat_g', sa.Float(), nullable=True),
+    sa.Column('water_ml', sa.Integer(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('log_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_nutrition_logs_id', 'nutrition_logs', ['id'], unique=False)
+
+    op.create_table('rides',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('distance_km', sa.Float(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('elevation_gain_m', sa.Float(), nullable=True),
+    sa.Column('avg_speed_kmh', sa.Float(), nullable=True),
+    sa.Column('max_speed_kmh', sa.Float(), nullable=True),
+    sa.Column('avg_power_watts', sa.Integer(), nullable=True),
+    sa.Column('avg_heart_rate', sa.Integer(), nullable=True),
+    sa.Column('max_heart_rate', sa.Integer(), nullable=True),
+    sa.Column('avg_cadence', sa.Integer(), nullable=True),
+    sa.Column('ride_date', sa.DateTime(), nullable=False),
+    sa.Column('route_name', sa.String(), nullable=True),
+    sa.Column('ride_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rides_id', 'rides', ['id'], unique=False)
+
+    op.create_table('trainer_athlete_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('athlete_id', sa.Integer(), nullable=False),
+    sa.Column('assigned_at', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['trainer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_trainer_athlete_assignments_id', 'trainer_athlete_assignments', ['id'], unique=False)
+
+    op.create_table('trainer_athlete_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('athlete_id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('message', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('responded_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['trainer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_trainer_athlete_requests_id', 'trainer_athlete_requests', ['id'], unique=False)
+
+    op.create_table('training_plans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('athlete_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('end_date', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['trainer_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_training_plans_id', 'training_plans', ['id'], unique=False)
+
+    op.create_table('workouts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('workout_type', sa.String(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('intensity', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('workout_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_workouts_id', 'workouts', ['id'], unique=False)
+
+    op.create_table('nutrition_plans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('training_plan_id', sa.Integer(), nullable=False),
+    sa.Column('day_of_week', sa.String(), nullable=True),
+    sa.Column('meal_type', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('calories', sa.Float(), nullable=True),
+    sa.Column('protein_grams', sa.Float(), nullable=True),
+    sa.Column('carbs_grams', sa.Float(), nullable=True),
+    sa.Column('fat_grams', sa.Float(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['training_plan_id'], ['training_plans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_nutrition_plans_id', 'nutrition_plans', ['id'], unique=False)
+
+    op.create_table('planned_goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('training_plan_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('goal_type', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('target_value', sa.Float(), nullable=True),
+    sa.Column('current_value', sa.Float(), nullable=True),
+    sa.Column('unit', sa.String(), nullable=True),
+    sa.Column('target_date', sa.DateTime(), nullable=True),
+    sa.Column('is_achieved', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['training_plan_id'], ['training_plans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_planned_goals_id', 'planned_goals', ['id'], unique=False)
+
+    op.create_table('planned_workouts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('training_plan_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('workout_type', sa.String(), nullable=False),
+    sa.Column('scheduled_date', sa.DateTime(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('intensity', sa.String(), nullable=True),
+    sa.Column('exercises', sa.Text(), nullable=True),
+    sa.Column('is_completed', sa.Boolean(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['training_plan_id'], ['training_plans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_planned_workouts_id', 'planned_workouts', ['id'], unique=False)
+
+    op.create_table('training_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('training_plan_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['training_plan_id'], ['training_plans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_training_documents_id', 'training_documents', ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    # Dropping a table drops its indexes too
+    op.drop_table('training_documents')
+    op.drop_table('planned_workouts')
+    op.drop_table('planned_goals')
+    op.drop_table('nutrition_plans')
+    op.drop_table('workouts')
+    op.drop_table('training_plans')
+    op.drop_table('trainer_athlete_requests')
+    op.drop_table('trainer_athlete_assignments')
+    op.drop_table('rides')
+    op.drop_table('nutrition_logs')
+    op.drop_table('messages')
+    op.drop_table('invite_tokens')
+    op.drop_table('integrations')
+    op.drop_table('goals')
+    op.drop_table('activities')
+    op.drop_table('users')
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,64 @@
+"""performance indexes
+
+Composite indexes matched to the filters and sort orders the routers use:
+per-user lists ordered by (date, id), unread/inbox message lookups,
+trainer/athlete permission checks and plan child collections.
+
+On PostgreSQL the indexes are built CONCURRENTLY (outside a transaction)
+so existing tables stay writable while they build. IF NOT EXISTS makes the
+migration safe on databases where ``create_all`` already created some of
+them.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 04:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # Paginated per-user lists (app.api.pagination), read newest first by a backward scan
+    ('ix_rides_user_date', 'rides', ['user_id', 'ride_date', 'id']),
+    ('ix_workouts_user_date', 'workouts', ['user_id', 'workout_date', 'id']),
+    ('ix_nutrition_logs_user_date', 'nutrition_logs', ['user_id', 'log_date', 'id']),
+    ('ix_goals_user', 'goals', ['user_id', 'id']),
+    ('ix_activities_user_date', 'activities', ['user_id', 'activity_date', 'id']),
+    ('ix_integrations_user_provider', 'integrations', ['user_id', 'provider']),
+    # Messaging
+    ('ix_messages_recipient_unread', 'messages', ['recipient_id', 'is_read']),
+    ('ix_messages_pair', 'messages', ['sender_id', 'recipient_id', 'created_at']),
+    # Trainer/athlete relationships
+    ('ix_assignments_trainer_active', 'trainer_athlete_assignments', ['trainer_id', 'is_active']),
+    ('ix_assignments_athlete_active', 'trainer_athlete_assignments', ['athlete_id', 'is_active']),
+    ('ix_trainer_requests_trainer_status', 'trainer_athlete_requests', ['trainer_id', 'status']),
+    ('ix_trainer_requests_athlete_status', 'trainer_athlete_requests', ['athlete_id', 'status']),
+    # Training plans and their children
+    ('ix_training_plans_athlete_active', 'training_plans', ['athlete_id', 'is_active']),
+    ('ix_training_plans_trainer_active', 'training_plans', ['trainer_id', 'is_active']),
+    ('ix_planned_workouts_plan_date', 'planned_workouts', ['training_plan_id', 'scheduled_date']),
+    ('ix_planned_goals_training_plan_id', 'planned_goals', ['training_plan_id']),
+    ('ix_nutrition_plans_training_plan_id', 'nutrition_plans', ['training_plan_id']),
+    ('ix_training_documents_training_plan_id', 'training_documents', ['training_plan_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,58 @@
+"""conversation state
+
+Per-participant inbox rows (latest message, unread count) maintained by
+app.core.conversation_state, backfilled here from existing messages.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 05:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('conversation_state',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('partner_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_at', sa.DateTime(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ),
+    sa.ForeignKeyConstraint(['partner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'partner_id')
+    )
+    op.create_index('ix_conversation_state_inbox', 'conversation_state', ['user_id', 'last_message_at'], unique=False)
+
+    # Each message contributes to the sender's row and (with its unread flag) to the recipient's row
+    op.execute("""
+        INSERT INTO conversation_state (user_id, partner_id, last_message_id, last_message_at, unread_count)
+        SELECT p.user_id, p.partner_id, p.last_id, COALESCE(m.created_at, CURRENT_TIMESTAMP), p.unread
+        FROM (
+            SELECT user_id, partner_id, MAX(id) AS last_id, SUM(unread) AS unread
+            FROM (
+                SELECT sender_id AS user_id, recipient_id AS partner_id, id, 0 AS unread
+                FROM messages
+                UNION ALL
+                SELECT recipient_id, sender_id, id, CASE WHEN is_read = false THEN 1 ELSE 0 END
+                FROM messages
+            ) AS directed
+            GROUP BY user_id, partner_id
+        ) AS p
+        JOIN messages AS m ON m.id = p.last_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('conversation_state')
@@ -0,0 +1,34 @@
+"""message thread index
+
+Thread pages are keyed on message id (before_id cursor), so the per-direction
+index ends in id rather than created_at.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 05:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_messages_thread', 'messages', ['sender_id', 'recipient_id', 'id'],
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_messages_pair', table_name='messages', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_messages_pair', 'messages', ['sender_id', 'recipient_id', 'created_at'],
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_messages_thread', table_name='messages', if_exists=True, postgresql_concurrently=True)
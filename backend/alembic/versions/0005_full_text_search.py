@@ -0,0 +1,66 @@
+"""full text search
+
+Generated ``search_vector`` tsvector columns (titles weighted above
+descriptions) with GIN indexes, queried by app.core.search. PostgreSQL
+maintains the columns on every insert and update, so nothing in the app
+writes them. PostgreSQL only: other databases keep the tables as they are
+and search falls back to LIKE matching.
+
+Adding a STORED generated column rewrites the table under an exclusive
+lock, so on large tables run this in a maintenance window. The GIN indexes
+are then built CONCURRENTLY.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 06:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _weighted(title: str, body: str) -> str:
+    return (
+        f"setweight(to_tsvector('english'::regconfig, coalesce({title}, '')), 'A') || "
+        f"setweight(to_tsvector('english'::regconfig, coalesce({body}, '')), 'B')"
+    )
+
+
+SEARCH_VECTORS = [
+    ('messages', "to_tsvector('english'::regconfig, coalesce(content, ''))"),
+    ('training_plans', _weighted('title', 'description')),
+    ('planned_workouts', _weighted('title', 'description')),
+    ('rides', _weighted('title', 'route_name')),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, expression in SEARCH_VECTORS:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+    with op.get_context().autocommit_block():
+        for table, _ in SEARCH_VECTORS:
+            op.create_index(f'ix_{table}_search', table, ['search_vector'], postgresql_using='gin',
+                            if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for table, _ in SEARCH_VECTORS:
+            op.drop_index(f'ix_{table}_search', table_name=table, if_exists=True, postgresql_concurrently=True)
+    for table, _ in SEARCH_VECTORS:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
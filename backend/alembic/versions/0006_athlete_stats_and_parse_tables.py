@@ -0,0 +1,89 @@
+"""athlete stats and parse tables
+
+Creates the tables added alongside the migration baseline: the athlete_stats
+rollup (app.core.athlete_stats), the parsed_documents PDF parse cache and
+the parse_jobs queue. Earlier copies of 0001 created them too, so tables that
+already exist are left alone.
+
+athlete_stats starts empty; rows are built on first read or write for each
+athlete, or all at once with ``python -m app.core.athlete_stats``.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 07:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'parsed_documents' not in existing:
+        op.create_table('parsed_documents',
+        sa.Column('cache_key', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('prompt_version', sa.String(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('cache_key')
+        )
+        op.create_index('ix_parsed_documents_content_hash', 'parsed_documents', ['content_hash'], unique=False)
+        op.create_index('ix_parsed_documents_last_used_at', 'parsed_documents', ['last_used_at'], unique=False)
+
+    if 'athlete_stats' not in existing:
+        op.create_table('athlete_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_rides', sa.Integer(), nullable=False),
+        sa.Column('total_distance_km', sa.Float(), nullable=False),
+        sa.Column('last_ride_date', sa.DateTime(), nullable=True),
+        sa.Column('total_workouts', sa.Integer(), nullable=False),
+        sa.Column('last_workout_date', sa.DateTime(), nullable=True),
+        sa.Column('total_goals', sa.Integer(), nullable=False),
+        sa.Column('completed_goals', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+        )
+
+    if 'parse_jobs' not in existing:
+        op.create_table('parse_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('pdf_content', sa.LargeBinary(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('cached', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_parse_jobs_id', 'parse_jobs', ['id'], unique=False)
+        op.create_index('ix_parse_jobs_status', 'parse_jobs', ['status'], unique=False)
+        op.create_index('ix_parse_jobs_user_id', 'parse_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('parse_jobs')
+    op.drop_table('athlete_stats')
+    op.drop_table('parsed_documents')
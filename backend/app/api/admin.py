@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from typing import List
 from datetime import datetime, timedelta
 
-from app.db.base import get_db
+from app.db.base import get_db, get_async_db, engine, async_engine
+from app.db.pool import pool_status
 from app.models.user import User, UserRole
 from app.models.trainer_athlete import TrainerAthleteAssignment
 from app.models.training_plan import TrainingPlan
@@ -19,16 +21,21 @@ from app.schemas.trainer_athlete import (
     TrainerAssignmentCreate,
 )
 from app.schemas.invite_token import InviteTokenCreate, InviteTokenResponse
-from app.api.deps import get_admin
-from app.core.security import get_password_hash
+from app.api.deps import get_admin, get_admin_async
+from app.api.pagination import PageParams, paginate
+from app.core.security import get_password_hash_async, password_hasher
+from app.core.user_cache import invalidate_cached_user
+from app.core import parse_cache
+from app.core.realtime import message_hub
+from app.core.unread_cache import unread_cache_stats
 
 router = APIRouter()
 
 
 @router.get("/users", response_model=List[UserSchema])
 def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     role: str = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin),
@@ -40,8 +47,7 @@ def get_all_users(
             query = query.filter(User.role == role_enum)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid role")
-    users = query.offset(skip).limit(limit).all()
-    return users
+    return paginate(query, (User.id,), page, response, descending=False)
 
 
 @router.get("/users/{user_id}", response_model=UserSchema)
@@ -57,16 +63,16 @@ def get_user_by_id(
 
 
 @router.post("/users", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     role: UserRole = UserRole.ATHLETE,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_admin_async),
 ):
-    existing = db.query(User).filter(User.email == user_data.email).first()
-    if existing:
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    if result.scalars().first():
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -74,8 +80,8 @@ def create_user(
         role=role,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
@@ -104,6 +110,7 @@ def change_user_role(
     user.role = role_data.role
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user.email)
     return user
 
 
@@ -122,6 +129,7 @@ def lock_unlock_user(
     user.is_locked = lock_data.locked
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user.email)
     return user
 
 
@@ -144,8 +152,10 @@ def delete_user(
         ).count()
         if other_admins == 0:
             raise HTTPException(status_code=400, detail="Cannot delete the last admin")
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_cached_user(email)
     return None
 
 
@@ -171,8 +181,8 @@ def create_invite(
 
 @router.get("/invites", response_model=List[InviteTokenResponse])
 def get_invites(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     active_only: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_admin),
@@ -184,8 +194,8 @@ def get_invites(
             InviteToken.used_at == None,
             InviteToken.expires_at > datetime.utcnow()
         )
-    invites = query.order_by(InviteToken.created_at.desc()).offset(skip).limit(limit).all()
-    return invites
+    # Newest first; ids follow creation order and, unlike created_at, are never NULL
+    return paginate(query, (InviteToken.id,), page, response)
 
 
 @router.delete("/invites/{invite_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -293,3 +303,46 @@ def get_system_stats(
         total_workouts=total_workouts,
         total_goals=total_goals,
     )
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(get_admin),
+):
+    """Live connection pool occupancy and checkout wait metrics"""
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+    }
+
+
+@router.get("/password-hashing")
+def get_password_hashing_stats(
+    current_user: User = Depends(get_admin),
+):
+    """bcrypt worker pool queue depth and hash latency"""
+    return password_hasher.stats()
+
+
+@router.get("/parse-cache")
+async def get_parse_cache_stats(
+    current_user: User = Depends(get_admin_async),
+):
+    """Training-plan PDF parse cache size and hit/miss counters"""
+    return await parse_cache.cache_stats()
+
+
+@router.get("/realtime")
+def get_realtime_stats(
+    current_user: User = Depends(get_admin),
+):
+    """Open message sockets on this worker and pub/sub event counters"""
+    return message_hub.stats()
+
+
+@router.get("/unread-cache")
+def get_unread_cache_stats(
+    current_user: User = Depends(get_admin),
+):
+    """Unread-count cache size and hit/miss counters on this worker"""
+    return unread_cache_stats()
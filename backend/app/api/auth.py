@@ -1,43 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
 
-from app.db.base import get_db
+from app.db.base import get_db, get_async_db
 from app.models.user import User, UserRole
 from app.models.invite_token import InviteToken
 from app.schemas.user import UserCreateWithInvite, User as UserSchema, Token
 from app.schemas.invite_token import InviteTokenPublic
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     decode_access_token,
 )
 from app.core.config import settings
+from app.core.user_cache import get_cached_user, cache_user
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _email_from_token(token: str) -> str:
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     email: str = payload.get("sub")
     if email is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return email
 
-    user = db.query(User).filter(User.email == email).first()
+
+def _ensure_usable(user: Optional[User]) -> User:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     if user.is_locked:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -46,9 +53,36 @@ async def get_current_user(
     return user
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> User:
+    email = _email_from_token(token)
+    user = get_cached_user(email)
+    if user is None:
+        user = db.query(User).filter(User.email == email).first()
+        if user is not None:
+            cache_user(user)
+    return _ensure_usable(user)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Async variant of get_current_user for routes that use an AsyncSession"""
+    email = _email_from_token(token)
+    user = get_cached_user(email)
+    if user is None:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+        if user is not None:
+            cache_user(user)
+    return _ensure_usable(user)
+
+
 @router.post("/register", response_model=UserSchema)
-def register(user_in: UserCreateWithInvite, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def register(user_in: UserCreateWithInvite, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == user_in.email))
+    user = result.scalars().first()
     if user:
         raise HTTPException(
             status_code=400,
@@ -60,9 +94,10 @@ def register(user_in: UserCreateWithInvite, db: Session = Depends(get_db)):
 
     # Check invite token if provided
     if user_in.invite_token:
-        invite = db.query(InviteToken).filter(
+        result = await db.execute(select(InviteToken).where(
             InviteToken.token == user_in.invite_token
-        ).first()
+        ))
+        invite = result.scalars().first()
         
         if not invite:
             raise HTTPException(status_code=400, detail="Invalid invite token")
@@ -83,7 +118,7 @@ def register(user_in: UserCreateWithInvite, db: Session = Depends(get_db)):
         
         role = invite.role
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -91,24 +126,25 @@ def register(user_in: UserCreateWithInvite, db: Session = Depends(get_db)):
         role=role,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     # Mark invite as used
     if invite:
         invite.used_at = datetime.utcnow()
         invite.used_by_id = user.id
-        db.commit()
+        await db.commit()
 
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.scalars().first()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -1,17 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
+import json
 
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.models.user import User
 from app.models.ride import Ride
 from app.models.workout import Workout
 from app.models.goal import Goal
 from app.models.training_plan import TrainingPlan, PlannedWorkout
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user_async
 from app.core.claude_service import claude_service
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -25,46 +29,42 @@ class ChatResponse(BaseModel):
     success: bool
 
 
-@router.post("/", response_model=ChatResponse)
-async def chat_with_ai(
-    chat: ChatMessage,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Chat with AI about training progress and recommendations"""
-
+def _ensure_ai_available() -> None:
     if not claude_service.is_available():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="AI service not configured. Please set ANTHROPIC_API_KEY."
         )
 
-    # Gather user context
-    week_ago = datetime.utcnow() - timedelta(days=7)
+
+async def _build_prompt(db: AsyncSession, current_user: User, message: str) -> str:
+    """Assemble the assistant prompt from the user's recent training context"""
+    # Gather user context since midnight a week ago (asyncpg needs a datetime, not a date)
+    week_ago = (datetime.utcnow() - timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
 
     # Recent rides
-    recent_rides = db.query(Ride).filter(
+    recent_rides = (await db.execute(select(Ride).where(
         Ride.user_id == current_user.id,
-        Ride.ride_date >= week_ago.date()
-    ).all()
+        Ride.ride_date >= week_ago
+    ))).scalars().all()
 
     # Recent workouts
-    recent_workouts = db.query(Workout).filter(
+    recent_workouts = (await db.execute(select(Workout).where(
         Workout.user_id == current_user.id,
-        Workout.workout_date >= week_ago.date()
-    ).all()
+        Workout.workout_date >= week_ago
+    ))).scalars().all()
 
     # Active goals
-    active_goals = db.query(Goal).filter(
+    active_goals = (await db.execute(select(Goal).where(
         Goal.user_id == current_user.id,
         Goal.is_completed == False
-    ).all()
+    ))).scalars().all()
 
     # Current training plan
-    training_plan = db.query(TrainingPlan).filter(
+    training_plan = (await db.execute(select(TrainingPlan).where(
         TrainingPlan.athlete_id == current_user.id,
         TrainingPlan.is_active == True
-    ).first()
+    ).limit(1))).scalars().first()
 
     # Build context
     context_parts = []
@@ -88,35 +88,49 @@ async def chat_with_ai(
 
     if training_plan:
         context_parts.append(f"Current plan: {training_plan.title}")
-        upcoming = db.query(PlannedWorkout).filter(
+        upcoming = (await db.execute(select(PlannedWorkout).where(
             PlannedWorkout.training_plan_id == training_plan.id,
             PlannedWorkout.is_completed == False
-        ).order_by(PlannedWorkout.scheduled_date).limit(3).all()
+        ).order_by(PlannedWorkout.scheduled_date).limit(3))).scalars().all()
         if upcoming:
             context_parts.append(f"Upcoming workouts: {', '.join([w.title for w in upcoming])}")
 
     context = "\n".join(context_parts)
 
-    prompt = f"""You are a helpful AI training assistant for a cycling and fitness app called Etape Training Hub.
+    return f"""You are a helpful AI training assistant for a cycling and fitness app called Etape Training Hub.
 
 User context:
 {context}
 
-User question: {chat.message}
+User question: {message}
 
 Provide a helpful, encouraging, and personalized response. Keep it concise (2-3 paragraphs max).
 Focus on actionable advice when relevant. If asked about nutrition, give general guidance.
 Be supportive and motivating."""
 
+
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/", response_model=ChatResponse)
+async def chat_with_ai(
+    chat: ChatMessage,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Chat with AI about training progress and recommendations"""
+    _ensure_ai_available()
+    prompt = await _build_prompt(db, current_user, chat.message)
+
     try:
-        response = claude_service.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=500,
-            messages=[{"role": "user", "content": prompt}]
+        response_text = await claude_service.complete(
+            prompt, max_tokens=500, timeout=settings.CLAUDE_CHAT_TIMEOUT
         )
 
         return ChatResponse(
-            response=response.content[0].text,
+            response=response_text,
             success=True
         )
     except Exception as e:
@@ -124,3 +138,38 @@ Be supportive and motivating."""
             response=f"Sorry, I encountered an error: {str(e)}",
             success=False
         )
+
+
+@router.post("/stream")
+async def stream_chat_with_ai(
+    chat: ChatMessage,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streaming variant of chat_with_ai using server-sent events.
+
+    Emits ``data: {"text": ...}`` for each text delta, then ``event: done``
+    (or ``event: error`` with a message). If the client disconnects the
+    generator is cancelled, which closes the upstream Claude stream.
+    """
+    _ensure_ai_available()
+    # Context is gathered up front; the DB session is released before streaming starts
+    prompt = await _build_prompt(db, current_user, chat.message)
+
+    async def events():
+        try:
+            async for text in claude_service.stream(
+                prompt, max_tokens=500, timeout=settings.CLAUDE_CHAT_TIMEOUT
+            ):
+                yield _sse({"text": text})
+        except Exception as e:
+            yield _sse({"message": f"Sorry, I encountered an error: {str(e)}"}, event="error")
+            return
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.models.user import User, UserRole
 from app.models.trainer_athlete import TrainerAthleteAssignment
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_async
 
 
 def require_role(allowed_roles: List[UserRole]):
@@ -47,6 +47,11 @@ def get_trainer(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+async def get_trainer_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """Async-session variant of get_trainer"""
+    return get_trainer(current_user)
+
+
 def get_admin(current_user: User = Depends(get_current_user)) -> User:
     """Ensure current user is an admin"""
     if current_user.role != UserRole.ADMIN:
@@ -84,3 +89,8 @@ def get_accessible_user_ids(current_user: User, db: Session) -> Optional[List[in
     else:
         # Athlete sees only self
         return [current_user.id]
+
+
+async def get_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """Async-session variant of get_admin"""
+    return get_admin(current_user)
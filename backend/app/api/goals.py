@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,14 +8,16 @@ from app.models.goal import Goal
 from app.schemas.goal import Goal as GoalSchema, GoalCreate, GoalUpdate
 from app.api.auth import get_current_user
 from app.api.deps import get_accessible_user_ids
+from app.api.pagination import PageParams, paginate
+from app.core import athlete_stats
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[GoalSchema])
 def get_goals(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -25,8 +27,7 @@ def get_goals(
     if accessible_ids is not None:  # Not admin
         query = query.filter(Goal.user_id.in_(accessible_ids))
 
-    goals = query.offset(skip).limit(limit).all()
-    return goals
+    return paginate(query, (Goal.id,), page, response)
 
 
 @router.post("/", response_model=GoalSchema)
@@ -37,6 +38,7 @@ def create_goal(
 ):
     goal = Goal(**goal_in.model_dump(), user_id=current_user.id)
     db.add(goal)
+    athlete_stats.goal_created(db, goal)
     db.commit()
     db.refresh(goal)
     return goal
@@ -71,9 +73,11 @@ def update_goal(
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
+    was_completed = goal.is_completed
     update_data = goal_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(goal, field, value)
+    athlete_stats.goal_updated(db, goal, was_completed)
 
     db.commit()
     db.refresh(goal)
@@ -91,5 +95,6 @@ def delete_goal(
         raise HTTPException(status_code=404, detail="Goal not found")
 
     db.delete(goal)
+    athlete_stats.goal_deleted(db, goal)
     db.commit()
     return {"message": "Goal deleted successfully"}
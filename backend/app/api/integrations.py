@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timedelta
 import httpx
 
-from app.db.base import get_db
+from app.db.base import get_db, get_async_db
 from app.models.user import User
 from app.models.integration import Integration, Activity
 from app.schemas.integration import (
@@ -13,7 +15,8 @@ from app.schemas.integration import (
     ActivityInDB,
     SyncResult,
 )
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_async
+from app.api.pagination import PageParams, paginate
 from app.core.config import settings
 
 router = APIRouter()
@@ -23,14 +26,15 @@ STRAVA_TOKEN_URL = "https://www.strava.com/oauth/token"
 STRAVA_API_URL = "https://www.strava.com/api/v3"
 
 
-def get_strava_integration(db: Session, user_id: int) -> Integration | None:
-    return db.query(Integration).filter(
+async def get_strava_integration(db: AsyncSession, user_id: int) -> Integration | None:
+    result = await db.execute(select(Integration).where(
         Integration.user_id == user_id,
         Integration.provider == "strava"
-    ).first()
+    ))
+    return result.scalars().first()
 
 
-async def refresh_strava_token(db: Session, integration: Integration) -> bool:
+async def refresh_strava_token(db: AsyncSession, integration: Integration) -> bool:
     """Refresh Strava access token if expired"""
     if not integration.token_expires_at or integration.token_expires_at > datetime.utcnow():
         return True  # Token still valid
@@ -53,7 +57,7 @@ async def refresh_strava_token(db: Session, integration: Integration) -> bool:
         integration.access_token = data["access_token"]
         integration.refresh_token = data.get("refresh_token", integration.refresh_token)
         integration.token_expires_at = datetime.fromtimestamp(data["expires_at"])
-        db.commit()
+        await db.commit()
         return True
 
 
@@ -112,7 +116,7 @@ def connect_strava(
 async def strava_callback(
     code: str = Query(...),
     state: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Handle Strava OAuth callback"""
     if not settings.STRAVA_CLIENT_ID or not settings.STRAVA_CLIENT_SECRET:
@@ -148,7 +152,7 @@ async def strava_callback(
         data = response.json()
 
     # Get or create integration
-    integration = get_strava_integration(db, user_id)
+    integration = await get_strava_integration(db, user_id)
     if integration:
         integration.access_token = data["access_token"]
         integration.refresh_token = data.get("refresh_token")
@@ -165,7 +169,7 @@ async def strava_callback(
         )
         db.add(integration)
 
-    db.commit()
+    await db.commit()
 
     # Redirect to frontend integrations page
     frontend_url = settings.CORS_ORIGINS[0] if settings.CORS_ORIGINS else "http://localhost:5173"
@@ -181,11 +185,11 @@ async def strava_callback(
 @router.post("/strava/sync", response_model=SyncResult)
 async def sync_strava_activities(
     days: int = Query(default=30, le=90),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Sync recent activities from Strava"""
-    integration = get_strava_integration(db, current_user.id)
+    integration = await get_strava_integration(db, current_user.id)
     if not integration:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -217,19 +221,21 @@ async def sync_strava_activities(
 
         activities_data = response.json()
 
+    # Look up already synced activities in one query
+    external_ids = [str(a["id"]) for a in activities_data]
+    existing_ids = set((await db.execute(select(Activity.external_id).where(
+        Activity.user_id == current_user.id,
+        Activity.source == "strava",
+        Activity.external_id.in_(external_ids)
+    ))).scalars().all()) if external_ids else set()
+
     synced_count = 0
     for activity_data in activities_data:
         external_id = str(activity_data["id"])
 
-        # Check if activity already exists
-        existing = db.query(Activity).filter(
-            Activity.user_id == current_user.id,
-            Activity.source == "strava",
-            Activity.external_id == external_id
-        ).first()
-
-        if existing:
+        if external_id in existing_ids:
             continue  # Skip already synced activities
+        existing_ids.add(external_id)
 
         # Map Strava activity type
         strava_type = activity_data.get("type", "Workout").lower()
@@ -253,9 +259,10 @@ async def sync_strava_activities(
             external_id=external_id,
             activity_type=activity_type,
             name=activity_data.get("name", "Strava Activity"),
+            # Stored as naive UTC; asyncpg rejects aware datetimes for TIMESTAMP columns
             activity_date=datetime.fromisoformat(
                 activity_data["start_date"].replace("Z", "+00:00")
-            ),
+            ).replace(tzinfo=None),
             duration_minutes=activity_data.get("moving_time", 0) / 60,
             distance_km=activity_data.get("distance", 0) / 1000,
             elevation_m=activity_data.get("total_elevation_gain"),
@@ -274,7 +281,7 @@ async def sync_strava_activities(
 
     # Update last sync time
     integration.last_sync = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     return SyncResult(
         success=True,
@@ -284,30 +291,30 @@ async def sync_strava_activities(
 
 
 @router.delete("/strava/disconnect")
-def disconnect_strava(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def disconnect_strava(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Disconnect Strava integration"""
-    integration = get_strava_integration(db, current_user.id)
+    integration = await get_strava_integration(db, current_user.id)
     if not integration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Strava not connected"
         )
 
-    db.delete(integration)
-    db.commit()
+    await db.delete(integration)
+    await db.commit()
 
     return {"success": True, "message": "Strava disconnected"}
 
 
 @router.get("/activities", response_model=List[ActivityInDB])
 def get_activities(
+    response: Response,
     source: str = Query(default=None),
     activity_type: str = Query(default=None),
-    skip: int = 0,
-    limit: int = 50,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -319,5 +326,4 @@ def get_activities(
     if activity_type:
         query = query.filter(Activity.activity_type == activity_type)
 
-    activities = query.order_by(Activity.activity_date.desc()).offset(skip).limit(limit).all()
-    return activities
+    return paginate(query, (Activity.activity_date, Activity.id), page, response)
@@ -1,20 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
-from typing import List
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, select, union_all
+from typing import List, Optional
 from datetime import datetime
 
-from app.db.base import get_db
+from app.db.base import get_db, AsyncSessionLocal
 from app.models.user import User, UserRole
 from app.models.message import Message
+from app.models.conversation_state import ConversationState
 from app.models.trainer_athlete import TrainerAthleteAssignment
 from app.schemas.message import (
     MessageCreate,
     MessageInDB,
     MessageWithUsers,
+    MessageThread,
+    ThreadMessage,
+    ThreadParticipant,
     Conversation,
 )
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_async
+from app.core import conversation_state
+from app.core.unread_cache import get_unread_count as get_cached_unread_count
+from app.core.config import settings
+from app.core.realtime import message_hub, SubscriberOverflow
 
 router = APIRouter()
 
@@ -42,9 +52,20 @@ def can_message_user(db: Session, sender: User, recipient_id: int) -> bool:
     return assignment is not None
 
 
+def _publish_read(background_tasks: BackgroundTasks, reader_id: int, partner_id: int, marked: int, message_id: Optional[int] = None):
+    """Queue a read receipt for both participants, sent once the response (and its commit) is done."""
+    if not marked:
+        return
+    event = {"type": "read", "reader_id": reader_id, "partner_id": partner_id, "marked": marked}
+    if message_id is not None:
+        event["message_id"] = message_id
+    background_tasks.add_task(message_hub.publish_many, [reader_id, partner_id], event)
+
+
 @router.post("/", response_model=MessageInDB, status_code=status.HTTP_201_CREATED)
 def send_message(
     message_data: MessageCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -67,8 +88,13 @@ def send_message(
         content=message_data.content,
     )
     db.add(message)
+    conversation_state.message_sent(db, message)
     db.commit()
     db.refresh(message)
+
+    # The sender's other tabs get the message too
+    event = {"type": "message", "message": MessageInDB.model_validate(message).model_dump(mode="json")}
+    background_tasks.add_task(message_hub.publish_many, [message.recipient_id, message.sender_id], event)
     return message
 
 
@@ -78,90 +104,158 @@ def get_conversations(
     current_user: User = Depends(get_current_user),
 ):
     """Get list of conversations with last message"""
-    # Get all messages where user is sender or recipient
-    subq = db.query(
-        func.max(Message.id).label('max_id'),
-        func.case(
-            (Message.sender_id == current_user.id, Message.recipient_id),
-            else_=Message.sender_id
-        ).label('other_user_id')
+    # One row per partner from the maintained inbox table, most recent first
+    rows = db.query(
+        ConversationState.partner_id,
+        ConversationState.last_message_at,
+        ConversationState.unread_count,
+        User.full_name,
+        User.email,
+        Message.content,
+    ).join(
+        User, User.id == ConversationState.partner_id
+    ).join(
+        Message, Message.id == ConversationState.last_message_id
     ).filter(
-        or_(
-            Message.sender_id == current_user.id,
-            Message.recipient_id == current_user.id
+        ConversationState.user_id == current_user.id
+    ).order_by(
+        ConversationState.last_message_at.desc(), ConversationState.partner_id
+    ).all()
+
+    return [
+        Conversation(
+            user_id=row.partner_id,
+            user_name=row.full_name,
+            user_email=row.email,
+            last_message=row.content[:100] + ('...' if len(row.content) > 100 else ''),
+            last_message_time=row.last_message_at,
+            unread_count=row.unread_count
         )
-    ).group_by('other_user_id').subquery()
+        for row in rows
+    ]
 
-    # Get the actual messages
-    messages = db.query(Message).join(
-        subq, Message.id == subq.c.max_id
-    ).all()
 
-    conversations = []
-    for msg in messages:
-        other_user_id = msg.recipient_id if msg.sender_id == current_user.id else msg.sender_id
-        other_user = db.query(User).filter(User.id == other_user_id).first()
-        if not other_user:
-            continue
-
-        # Count unread messages from this user
-        unread_count = db.query(Message).filter(
-            Message.sender_id == other_user_id,
-            Message.recipient_id == current_user.id,
-            Message.is_read == False
-        ).count()
-
-        conversations.append(Conversation(
-            user_id=other_user.id,
-            user_name=other_user.full_name,
-            user_email=other_user.email,
-            last_message=msg.content[:100] + ('...' if len(msg.content) > 100 else ''),
-            last_message_time=msg.created_at,
-            unread_count=unread_count
-        ))
+def _thread_page(db: Session, user_id: int, other_id: int, limit: int, before_id: Optional[int] = None) -> List[Message]:
+    """
+    Newest ``limit`` messages between two users with ids below ``before_id``.
+
+    Each direction of the conversation is read as its own (sender_id,
+    recipient_id, id) index range capped at ``limit`` rows and the two are
+    merged, so a page costs O(limit) however long the thread is.
+    """
+    def direction(sender_id: int, recipient_id: int):
+        stmt = select(Message).where(Message.sender_id == sender_id, Message.recipient_id == recipient_id)
+        if before_id is not None:
+            stmt = stmt.where(Message.id < before_id)
+        return select(stmt.order_by(Message.id.desc()).limit(limit).subquery())
+
+    branches = [direction(user_id, other_id)]
+    if other_id != user_id:
+        branches.append(direction(other_id, user_id))
+    thread = aliased(Message, union_all(*branches).subquery())
+    return db.query(thread).order_by(thread.id.desc()).limit(limit).all()
 
-    # Sort by last message time
-    conversations.sort(key=lambda x: x.last_message_time, reverse=True)
-    return conversations
+
+def _mark_thread_read(db: Session, user_id: int, other_id: int) -> int:
+    """Mark everything ``other_id`` sent to ``user_id`` as read; the caller commits."""
+    marked = db.query(Message).filter(
+        Message.sender_id == other_id,
+        Message.recipient_id == user_id,
+        Message.is_read == False
+    ).update({
+        Message.is_read: True,
+        Message.read_at: datetime.utcnow()
+    })
+    conversation_state.messages_read(db, user_id, other_id, marked)
+    return marked
+
+
+def _get_other_user(db: Session, user_id: int) -> User:
+    other_user = db.query(User).filter(User.id == user_id).first()
+    if not other_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return other_user
+
+
+@router.get("/thread/{user_id}", response_model=MessageThread)
+def get_thread(
+    user_id: int,
+    before_id: Optional[int] = Query(None, description="Load messages older than this id (next_before_id of the previous page)"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Page of the conversation with another user, newest page first.
+
+    Read-only: use POST /thread/{user_id}/read to mark the partner's messages read.
+    """
+    other_user = _get_other_user(db, user_id)
+    messages = _thread_page(db, current_user.id, user_id, limit + 1, before_id)
+    next_before_id = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_before_id = messages[-1].id
+    messages.reverse()
+
+    participants = [current_user] if user_id == current_user.id else [current_user, other_user]
+    return MessageThread(
+        participants=[ThreadParticipant.model_validate(u) for u in participants],
+        messages=[ThreadMessage.model_validate(m) for m in messages],
+        next_before_id=next_before_id,
+    )
+
+
+@router.post("/thread/{user_id}/read")
+def mark_thread_read(
+    user_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Mark every message from the given user as read"""
+    marked = _mark_thread_read(db, current_user.id, user_id)
+    db.commit()
+    _publish_read(background_tasks, current_user.id, user_id, marked)
+    return {"marked": marked}
 
 
 @router.get("/with/{user_id}", response_model=List[MessageWithUsers])
 def get_messages_with_user(
     user_id: int,
-    skip: int = 0,
+    background_tasks: BackgroundTasks,
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = 50,
+    before_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all messages between current user and specified user"""
-    # Verify user exists
-    other_user = db.query(User).filter(User.id == user_id).first()
-    if not other_user:
-        raise HTTPException(status_code=404, detail="User not found")
+    """
+    Get messages between current user and specified user, marking received ones read.
 
-    # Get messages between the two users
-    messages = db.query(Message).filter(
-        or_(
-            and_(Message.sender_id == current_user.id, Message.recipient_id == user_id),
-            and_(Message.sender_id == user_id, Message.recipient_id == current_user.id)
-        )
-    ).order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
+    Prefer GET /thread/{user_id}, which returns participants once and doesn't write.
+    """
+    other_user = _get_other_user(db, user_id)
 
-    # Mark received messages as read
-    db.query(Message).filter(
-        Message.sender_id == user_id,
-        Message.recipient_id == current_user.id,
-        Message.is_read == False
-    ).update({
-        Message.is_read: True,
-        Message.read_at: datetime.utcnow()
-    })
-    db.commit()
+    if before_id is not None or not skip:
+        messages = _thread_page(db, current_user.id, user_id, limit, before_id)
+    else:
+        messages = db.query(Message).filter(
+            or_(
+                and_(Message.sender_id == current_user.id, Message.recipient_id == user_id),
+                and_(Message.sender_id == user_id, Message.recipient_id == current_user.id)
+            )
+        ).order_by(Message.id.desc()).offset(skip).limit(limit).all()
+
+    marked = _mark_thread_read(db, current_user.id, user_id)
 
+    # Both participants are known up front, so no per-message user lookups. The
+    # response is built before committing, which would expire the loaded messages.
+    users = {current_user.id: current_user, other_user.id: other_user}
     result = []
     for msg in messages:
-        sender = db.query(User).filter(User.id == msg.sender_id).first()
-        recipient = db.query(User).filter(User.id == msg.recipient_id).first()
+        sender = users.get(msg.sender_id)
+        recipient = users.get(msg.recipient_id)
         result.append(MessageWithUsers(
             id=msg.id,
             sender_id=msg.sender_id,
@@ -176,6 +270,9 @@ def get_messages_with_user(
             recipient_email=recipient.email if recipient else ''
         ))
 
+    db.commit()
+    _publish_read(background_tasks, current_user.id, user_id, marked)
+
     # Return in chronological order
     result.reverse()
     return result
@@ -183,20 +280,28 @@ def get_messages_with_user(
 
 @router.get("/unread-count")
 def get_unread_count(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get count of unread messages"""
-    count = db.query(Message).filter(
-        Message.recipient_id == current_user.id,
-        Message.is_read == False
-    ).count()
+    """Get count of unread messages; honours If-None-Match with a 304"""
+    count = get_cached_unread_count(db, current_user.id)
+    headers = {
+        "ETag": f'"{current_user.id}-{count}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return {"unread_count": count}
 
 
 @router.put("/{message_id}/read")
 def mark_message_as_read(
     message_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -209,8 +314,66 @@ def mark_message_as_read(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    message.is_read = True
-    message.read_at = datetime.utcnow()
+    # Conditional update so concurrent requests decrement the unread counter once
+    marked = db.query(Message).filter(
+        Message.id == message.id,
+        Message.is_read == False
+    ).update({
+        Message.is_read: True,
+        Message.read_at: datetime.utcnow()
+    })
+    conversation_state.messages_read(db, current_user.id, message.sender_id, marked)
     db.commit()
+    _publish_read(background_tasks, current_user.id, message.sender_id, marked, message.id)
 
     return {"success": True}
+
+
+@router.websocket("/ws")
+async def message_events(
+    websocket: WebSocket,
+    token: str = Query(..., description="Access token; browsers can't set headers on WebSocket requests"),
+):
+    """
+    Stream message events for the current user.
+
+    Sends JSON objects: {"type": "message", "message": {...}} for messages sent
+    to or by the user, {"type": "read", ...} receipts, and {"type": "ping"}
+    keepalives. Events are not replayed, so clients should re-fetch the inbox
+    after (re)connecting.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user_async(token, db)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    await websocket.accept()
+    async with message_hub.subscribe(user.id) as subscription:
+        async def pump():
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), settings.REALTIME_PING_INTERVAL)
+                except asyncio.TimeoutError:
+                    event = {"type": "ping"}
+                await websocket.send_json(event)
+
+        sender = asyncio.create_task(pump())
+        receiver = asyncio.create_task(_drain(websocket))
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if sender in done and isinstance(sender.exception(), SubscriberOverflow):
+            # Too far behind to catch up from the queue; the client reconnects and re-fetches
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+async def _drain(websocket: WebSocket):
+    """Read (and ignore) client frames until the socket closes."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,14 +8,15 @@ from app.models.nutrition import NutritionLog
 from app.schemas.nutrition import NutritionLog as NutritionLogSchema, NutritionLogCreate, NutritionLogUpdate
 from app.api.auth import get_current_user
 from app.api.deps import get_accessible_user_ids
+from app.api.pagination import PageParams, paginate
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[NutritionLogSchema])
 def get_nutrition_logs(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -25,8 +26,7 @@ def get_nutrition_logs(
     if accessible_ids is not None:  # Not admin
         query = query.filter(NutritionLog.user_id.in_(accessible_ids))
 
-    logs = query.offset(skip).limit(limit).all()
-    return logs
+    return paginate(query, (NutritionLog.log_date, NutritionLog.id), page, response)
 
 
 @router.post("/", response_model=NutritionLogSchema)
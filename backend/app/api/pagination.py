@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered by a fixed key such as ``(ride_date, id)`` and each page
+continues strictly after the last row of the previous one, so fetching page
+N costs the same as page 1 when an index covers the key. The cursor handed
+to clients is an opaque token encoding that last key; it is returned in the
+``X-Next-Cursor`` response header (absent on the last page) so list
+responses stay plain JSON arrays.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query as ORMQuery
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+class PageParams:
+    """Query parameters shared by paginated endpoints (use as a dependency)."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        skip: int = Query(0, ge=0, deprecated=True, description="Offset paging; ignored when cursor is set"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.skip = skip
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """
+    Decode a cursor for the given key columns.
+
+    Raises:
+        ValueError: If the cursor is malformed or doesn't match the keys
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    decoded = []
+    for column, value in zip(keys, values):
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+
+def paginate(
+    query: ORMQuery,
+    keys: Sequence,
+    page: PageParams,
+    response: Response,
+    descending: bool = True,
+) -> list:
+    """
+    Apply keyset pagination to ``query`` and return one page of results.
+
+    Args:
+        query: ORM query with all filters applied and no ORDER BY/LIMIT
+        keys: Non-nullable columns forming a unique sort key, ending with the primary key
+        page: Cursor and page size from the request
+        response: Used to set the X-Next-Cursor header when more rows exist
+        descending: Newest first (the default) or ascending order
+    """
+    order = [key.desc() if descending else key.asc() for key in keys]
+    query = query.order_by(*order)
+
+    if page.cursor:
+        try:
+            after = decode_cursor(page.cursor, keys)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        key_tuple = tuple_(*keys)
+        query = query.filter(key_tuple < tuple_(*after) if descending else key_tuple > tuple_(*after))
+    elif page.skip:
+        query = query.offset(page.skip)
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, key.key) for key in keys])
+    return rows
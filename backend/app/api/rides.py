@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,14 +8,16 @@ from app.models.ride import Ride
 from app.schemas.ride import Ride as RideSchema, RideCreate, RideUpdate
 from app.api.auth import get_current_user
 from app.api.deps import get_accessible_user_ids
+from app.api.pagination import PageParams, paginate
+from app.core import athlete_stats
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[RideSchema])
 def get_rides(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -25,8 +27,7 @@ def get_rides(
     if accessible_ids is not None:  # Not admin
         query = query.filter(Ride.user_id.in_(accessible_ids))
 
-    rides = query.offset(skip).limit(limit).all()
-    return rides
+    return paginate(query, (Ride.ride_date, Ride.id), page, response)
 
 
 @router.post("/", response_model=RideSchema)
@@ -37,6 +38,7 @@ def create_ride(
 ):
     ride = Ride(**ride_in.model_dump(), user_id=current_user.id)
     db.add(ride)
+    athlete_stats.ride_created(db, ride)
     db.commit()
     db.refresh(ride)
     return ride
@@ -71,9 +73,11 @@ def update_ride(
     if not ride:
         raise HTTPException(status_code=404, detail="Ride not found")
 
+    old_distance_km, old_ride_date = ride.distance_km, ride.ride_date
     update_data = ride_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(ride, field, value)
+    athlete_stats.ride_updated(db, ride, old_distance_km, old_ride_date)
 
     db.commit()
     db.refresh(ride)
@@ -91,5 +95,6 @@ def delete_ride(
         raise HTTPException(status_code=404, detail="Ride not found")
 
     db.delete(ride)
+    athlete_stats.ride_deleted(db, ride)
     db.commit()
     return {"message": "Ride deleted successfully"}
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.db.base import get_db
+from app.models.user import User
+from app.schemas.search import SearchResult
+from app.api.auth import get_current_user
+from app.api.deps import get_accessible_user_ids
+from app.core.search import SEARCH_TYPES, search as run_search
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    types: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(SEARCH_TYPES)}"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Ranked search across messages, training plans, planned workouts and rides you can access"""
+    selected = SEARCH_TYPES
+    if types is not None:
+        selected = tuple(name.strip() for name in types.split(",") if name.strip())
+        unknown = set(selected) - set(SEARCH_TYPES)
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown search type(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(SEARCH_TYPES)}"
+            )
+
+    accessible_ids = get_accessible_user_ids(current_user, db)
+    return run_search(db, current_user, accessible_ids, q.strip(), selected, limit)
@@ -15,6 +15,8 @@ from app.schemas.trainer_athlete import (
 from app.schemas.user import User as UserSchema
 from app.api.auth import get_current_user
 from app.api.deps import get_trainer
+from app.core.athlete_stats import load_athlete_stats
+from app.core.dashboard import get_trainer_dashboard, plan_compliance_by_athlete
 
 router = APIRouter()
 
@@ -217,10 +219,7 @@ def get_athlete_stats(
     """Get detailed stats for an athlete (trainers only)"""
     from app.models.ride import Ride
     from app.models.workout import Workout
-    from app.models.goal import Goal
-    from app.models.training_plan import TrainingPlan, PlannedWorkout
     from datetime import timedelta
-    from sqlalchemy import func
     
     # Verify assignment
     if current_user.role != UserRole.ADMIN:
@@ -240,61 +239,30 @@ def get_athlete_stats(
     now = datetime.utcnow()
     week_ago = now - timedelta(days=7)
     
-    # Rides stats
-    total_rides = db.query(Ride).filter(Ride.user_id == athlete_id).count()
+    # Totals come from the athlete_stats rollup
+    stats = load_athlete_stats(db, [athlete_id])[athlete_id]
+    
+    # Week counts depend on the current time, so they stay range queries
     recent_rides = db.query(Ride).filter(
         Ride.user_id == athlete_id,
         Ride.ride_date >= week_ago
     ).count()
-    total_distance = db.query(func.sum(Ride.distance_km)).filter(
-        Ride.user_id == athlete_id
-    ).scalar() or 0
-    
-    # Workouts stats
-    total_workouts = db.query(Workout).filter(Workout.user_id == athlete_id).count()
     recent_workouts = db.query(Workout).filter(
         Workout.user_id == athlete_id,
         Workout.workout_date >= week_ago
     ).count()
     
-    # Goals stats
-    total_goals = db.query(Goal).filter(Goal.user_id == athlete_id).count()
-    completed_goals = db.query(Goal).filter(
-        Goal.user_id == athlete_id,
-        Goal.is_completed == True
-    ).count()
-    
     # Training plan compliance
-    active_plans = db.query(TrainingPlan).filter(
-        TrainingPlan.athlete_id == athlete_id,
-        TrainingPlan.is_active == True
-    ).all()
-    
-    total_planned = 0
-    completed_planned = 0
-    for plan in active_plans:
-        workouts = db.query(PlannedWorkout).filter(
-            PlannedWorkout.training_plan_id == plan.id,
-            PlannedWorkout.scheduled_date <= now
-        ).all()
-        total_planned += len(workouts)
-        completed_planned += sum(1 for w in workouts if w.is_completed)
-    
+    plan_stats = plan_compliance_by_athlete(db, [athlete_id], now).get(
+        athlete_id, {"active_plans": 0, "planned": 0, "completed": 0}
+    )
+    total_planned = plan_stats["planned"]
+    completed_planned = plan_stats["completed"]
     compliance_rate = (completed_planned / total_planned * 100) if total_planned > 0 else 0
     
-    # Last activity
-    last_ride = db.query(Ride).filter(Ride.user_id == athlete_id).order_by(Ride.ride_date.desc()).first()
-    last_workout = db.query(Workout).filter(Workout.user_id == athlete_id).order_by(Workout.workout_date.desc()).first()
-    
-    last_activity = None
-    if last_ride and last_workout:
-        last_activity = max(last_ride.ride_date, last_workout.workout_date).isoformat()
-    elif last_ride:
-        last_activity = last_ride.ride_date.isoformat()
-    elif last_workout:
-        last_activity = last_workout.workout_date.isoformat()
+    last_activity = stats.last_activity.isoformat() if stats.last_activity else None
     
-    return {
+    result = {
         "athlete": {
             "id": athlete.id,
             "email": athlete.email,
@@ -302,26 +270,30 @@ def get_athlete_stats(
             "created_at": athlete.created_at.isoformat() if athlete.created_at else None
         },
         "rides": {
-            "total": total_rides,
+            "total": stats.total_rides,
             "this_week": recent_rides,
-            "total_distance_km": round(total_distance, 1)
+            "total_distance_km": round(stats.total_distance_km or 0, 1)
         },
         "workouts": {
-            "total": total_workouts,
+            "total": stats.total_workouts,
             "this_week": recent_workouts
         },
         "goals": {
-            "total": total_goals,
-            "completed": completed_goals
+            "total": stats.total_goals,
+            "completed": stats.completed_goals
         },
         "training_plans": {
-            "active_count": len(active_plans),
+            "active_count": plan_stats["active_plans"],
             "compliance_rate": round(compliance_rate, 1),
             "planned_workouts": total_planned,
             "completed_workouts": completed_planned
         },
         "last_activity": last_activity
     }
+    # Keep the athlete_stats row if this request had to build it
+    db.commit()
+    return result
+
 
 @router.get("/athletes/{athlete_id}/activity")
 def get_athlete_activity(
@@ -401,61 +373,7 @@ def get_trainer_dashboard_stats(
     current_user: User = Depends(get_trainer),
 ):
     """Get summary stats for trainer dashboard"""
-    from app.models.training_plan import TrainingPlan, PlannedWorkout
-    from app.models.ride import Ride
-    from app.models.workout import Workout
-    from datetime import timedelta
-    
-    athlete_ids = [a[0] for a in db.query(TrainerAthleteAssignment.athlete_id).filter(
-        TrainerAthleteAssignment.trainer_id == current_user.id,
-        TrainerAthleteAssignment.is_active == True
-    ).all()]
-    
-    active_plans = db.query(TrainingPlan).filter(
-        TrainingPlan.trainer_id == current_user.id, TrainingPlan.is_active == True
-    ).count()
-    
-    now = datetime.utcnow()
-    week_ago = now - timedelta(days=7)
-    
-    attention_list = []
-    athlete_summaries = []
-    
-    for aid in athlete_ids:
-        athlete = db.query(User).filter(User.id == aid).first()
-        if not athlete: continue
-        
-        last_ride = db.query(Ride).filter(Ride.user_id == aid).order_by(Ride.ride_date.desc()).first()
-        last_workout = db.query(Workout).filter(Workout.user_id == aid).order_by(Workout.workout_date.desc()).first()
-        
-        last_activity = None
-        if last_ride and last_workout:
-            last_activity = max(last_ride.ride_date, last_workout.workout_date)
-        elif last_ride: last_activity = last_ride.ride_date
-        elif last_workout: last_activity = last_workout.workout_date
-        
-        if not last_activity or last_activity < week_ago:
-            attention_list.append({"id": athlete.id, "full_name": athlete.full_name, "email": athlete.email})
-        
-        plans = db.query(TrainingPlan).filter(TrainingPlan.athlete_id == aid, TrainingPlan.is_active == True).all()
-        total_w, completed_w = 0, 0
-        for p in plans:
-            ws = db.query(PlannedWorkout).filter(PlannedWorkout.training_plan_id == p.id, PlannedWorkout.scheduled_date <= now).all()
-            total_w += len(ws)
-            completed_w += sum(1 for w in ws if w.is_completed)
-        
-        compliance = (completed_w / total_w * 100) if total_w > 0 else 0
-        athlete_summaries.append({
-            "id": athlete.id, "full_name": athlete.full_name, "email": athlete.email,
-            "compliance_rate": round(compliance, 1),
-            "last_activity": last_activity.isoformat() if last_activity else None,
-            "active_plans": len(plans)
-        })
-    
-    return {
-        "total_athletes": len(athlete_ids),
-        "active_plans": active_plans,
-        "athletes_needing_attention": len(attention_list),
-        "attention_list": attention_list,
-        "athlete_summaries": athlete_summaries
-    }
+    dashboard = get_trainer_dashboard(db, current_user.id)
+    # Keep any athlete_stats rows this request had to build
+    db.commit()
+    return dashboard
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
+from datetime import date, datetime, timedelta, timezone
+import asyncio
+import json
 
-from app.db.base import get_db
+from app.db.base import get_db, get_async_db, AsyncSessionLocal
+from app.db.query_counter import untracked
 from app.models.user import User, UserRole
+from app.models.parse_job import ParseJob
 from app.models.trainer_athlete import TrainerAthleteAssignment
 from app.models.training_plan import (
     TrainingPlan,
@@ -21,6 +29,7 @@ from app.schemas.training_plan import (
     PlannedWorkoutCreate,
     PlannedWorkoutUpdate,
     PlannedWorkout as PlannedWorkoutSchema,
+    CalendarWorkout,
     PlannedGoalCreate,
     PlannedGoalUpdate,
     PlannedGoal as PlannedGoalSchema,
@@ -28,10 +37,16 @@ from app.schemas.training_plan import (
     NutritionPlanUpdate,
     NutritionPlan as NutritionPlanSchema,
     TrainingDocument as TrainingDocumentSchema,
+    ParseJob as ParseJobSchema,
+    ParsedPlanData,
 )
 from app.core.file_utils import save_upload_file, delete_file
-from app.api.auth import get_current_user
-from app.api.deps import get_trainer
+from app.core.config import settings
+from app.core.parse_jobs import enqueue_parse_job, TooManyJobsError, TERMINAL_STATUSES
+from app.core.plan_ingest import create_plan_from_parsed
+from app.core.plan_queries import PLAN_RELATIONS, load_plan, parse_include
+from app.api.auth import get_current_user, get_current_user_async
+from app.api.deps import get_trainer, get_trainer_async, get_accessible_user_ids
 
 router = APIRouter()
 
@@ -117,21 +132,90 @@ def get_training_plans(
     return plans
 
 
-@router.get("/{plan_id}", response_model=TrainingPlanSchema)
+def _naive_utc(value: Union[datetime, date]) -> datetime:
+    """Stored datetimes are naive UTC; dates mean midnight."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time())
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@router.get("/calendar", response_model=List[CalendarWorkout])
+def get_workout_calendar(
+    from_date: Union[datetime, date] = Query(..., alias="from", description="Window start (inclusive), date or datetime"),
+    to_date: Union[datetime, date] = Query(..., alias="to", description="Window end (exclusive), date or datetime"),
+    athlete_id: Optional[int] = Query(None, description="Defaults to the current user"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Planned workouts across an athlete's active plans within [from, to).
+
+    Served by the (athlete_id, is_active) and (training_plan_id, scheduled_date)
+    indexes, so the cost depends on the window, not on plan length.
+    """
+    athlete_id = athlete_id or current_user.id
+    accessible = get_accessible_user_ids(current_user, db)
+    if accessible is not None and athlete_id not in accessible:
+        raise HTTPException(status_code=403, detail="Not authorized to view this athlete's calendar")
+
+    from_date, to_date = _naive_utc(from_date), _naive_utc(to_date)
+    if to_date <= from_date:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if to_date - from_date > timedelta(days=settings.CALENDAR_MAX_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Calendar window is limited to {settings.CALENDAR_MAX_DAYS} days"
+        )
+
+    rows = db.execute(
+        select(PlannedWorkout, TrainingPlan.title, TrainingPlan.athlete_id)
+        .join(TrainingPlan, PlannedWorkout.training_plan_id == TrainingPlan.id)
+        .where(
+            TrainingPlan.athlete_id == athlete_id,
+            TrainingPlan.is_active == True,
+            PlannedWorkout.scheduled_date >= from_date,
+            PlannedWorkout.scheduled_date < to_date,
+        )
+        .order_by(PlannedWorkout.scheduled_date, PlannedWorkout.id)
+    ).all()
+
+    return [
+        CalendarWorkout(
+            **PlannedWorkoutSchema.model_validate(workout).model_dump(),
+            plan_title=plan_title,
+            athlete_id=plan_athlete_id,
+        )
+        for workout, plan_title, plan_athlete_id in rows
+    ]
+
+
+@router.get("/{plan_id}", response_model=TrainingPlanSchema, response_model_exclude_unset=True)
 def get_training_plan(
     plan_id: int,
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated relations to return (workouts, goals, documents, nutrition_plans); all when omitted",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a specific training plan with all details"""
-    plan = db.query(TrainingPlan).filter(TrainingPlan.id == plan_id).first()
+    """Get a specific training plan with all details (or only the relations in ``include``)"""
+    try:
+        names = parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Access is checked in the same query; other users' plans look like missing ones
+    plan = load_plan(db, plan_id, include=names, visible_to=current_user)
     if not plan:
         raise HTTPException(status_code=404, detail="Training plan not found")
 
-    if not verify_plan_access(plan, current_user, db):
-        raise HTTPException(status_code=404, detail="Training plan not found")
-
-    return plan
+    if names is None:
+        return plan
+    excluded = set(PLAN_RELATIONS) - names
+    return TrainingPlanSchema.model_validate(plan).model_dump(exclude=excluded)
 
 
 @router.put("/{plan_id}", response_model=TrainingPlanSchema)
@@ -459,19 +543,19 @@ async def upload_document(
     plan_id: int,
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_trainer),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_trainer_async),
 ):
     """Upload a document to a training plan"""
-    plan = db.query(TrainingPlan).filter(TrainingPlan.id == plan_id).first()
+    plan = await db.get(TrainingPlan, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Training plan not found")
 
     if not verify_plan_edit_access(plan, current_user):
         raise HTTPException(status_code=403, detail="Not authorized to edit this plan")
 
-    # Save file
-    file_path = save_upload_file(file, f"plan_{plan_id}")
+    # Save file (blocking disk I/O, keep it off the event loop)
+    file_path = await run_in_threadpool(save_upload_file, file, f"plan_{plan_id}")
 
     # Create database record
     from pathlib import Path
@@ -483,8 +567,8 @@ async def upload_document(
         description=description,
     )
     db.add(document)
-    db.commit()
-    db.refresh(document)
+    await db.commit()
+    await db.refresh(document)
 
     return document
 
@@ -493,21 +577,22 @@ async def upload_document(
 async def download_document(
     plan_id: int,
     doc_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Download a training plan document"""
-    plan = db.query(TrainingPlan).filter(TrainingPlan.id == plan_id).first()
+    plan = await db.get(TrainingPlan, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Training plan not found")
 
     if not verify_plan_access(plan, current_user, db):
         raise HTTPException(status_code=403, detail="Not authorized to access this plan")
 
-    document = db.query(TrainingDocument).filter(
+    result = await db.execute(select(TrainingDocument).where(
         TrainingDocument.id == doc_id,
         TrainingDocument.training_plan_id == plan_id
-    ).first()
+    ))
+    document = result.scalars().first()
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
@@ -554,22 +639,24 @@ def delete_document(
 
 
 # AI PDF Parsing
+async def _read_pdf_upload(file: UploadFile) -> bytes:
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    content = await file.read()
+    if len(content) > 10 * 1024 * 1024:  # 10MB limit
+        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    return content
+
+
 @router.post("/parse-pdf", status_code=status.HTTP_200_OK)
 async def parse_training_plan_pdf(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_trainer),
+    current_user: User = Depends(get_trainer_async),
 ):
     """Parse a PDF training plan using AI and return structured data for preview"""
     from app.core.claude_service import claude_service
     
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
-    
-    # Read file content
-    content = await file.read()
-    
-    if len(content) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    content = await _read_pdf_upload(file)
     
     # Parse with Claude AI
     result = await claude_service.parse_training_plan_pdf(content, file.filename)
@@ -582,21 +669,89 @@ async def parse_training_plan_pdf(
     
     return {
         "success": True,
-        "parsed_data": result["data"]
+        "parsed_data": result["data"],
+        "cached": result.get("cached", False)
     }
 
 
+async def _get_own_parse_job(db: AsyncSession, job_id: int, user: User) -> ParseJob:
+    job = await db.get(ParseJob, job_id)
+    if not job or (job.user_id != user.id and user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=404, detail="Parse job not found")
+    return job
+
+
+@router.post("/parse-pdf/jobs", response_model=ParseJobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def create_parse_job(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_trainer_async),
+):
+    """Queue a PDF training plan for AI parsing; poll the job for the result"""
+    content = await _read_pdf_upload(file)
+    try:
+        return await enqueue_parse_job(db, current_user.id, file.filename, content)
+    except TooManyJobsError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+
+@router.get("/parse-pdf/jobs/{job_id}", response_model=ParseJobSchema)
+async def get_parse_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Status of a parse job, including the parsed data once it has succeeded"""
+    return await _get_own_parse_job(db, job_id, current_user)
+
+
+@router.get("/parse-pdf/jobs/{job_id}/events")
+async def stream_parse_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Server-sent events for a parse job: a ``status`` event whenever the job
+    changes, ending after it succeeds or fails. A ``not_found`` event ends the
+    stream if the job is deleted meanwhile.
+    """
+    await _get_own_parse_job(db, job_id, current_user)
+
+    async def events():
+        last = None
+        while True:
+            with untracked():
+                async with AsyncSessionLocal() as poll_db:
+                    job = await poll_db.get(ParseJob, job_id)
+                    payload = None if job is None else ParseJobSchema.model_validate(job).model_dump(mode="json")
+            if payload is None:
+                yield f"event: not_found\ndata: {json.dumps({'id': job_id, 'detail': 'Parse job not found'})}\n\n"
+                return
+            snapshot = (payload["status"], payload["attempts"])
+            if snapshot != last:
+                last = snapshot
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+            if payload["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(settings.PARSE_JOB_POLL_INTERVAL / 2)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/create-from-parsed", response_model=TrainingPlanSchema, status_code=status.HTTP_201_CREATED)
 def create_plan_from_parsed_data(
     athlete_id: int,
-    parsed_data: dict,
+    parsed_data: ParsedPlanData,
     start_date: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_trainer),
 ):
     """Create a training plan from AI-parsed data"""
-    from datetime import datetime, timedelta
-    
     # Verify athlete
     athlete = db.query(User).filter(User.id == athlete_id).first()
     if not athlete:
@@ -618,71 +773,4 @@ def create_plan_from_parsed_data(
     # Parse start date
     plan_start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else datetime.now().date()
     
-    # Calculate end date based on duration
-    duration_weeks = parsed_data.get("duration_weeks", 12)
-    plan_end = plan_start + timedelta(weeks=duration_weeks)
-    
-    # Create the training plan
-    plan = TrainingPlan(
-        trainer_id=current_user.id,
-        athlete_id=athlete_id,
-        title=parsed_data.get("title", "Training Plan"),
-        description=parsed_data.get("description", ""),
-        start_date=plan_start,
-        end_date=plan_end,
-        is_active=True
-    )
-    db.add(plan)
-    db.commit()
-    db.refresh(plan)
-    
-    # Add workouts
-    workouts = parsed_data.get("workouts", [])
-    for workout_data in workouts:
-        week = workout_data.get("week", 1)
-        day = workout_data.get("day_of_week", 1)
-        scheduled_date = plan_start + timedelta(weeks=week-1, days=day-1)
-        
-        workout = PlannedWorkout(
-            training_plan_id=plan.id,
-            title=workout_data.get("title", "Workout"),
-            workout_type=workout_data.get("workout_type", "general"),
-            scheduled_date=scheduled_date,
-            duration_minutes=workout_data.get("duration_minutes"),
-            description=workout_data.get("description", ""),
-            intensity=workout_data.get("intensity", "medium"),
-            exercises=str(workout_data.get("exercises", [])),
-            is_completed=False
-        )
-        db.add(workout)
-    
-    # Add goals
-    goals = parsed_data.get("goals", [])
-    for goal_data in goals:
-        goal = PlannedGoal(
-            training_plan_id=plan.id,
-            title=goal_data.get("title", "Goal"),
-            goal_type=goal_data.get("goal_type", "performance"),
-            description=goal_data.get("description", ""),
-            target_value=goal_data.get("target_value"),
-            unit=goal_data.get("unit"),
-            target_date=plan_end,
-            is_achieved=False
-        )
-        db.add(goal)
-    
-    # Add nutrition guidance as nutrition plans
-    nutrition = parsed_data.get("nutrition_guidance", [])
-    for idx, nutr_data in enumerate(nutrition):
-        nutr_plan = NutritionPlan(
-            training_plan_id=plan.id,
-            day_of_week=idx % 7,
-            meal_type=nutr_data.get("category", "general"),
-            description=nutr_data.get("recommendation", ""),
-            notes=nutr_data.get("details", "")
-        )
-        db.add(nutr_plan)
-    
-    db.commit()
-    db.refresh(plan)
-    return plan
+    return create_plan_from_parsed(db, parsed_data, current_user.id, athlete_id, plan_start)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,14 +8,16 @@ from app.models.workout import Workout
 from app.schemas.workout import Workout as WorkoutSchema, WorkoutCreate, WorkoutUpdate
 from app.api.auth import get_current_user
 from app.api.deps import get_accessible_user_ids
+from app.api.pagination import PageParams, paginate
+from app.core import athlete_stats
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WorkoutSchema])
 def get_workouts(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -25,8 +27,7 @@ def get_workouts(
     if accessible_ids is not None:  # Not admin
         query = query.filter(Workout.user_id.in_(accessible_ids))
 
-    workouts = query.offset(skip).limit(limit).all()
-    return workouts
+    return paginate(query, (Workout.workout_date, Workout.id), page, response)
 
 
 @router.post("/", response_model=WorkoutSchema)
@@ -37,6 +38,7 @@ def create_workout(
 ):
     workout = Workout(**workout_in.model_dump(), user_id=current_user.id)
     db.add(workout)
+    athlete_stats.workout_created(db, workout)
     db.commit()
     db.refresh(workout)
     return workout
@@ -71,9 +73,11 @@ def update_workout(
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
 
+    old_workout_date = workout.workout_date
     update_data = workout_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(workout, field, value)
+    athlete_stats.workout_updated(db, workout, old_workout_date)
 
     db.commit()
     db.refresh(workout)
@@ -91,5 +95,6 @@ def delete_workout(
         raise HTTPException(status_code=404, detail="Workout not found")
 
     db.delete(workout)
+    athlete_stats.workout_deleted(db, workout)
     db.commit()
     return {"message": "Workout deleted successfully"}
@@ -0,0 +1,268 @@
+"""
+Incremental maintenance of the athlete_stats rollup table.
+
+Routers call the ride/workout/goal hooks below after applying a change to
+the session and before committing, so the rollup row is updated in the same
+transaction as the change it reflects.
+Counters are adjusted with SQL expressions (``col = col + n``) to stay
+correct under concurrent writers, and missing rows are created with
+INSERT ... ON CONFLICT so two requests building the same row don't collide.
+None of the functions here commit; the caller's session owns the transaction.
+
+Backfill or repair the table with:
+
+    python -m app.core.athlete_stats [user_id ...]
+"""
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.db.upsert import dialect_insert
+from app.models.athlete_stats import AthleteStats
+from app.models.user import User
+from app.models.ride import Ride
+from app.models.workout import Workout
+from app.models.goal import Goal
+
+STAT_FIELDS = (
+    "total_rides", "total_distance_km", "last_ride_date",
+    "total_workouts", "last_workout_date",
+    "total_goals", "completed_goals", "updated_at",
+)
+# Rows per INSERT; keeps bound parameters under SQLite's limit
+WRITE_BATCH = 500
+
+
+def _stats_for_change(db: Session, user_id: int) -> Optional[AthleteStats]:
+    """
+    Return the rollup row to apply a delta to.
+
+    When the row does not exist yet it is built from the source tables, which
+    already include the pending change, so None is returned and the caller
+    skips its delta.
+    """
+    stats = db.get(AthleteStats, user_id)
+    if stats is None:
+        rebuild_athlete_stats(db, [user_id])
+    return stats
+
+
+def _adjust(stats: AthleteStats, field: str, delta) -> None:
+    if delta:
+        setattr(stats, field, getattr(AthleteStats, field) + delta)
+
+
+def _is_later(candidate: datetime, current: Optional[datetime]) -> bool:
+    # Columns are timezone-naive; drop any offset the client sent, as Postgres does
+    return current is None or candidate.replace(tzinfo=None) > current.replace(tzinfo=None)
+
+
+def _latest_ride_date(db: Session, user_id: int) -> Optional[datetime]:
+    db.flush()
+    return db.query(func.max(Ride.ride_date)).filter(Ride.user_id == user_id).scalar()
+
+
+def _latest_workout_date(db: Session, user_id: int) -> Optional[datetime]:
+    db.flush()
+    return db.query(func.max(Workout.workout_date)).filter(Workout.user_id == user_id).scalar()
+
+
+# Rides
+def ride_created(db: Session, ride: Ride) -> None:
+    stats = _stats_for_change(db, ride.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_rides", 1)
+    _adjust(stats, "total_distance_km", ride.distance_km or 0)
+    if _is_later(ride.ride_date, stats.last_ride_date):
+        stats.last_ride_date = ride.ride_date
+
+
+def ride_updated(db: Session, ride: Ride, old_distance_km: float, old_ride_date: datetime) -> None:
+    stats = _stats_for_change(db, ride.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_distance_km", (ride.distance_km or 0) - (old_distance_km or 0))
+    if ride.ride_date != old_ride_date:
+        stats.last_ride_date = _latest_ride_date(db, ride.user_id)
+
+
+def ride_deleted(db: Session, ride: Ride) -> None:
+    stats = _stats_for_change(db, ride.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_rides", -1)
+    _adjust(stats, "total_distance_km", -(ride.distance_km or 0))
+    if stats.last_ride_date is None or not _is_later(stats.last_ride_date, ride.ride_date):
+        stats.last_ride_date = _latest_ride_date(db, ride.user_id)
+
+
+# Workouts
+def workout_created(db: Session, workout: Workout) -> None:
+    stats = _stats_for_change(db, workout.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_workouts", 1)
+    if _is_later(workout.workout_date, stats.last_workout_date):
+        stats.last_workout_date = workout.workout_date
+
+
+def workout_updated(db: Session, workout: Workout, old_workout_date: datetime) -> None:
+    if workout.workout_date == old_workout_date:
+        return
+    stats = _stats_for_change(db, workout.user_id)
+    if stats is None:
+        return
+    stats.last_workout_date = _latest_workout_date(db, workout.user_id)
+
+
+def workout_deleted(db: Session, workout: Workout) -> None:
+    stats = _stats_for_change(db, workout.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_workouts", -1)
+    if stats.last_workout_date is None or not _is_later(stats.last_workout_date, workout.workout_date):
+        stats.last_workout_date = _latest_workout_date(db, workout.user_id)
+
+
+# Goals
+def goal_created(db: Session, goal: Goal) -> None:
+    stats = _stats_for_change(db, goal.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_goals", 1)
+    _adjust(stats, "completed_goals", 1 if goal.is_completed else 0)
+
+
+def goal_updated(db: Session, goal: Goal, was_completed: bool) -> None:
+    if bool(goal.is_completed) == bool(was_completed):
+        return
+    stats = _stats_for_change(db, goal.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "completed_goals", 1 if goal.is_completed else -1)
+
+
+def goal_deleted(db: Session, goal: Goal) -> None:
+    stats = _stats_for_change(db, goal.user_id)
+    if stats is None:
+        return
+    _adjust(stats, "total_goals", -1)
+    _adjust(stats, "completed_goals", -1 if goal.is_completed else 0)
+
+
+def load_athlete_stats(db: Session, user_ids: List[int]) -> Dict[int, AthleteStats]:
+    """
+    Fetch rollup rows for the given users, building any that are missing.
+
+    Built rows are only flushed; commit the session to keep them. A row
+    another transaction creates first is left as it is.
+    """
+    if not user_ids:
+        return {}
+    rows = {
+        s.user_id: s
+        for s in db.query(AthleteStats).filter(AthleteStats.user_id.in_(user_ids)).all()
+    }
+    missing = list(dict.fromkeys(uid for uid in user_ids if uid not in rows))
+    if missing:
+        _write_stats(db, _computed_stats(db, missing), overwrite=False)
+        rows.update(_load(db, missing))
+    return rows
+
+
+def rebuild_athlete_stats(db: Session, user_ids: Optional[Iterable[int]] = None) -> Dict[int, AthleteStats]:
+    """
+    Recompute rollup rows from the source tables, creating or overwriting them.
+
+    Args:
+        db: Database session (the caller commits)
+        user_ids: Users to rebuild; all users when None
+
+    Returns:
+        Dict mapping user_id to its rebuilt AthleteStats row
+    """
+    if user_ids is None:
+        user_ids = [u[0] for u in db.query(User.id).all()]
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    _write_stats(db, _computed_stats(db, user_ids), overwrite=True)
+    return _load(db, user_ids)
+
+
+def _load(db: Session, user_ids: List[int]) -> Dict[int, AthleteStats]:
+    # populate_existing: rows were written with Core, bypassing instances already in the session
+    query = db.query(AthleteStats).filter(AthleteStats.user_id.in_(user_ids))
+    return {s.user_id: s for s in query.populate_existing().all()}
+
+
+def _write_stats(db: Session, values: List[Dict[str, Any]], overwrite: bool) -> None:
+    dialect = db.get_bind().dialect.name
+    for start in range(0, len(values), WRITE_BATCH):
+        stmt = dialect_insert(dialect, AthleteStats).values(values[start:start + WRITE_BATCH])
+        if overwrite:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AthleteStats.user_id],
+                set_={field: stmt.excluded[field] for field in STAT_FIELDS},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[AthleteStats.user_id])
+        db.execute(stmt)
+
+
+def _computed_stats(db: Session, user_ids: List[int]) -> List[Dict[str, Any]]:
+    """Rollup column values per user, aggregated from the source tables."""
+    db.flush()
+    ride_rows = db.query(
+        Ride.user_id, func.count(Ride.id), func.sum(Ride.distance_km), func.max(Ride.ride_date)
+    ).filter(Ride.user_id.in_(user_ids)).group_by(Ride.user_id).all()
+    workout_rows = db.query(
+        Workout.user_id, func.count(Workout.id), func.max(Workout.workout_date)
+    ).filter(Workout.user_id.in_(user_ids)).group_by(Workout.user_id).all()
+    goal_rows = db.query(
+        Goal.user_id, func.count(Goal.id), func.sum(case((Goal.is_completed == True, 1), else_=0))
+    ).filter(Goal.user_id.in_(user_ids)).group_by(Goal.user_id).all()
+
+    rides = {r[0]: r[1:] for r in ride_rows}
+    workouts = {w[0]: w[1:] for w in workout_rows}
+    goals = {g[0]: g[1:] for g in goal_rows}
+
+    now = datetime.utcnow()
+    values = []
+    for user_id in user_ids:
+        ride_count, distance, last_ride = rides.get(user_id, (0, 0.0, None))
+        workout_count, last_workout = workouts.get(user_id, (0, None))
+        goal_count, completed = goals.get(user_id, (0, 0))
+        values.append({
+            "user_id": user_id,
+            "total_rides": ride_count,
+            "total_distance_km": distance or 0.0,
+            "last_ride_date": last_ride,
+            "total_workouts": workout_count,
+            "last_workout_date": last_workout,
+            "total_goals": goal_count,
+            "completed_goals": int(completed or 0),
+            "updated_at": now,
+        })
+    return values
+
+
+def main(argv: List[str]) -> None:
+    from app.db.base import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_ids = [int(arg) for arg in argv] or None
+        rebuilt = rebuild_athlete_stats(db, user_ids)
+        db.commit()
+        print(f"Rebuilt athlete stats for {len(rebuilt)} users")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,38 +1,119 @@
 import os
+import re
 import json
+import asyncio
 import base64
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 import anthropic
-from pdfminer.high_level import extract_text
-from io import BytesIO
+import httpx
+from app.core.config import settings
+from app.core import parse_cache
+from app.core.pdf_text import PDFExtractionError, RetryablePDFExtractionError, pdf_text_extractor
+from app.core.claude_stub import StubAsyncAnthropic
+from app.core.plan_chunking import split_plan_text, merge_parsed_chunks
+
+# Bump whenever the parse prompt or post-processing changes so cached results are not reused
+PARSE_PROMPT_VERSION = "2"
 
 class ClaudeAIService:
     """Service for parsing training plan documents using Claude AI."""
     
     def __init__(self):
         self.api_key = os.getenv("ANTHROPIC_API_KEY")
-        if self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+        if settings.CLAUDE_USE_STUB:
+            self.client = StubAsyncAnthropic()
+        elif self.api_key:
+            # One async client per process so requests share its connection pool
+            self.client = anthropic.AsyncAnthropic(
+                api_key=self.api_key,
+                timeout=settings.CLAUDE_TIMEOUT,
+                max_retries=settings.CLAUDE_MAX_RETRIES,
+                http_client=anthropic.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.CLAUDE_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.CLAUDE_MAX_CONNECTIONS,
+                    ),
+                ),
+            )
         else:
             self.client = None
+        # Caps in-flight LLM calls per worker; extra callers wait their turn
+        self._semaphore = asyncio.Semaphore(settings.CLAUDE_MAX_CONCURRENCY)
     
     def is_available(self) -> bool:
         """Check if Claude API is configured."""
         return self.client is not None
     
-    def extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text content from a PDF file."""
+    async def complete(self, prompt: str, max_tokens: int, timeout: Optional[float] = None) -> str:
+        """
+        Send a single-turn prompt and return the text of the reply.
+
+        Args:
+            prompt: User message content
+            max_tokens: Completion token limit
+            timeout: Per-call timeout in seconds (defaults to CLAUDE_TIMEOUT)
+
+        Raises:
+            anthropic.APIError: On API failures or timeouts
+        """
+        async with self._semaphore:
+            response = await self.client.messages.create(
+                model=settings.CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout if timeout is not None else settings.CLAUDE_TIMEOUT,
+            )
+        return response.content[0].text
+    
+    async def stream(self, prompt: str, max_tokens: int, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Like complete(), but yield text deltas as they arrive.
+
+        The concurrency slot and HTTP connection are released when the
+        generator finishes or is closed/cancelled (e.g. client disconnect).
+        """
+        async with self._semaphore:
+            async with self.client.messages.stream(
+                model=settings.CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout if timeout is not None else settings.CLAUDE_TIMEOUT,
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+    
+    async def extract_text_from_pdf(self, pdf_content: bytes) -> str:
+        """
+        Extract up to PDF_EXTRACT_MAX_CHARS of text from a PDF file in the worker pool.
+
+        Raises:
+            PDFExtractionError: If the document can't be read
+            RetryablePDFExtractionError: If extraction times out or its worker process is lost
+        """
         try:
-            text = extract_text(BytesIO(pdf_content))
-            return text
+            result = await pdf_text_extractor.extract(pdf_content, settings.PDF_EXTRACT_MAX_CHARS)
+        except PDFExtractionError:
+            raise
         except Exception as e:
-            return f"Error extracting text: {str(e)}"
+            raise PDFExtractionError(f"Error extracting text: {str(e)}") from e
+        return result["text"]
     
     async def parse_training_plan_pdf(self, pdf_content: bytes, filename: str) -> Dict[str, Any]:
         """
         Parse a training plan PDF using Claude AI.
         Returns structured data with weekly structure, workouts, exercises, nutrition.
+        Results are cached by content hash, so re-uploads of the same file return instantly.
         """
+        digest = parse_cache.content_hash(pdf_content)
+        cached = await parse_cache.get_parsed(digest, settings.CLAUDE_MODEL, PARSE_PROMPT_VERSION)
+        if cached is not None:
+            return {
+                "success": True,
+                "error": None,
+                "data": cached,
+                "cached": True,
+            }
+        
         if not self.is_available():
             return {
                 "success": False,
@@ -41,7 +122,15 @@ class ClaudeAIService:
             }
         
         # Extract text from PDF
-        pdf_text = self.extract_text_from_pdf(pdf_content)
+        try:
+            pdf_text = await self.extract_text_from_pdf(pdf_content)
+        except PDFExtractionError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "data": None,
+                "retryable": isinstance(e, RetryablePDFExtractionError),
+            }
         
         if not pdf_text or len(pdf_text.strip()) < 50:
             return {
@@ -50,10 +139,60 @@ class ClaudeAIService:
                 "data": None
             }
         
-        prompt = f"""Analyze this training plan document and extract structured data.
+        try:
+            parsed_data = await self._parse_text(pdf_text)
+        except Exception as e:
+            # API errors and malformed model output are worth another attempt; bad PDFs are not
+            return {
+                "success": False,
+                "error": str(e),
+                "data": None,
+                "retryable": True,
+            }
+        
+        await parse_cache.store_parsed(digest, settings.CLAUDE_MODEL, PARSE_PROMPT_VERSION, parsed_data)
+        return {
+            "success": True,
+            "error": None,
+            "data": parsed_data,
+            "cached": False,
+        }
+    
+    async def _parse_text(self, pdf_text: str) -> Dict[str, Any]:
+        """
+        Parse extracted plan text, in one call or map-reduce for long documents.
+
+        Text longer than PDF_TEXT_MAX_CHARS is split at week headings/pages into
+        PARSE_CHUNK_CHARS chunks, which are parsed concurrently (at most
+        PARSE_CHUNK_CONCURRENCY at once per document) and merged in document order.
+        """
+        if len(pdf_text) <= settings.PDF_TEXT_MAX_CHARS:
+            return await self._parse_chunk(pdf_text)
+        
+        chunks = split_plan_text(pdf_text, settings.PARSE_CHUNK_CHARS)
+        semaphore = asyncio.Semaphore(settings.PARSE_CHUNK_CONCURRENCY)
+        
+        async def parse(index: int, chunk: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._parse_chunk(chunk, part=index + 1, total_parts=len(chunks))
+        
+        # gather preserves chunk order, so the merge doesn't depend on completion order
+        results = await asyncio.gather(*(parse(i, chunk) for i, chunk in enumerate(chunks)))
+        return merge_parsed_chunks(list(results))
+    
+    async def _parse_chunk(self, text: str, part: Optional[int] = None, total_parts: Optional[int] = None) -> Dict[str, Any]:
+        if part is None:
+            intro = "Analyze this training plan document and extract structured data."
+        else:
+            intro = (
+                f"Analyze part {part} of {total_parts} of a longer training plan document and extract "
+                "structured data. Extract only what appears in this part, and keep week numbers "
+                "exactly as the document states them."
+            )
+        prompt = f"""{intro}
 
 Document content:
-{pdf_text[:15000]}
+{text}
 
 Extract and return a JSON object with this exact structure:
 {{
@@ -110,47 +249,25 @@ Important:
 - For cycling workouts, exercises might be intervals or zones
 - Return ONLY valid JSON, no other text"""
 
+        response_text = await self.complete(prompt, max_tokens=4096)
+        return self._parse_json_response(response_text)
+    
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict[str, Any]:
+        # Try to parse JSON directly
         try:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            # Extract JSON from response
-            response_text = response.content[0].text
-            
-            # Try to parse JSON directly
-            try:
-                parsed_data = json.loads(response_text)
-            except json.JSONDecodeError:
-                # Try to extract JSON from markdown code block
-                import re
-                json_match = re.search(r'```json?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-                if json_match:
-                    parsed_data = json.loads(json_match.group(1))
-                else:
-                    # Try to find any JSON object
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    if json_match:
-                        parsed_data = json.loads(json_match.group(0))
-                    else:
-                        raise ValueError("Could not parse JSON from response")
-            
-            return {
-                "success": True,
-                "error": None,
-                "data": parsed_data
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "data": None
-            }
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            pass
+        # Try to extract JSON from markdown code block
+        json_match = re.search(r'```json?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(1))
+        # Try to find any JSON object
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group(0))
+        raise ValueError("Could not parse JSON from response")
 
 
 # Singleton instance
@@ -0,0 +1,97 @@
+"""
+Offline stand-in for the Anthropic async client.
+
+Enabled with CLAUDE_USE_STUB=true so PDF parsing, parse jobs and chat can be
+exercised locally and in tests without an API key or network access. Only
+the calls ClaudeAIService makes are implemented.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+STUB_PLAN = {
+    "title": "Stub Training Plan",
+    "description": "Canned plan returned by the offline Claude stub",
+    "duration_weeks": 2,
+    "weekly_structure": [
+        {"week": 1, "theme": "Base building", "focus": "Aerobic endurance"},
+        {"week": 2, "theme": "Build", "focus": "Threshold"},
+    ],
+    "workouts": [
+        {
+            "title": "Endurance ride",
+            "workout_type": "cycling",
+            "day_of_week": 2,
+            "week": 1,
+            "duration_minutes": 90,
+            "intensity": "low",
+            "description": "Zone 2 steady ride",
+            "exercises": [],
+        },
+        {
+            "title": "Threshold intervals",
+            "workout_type": "cycling",
+            "day_of_week": 4,
+            "week": 2,
+            "duration_minutes": 60,
+            "intensity": "high",
+            "description": "3 x 10 min at FTP",
+            "exercises": [
+                {"name": "FTP interval", "sets": 3, "reps": None, "duration_minutes": 10, "notes": "5 min recovery"}
+            ],
+        },
+    ],
+    "nutrition_guidance": [
+        {"category": "hydration", "recommendation": "500ml per hour on the bike", "details": None}
+    ],
+    "goals": [
+        {"title": "Ride 100km", "goal_type": "endurance", "target_value": 100, "unit": "km"}
+    ],
+}
+
+STUB_CHAT_REPLY = "This is an offline reply from the Claude stub. Keep riding consistently!"
+
+
+def _reply_for(messages) -> str:
+    prompt = messages[-1]["content"] if messages else ""
+    if "Return ONLY valid JSON" in prompt:
+        return json.dumps(STUB_PLAN)
+    return STUB_CHAT_REPLY
+
+
+class _StubStream:
+    def __init__(self, text: str, delay: float):
+        self._text = text
+        self._delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self) -> AsyncIterator[str]:
+        for i, word in enumerate(self._text.split(" ")):
+            await asyncio.sleep(self._delay)
+            yield word if i == 0 else " " + word
+
+
+class _StubMessages:
+    def __init__(self, delay: float):
+        self._delay = delay
+
+    async def create(self, *, messages, **kwargs):
+        await asyncio.sleep(self._delay)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=_reply_for(messages))])
+
+    def stream(self, *, messages, **kwargs):
+        return _StubStream(_reply_for(messages), self._delay / 10)
+
+
+class StubAsyncAnthropic:
+    """Mimics ``anthropic.AsyncAnthropic`` for messages.create / messages.stream."""
+
+    def __init__(self, delay: float = 0.5):
+        self.messages = _StubMessages(delay)
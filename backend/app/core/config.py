@@ -6,13 +6,84 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Etape Training Hub"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    DEBUG: bool = False
 
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
 
+    # In-process cache of users resolved from access tokens. Invalidation on lock,
+    # role change or delete reaches only the worker that made the change; the
+    # others keep the old entry until it expires, so keep the TTL short.
+    AUTH_USER_CACHE_TTL: int = 5  # seconds
+    AUTH_USER_CACHE_SIZE: int = 10000
+
+    # In-process cache of per-user unread message counts, kept current by message events.
+    # Events only reach other workers through a shared REALTIME_BACKEND; with the
+    # "local" backend and several workers, the others serve a stale count until
+    # the entry expires, so keep the TTL short unless such a backend is in use.
+    UNREAD_CACHE_TTL: int = 5  # seconds; also bounds staleness from changes made outside the messages API
+    UNREAD_CACHE_SIZE: int = 10000
+
+    # Dedicated bcrypt worker pool
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0  # seconds a hash may wait for a worker
+
     DATABASE_URL: str = "postgresql://user:password@db:5432/etape_training"
 
+    # Connection pool (applies to both the sync and async engines)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+
+    # Warn when one statement shape runs more than this many times in a request
+    DB_QUERY_REPEAT_THRESHOLD: int = 10
+
+    # Readiness probe (/health/ready)
+    HEALTH_CACHE_TTL: float = 2.0  # seconds a readiness report is reused
+    HEALTH_DB_TIMEOUT: float = 2.0  # seconds for the DB ping, including pool checkout
+    HEALTH_DB_MAX_LATENCY_MS: float = 500.0  # slower pings report not ready
+    HEALTH_MIN_POOL_HEADROOM: int = 1  # free connections required in each pool
+    HEALTH_CHECK_CLAUDE: bool = False  # also require a configured Claude client
+
+    # Claude API client
+    CLAUDE_MODEL: str = "claude-sonnet-4-20250514"
+    CLAUDE_MAX_CONCURRENCY: int = 4  # in-flight calls per worker
+    CLAUDE_MAX_CONNECTIONS: int = 10
+    CLAUDE_MAX_RETRIES: int = 2
+    CLAUDE_TIMEOUT: float = 120.0  # seconds, default per call
+    CLAUDE_CHAT_TIMEOUT: float = 30.0
+    CLAUDE_USE_STUB: bool = False  # canned offline responses instead of the API
+    PARSE_CACHE_MAX_ENTRIES: int = 500  # cached PDF parse results; 0 disables
+
+    # PDF text extraction (process pool)
+    PDF_EXTRACT_WORKERS: int = 2
+    PDF_EXTRACT_TIMEOUT: float = 20.0  # seconds per document
+    PDF_EXTRACT_MAX_CHARS: int = 200000  # extraction stops here
+
+    # Plan parsing: longer texts are split into chunks parsed concurrently
+    PDF_TEXT_MAX_CHARS: int = 15000  # largest text parsed in a single call
+    PARSE_CHUNK_CHARS: int = 10000
+    PARSE_CHUNK_CONCURRENCY: int = 4  # per document, within CLAUDE_MAX_CONCURRENCY
+
+    # Background PDF parse jobs
+    PARSE_JOB_CONCURRENCY: int = 2  # worker tasks per process; 0 runs no workers here
+    PARSE_JOB_MAX_ATTEMPTS: int = 3
+    PARSE_JOB_RETRY_BACKOFF: float = 10.0  # seconds, doubled per attempt
+    PARSE_JOB_POLL_INTERVAL: float = 2.0
+    PARSE_JOB_STALE_AFTER: int = 600  # seconds before a running job is presumed dead; keep above the longest parse
+    PARSE_JOB_MAX_ACTIVE_PER_USER: int = 5
+
+    # Real-time message events over WebSockets
+    REALTIME_BACKEND: str = "local"  # pub/sub transport; "local" fans out within one process
+    REALTIME_QUEUE_SIZE: int = 100  # events buffered per socket before a slow client is dropped
+    REALTIME_PING_INTERVAL: float = 25.0  # seconds of silence before a keepalive ping
+
+    # Longest [from, to) window the planned-workout calendar will return
+    CALENDAR_MAX_DAYS: int = 92
+
     # Strava OAuth
     STRAVA_CLIENT_ID: Optional[str] = None
     STRAVA_CLIENT_SECRET: Optional[str] = None
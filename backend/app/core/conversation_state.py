@@ -0,0 +1,155 @@
+"""
+Incremental maintenance of the conversation_state inbox table.
+
+Each conversation has one row per participant holding the latest message
+and how many of the partner's messages that participant hasn't read, so the
+inbox is one indexed query however many partners a user has. The messages
+router calls the hooks below before committing, so the rows change in the
+same transaction as the messages they summarize. Counters and the latest
+message pointer are updated with SQL expressions to stay correct under
+concurrent writers.
+
+Backfill or repair the table with:
+
+    python -m app.core.conversation_state [user_id ...]
+"""
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert, or_
+from sqlalchemy.orm import Session
+
+from app.models.conversation_state import ConversationState
+from app.models.message import Message
+
+
+def _touch(db: Session, user_id: int, partner_id: int, message: Message, unread_delta: int) -> bool:
+    """Point one participant's row at ``message`` if it is newer; False when the row doesn't exist."""
+    newer = ConversationState.last_message_id < message.id
+    updated = db.query(ConversationState).filter(
+        ConversationState.user_id == user_id,
+        ConversationState.partner_id == partner_id,
+    ).update({
+        ConversationState.last_message_id: case((newer, message.id), else_=ConversationState.last_message_id),
+        ConversationState.last_message_at: case((newer, message.created_at), else_=ConversationState.last_message_at),
+        ConversationState.unread_count: ConversationState.unread_count + unread_delta,
+    }, synchronize_session=False)
+    return updated == 1
+
+
+def message_sent(db: Session, message: Message) -> None:
+    db.flush()  # assigns message.id and created_at
+    sender_row = _touch(db, message.sender_id, message.recipient_id, message, 0)
+    recipient_row = _touch(db, message.recipient_id, message.sender_id, message, 1)
+    if not (sender_row and recipient_row):
+        # First message between the two: build the rows from messages, which now include this one
+        rebuild_conversation_state(db, pairs=[(message.sender_id, message.recipient_id)])
+
+
+def messages_read(db: Session, user_id: int, partner_id: int, count: int) -> None:
+    """Record that ``user_id`` just read ``count`` previously unread messages from ``partner_id``."""
+    if not count:
+        return
+    db.query(ConversationState).filter(
+        ConversationState.user_id == user_id,
+        ConversationState.partner_id == partner_id,
+    ).update({
+        ConversationState.unread_count: case(
+            (ConversationState.unread_count > count, ConversationState.unread_count - count),
+            else_=0,
+        ),
+    }, synchronize_session=False)
+
+
+def rebuild_conversation_state(
+    db: Session,
+    user_ids: Optional[Iterable[int]] = None,
+    pairs: Optional[List[Tuple[int, int]]] = None,
+) -> int:
+    """
+    Recompute inbox rows from the messages table.
+
+    Args:
+        db: Database session (the caller commits)
+        user_ids: Rebuild every conversation these users take part in
+        pairs: Rebuild only the conversations between these pairs of users;
+            with neither argument the whole table is rebuilt
+
+    Returns:
+        Number of rows written
+    """
+    db.flush()
+    directed = db.query(
+        Message.sender_id,
+        Message.recipient_id,
+        func.max(Message.id),
+        func.sum(case((Message.is_read == False, 1), else_=0)),
+    )
+    existing = db.query(ConversationState)
+    if pairs is not None:
+        directed = directed.filter(or_(*(
+            or_(
+                and_(Message.sender_id == a, Message.recipient_id == b),
+                and_(Message.sender_id == b, Message.recipient_id == a),
+            )
+            for a, b in pairs
+        )))
+        existing = existing.filter(or_(*(
+            or_(
+                and_(ConversationState.user_id == a, ConversationState.partner_id == b),
+                and_(ConversationState.user_id == b, ConversationState.partner_id == a),
+            )
+            for a, b in pairs
+        )))
+    elif user_ids is not None:
+        user_ids = list(user_ids)
+        directed = directed.filter(or_(Message.sender_id.in_(user_ids), Message.recipient_id.in_(user_ids)))
+        existing = existing.filter(or_(
+            ConversationState.user_id.in_(user_ids), ConversationState.partner_id.in_(user_ids)
+        ))
+
+    latest: Dict[Tuple[int, int], int] = {}
+    unread: Dict[Tuple[int, int], int] = {}
+    for sender_id, recipient_id, last_id, unread_count in directed.group_by(
+        Message.sender_id, Message.recipient_id
+    ).all():
+        for key in ((sender_id, recipient_id), (recipient_id, sender_id)):
+            latest[key] = max(latest.get(key, 0), last_id)
+        key = (recipient_id, sender_id)
+        unread[key] = unread.get(key, 0) + int(unread_count or 0)
+
+    sent_at = dict(
+        db.query(Message.id, Message.created_at).filter(Message.id.in_(set(latest.values()))).all()
+    ) if latest else {}
+
+    existing.delete(synchronize_session=False)
+    rows = [
+        {
+            "user_id": user_id,
+            "partner_id": partner_id,
+            "last_message_id": last_id,
+            "last_message_at": sent_at[last_id],
+            "unread_count": unread.get((user_id, partner_id), 0),
+        }
+        for (user_id, partner_id), last_id in latest.items()
+    ]
+    if rows:
+        db.execute(insert(ConversationState), rows)
+    return len(rows)
+
+
+def main(argv: List[str]) -> None:
+    from app.db.base import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user_ids = [int(arg) for arg in argv] or None
+        written = rebuild_conversation_state(db, user_ids)
+        db.commit()
+        print(f"Rebuilt {written} conversation rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
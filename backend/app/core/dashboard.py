@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, distinct, func
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.training_plan import TrainingPlan, PlannedWorkout
+from app.core.athlete_stats import load_athlete_stats
+
+
+def plan_compliance_by_athlete(
+    db: Session, athlete_ids: List[int], now: datetime
+) -> Dict[int, Dict[str, int]]:
+    """Active plan count and due/completed planned workouts per athlete."""
+    rows = db.query(
+        TrainingPlan.athlete_id,
+        func.count(distinct(TrainingPlan.id)),
+        func.count(PlannedWorkout.id),
+        func.sum(case((PlannedWorkout.is_completed == True, 1), else_=0)),
+    ).outerjoin(
+        PlannedWorkout,
+        and_(
+            PlannedWorkout.training_plan_id == TrainingPlan.id,
+            PlannedWorkout.scheduled_date <= now,
+        )
+    ).filter(
+        TrainingPlan.athlete_id.in_(athlete_ids),
+        TrainingPlan.is_active == True
+    ).group_by(TrainingPlan.athlete_id).all()
+
+    return {
+        athlete_id: {
+            "active_plans": plan_count,
+            "planned": planned or 0,
+            "completed": int(completed or 0),
+        }
+        for athlete_id, plan_count, planned, completed in rows
+    }
+
+
+def get_trainer_dashboard(
+    db: Session, trainer_id: int, now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Build the trainer dashboard summary in a fixed number of queries.
+
+    Last activity comes from the athlete_stats rollup and compliance from a
+    single grouped query over all of the trainer's athletes, so the query
+    count does not grow with roster size.
+    """
+    now = now or datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+
+    athlete_ids = [a[0] for a in db.query(TrainerAthleteAssignment.athlete_id).filter(
+        TrainerAthleteAssignment.trainer_id == trainer_id,
+        TrainerAthleteAssignment.is_active == True
+    ).all()]
+
+    active_plans = db.query(TrainingPlan).filter(
+        TrainingPlan.trainer_id == trainer_id, TrainingPlan.is_active == True
+    ).count()
+
+    attention_list = []
+    athlete_summaries = []
+
+    if athlete_ids:
+        stats_map = load_athlete_stats(db, athlete_ids)
+        athletes = {u.id: u for u in db.query(User).filter(User.id.in_(athlete_ids)).all()}
+        compliance_map = plan_compliance_by_athlete(db, athlete_ids, now)
+    else:
+        athletes, stats_map, compliance_map = {}, {}, {}
+
+    for aid in athlete_ids:
+        athlete = athletes.get(aid)
+        if not athlete:
+            continue
+
+        stats = stats_map.get(aid)
+        last_activity = stats.last_activity if stats else None
+        if not last_activity or last_activity < week_ago:
+            attention_list.append({"id": athlete.id, "full_name": athlete.full_name, "email": athlete.email})
+
+        plan_stats = compliance_map.get(aid, {"active_plans": 0, "planned": 0, "completed": 0})
+        total_w, completed_w = plan_stats["planned"], plan_stats["completed"]
+        compliance = (completed_w / total_w * 100) if total_w > 0 else 0
+        athlete_summaries.append({
+            "id": athlete.id, "full_name": athlete.full_name, "email": athlete.email,
+            "compliance_rate": round(compliance, 1),
+            "last_activity": last_activity.isoformat() if last_activity else None,
+            "active_plans": plan_stats["active_plans"]
+        })
+
+    return {
+        "total_athletes": len(athlete_ids),
+        "active_plans": active_plans,
+        "athletes_needing_attention": len(attention_list),
+        "attention_list": attention_list,
+        "athlete_summaries": athlete_summaries
+    }
@@ -0,0 +1,126 @@
+"""
+Readiness checks for load-balancer probes.
+
+Liveness only says the process is serving requests. Readiness also checks
+the dependencies a request needs: a timed ``SELECT 1`` through the async
+engine, free capacity in both connection pools and, optionally, that the
+Claude client is configured. The report (with per-check latency) is cached
+for HEALTH_CACHE_TTL seconds and concurrent probes share one in-flight
+check, so probe traffic costs at most one DB round trip per interval.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.claude_service import claude_service
+from app.core.config import settings
+from app.db.base import async_engine, engine
+
+OK = "ok"
+FAIL = "fail"
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+async def _ping() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_database() -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        # The timeout covers waiting for a pooled connection as well as the query
+        await asyncio.wait_for(_ping(), timeout=settings.HEALTH_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"status": FAIL, "latency_ms": _elapsed_ms(start), "error": "timed out"}
+    except Exception as e:
+        return {"status": FAIL, "latency_ms": _elapsed_ms(start), "error": type(e).__name__}
+    latency_ms = _elapsed_ms(start)
+    if latency_ms > settings.HEALTH_DB_MAX_LATENCY_MS:
+        return {"status": FAIL, "latency_ms": latency_ms, "error": "slow"}
+    return {"status": OK, "latency_ms": latency_ms}
+
+
+def _pool_headroom(engine: Engine) -> Optional[Dict[str, int]]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None  # SQLite's default pools have no fixed capacity
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    in_use = pool.checkedout()
+    return {"in_use": in_use, "capacity": capacity, "headroom": capacity - in_use}
+
+
+def check_pools() -> Dict[str, Any]:
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"status": OK}
+    for name, eng in (("sync", engine), ("async", async_engine.sync_engine)):
+        headroom = _pool_headroom(eng)
+        if headroom is None:
+            continue
+        result[name] = headroom
+        if headroom["headroom"] < settings.HEALTH_MIN_POOL_HEADROOM:
+            result["status"] = FAIL
+            result["error"] = f"{name} pool exhausted"
+    result["latency_ms"] = _elapsed_ms(start)
+    return result
+
+
+def check_claude() -> Dict[str, Any]:
+    # Configuration only; a live API call per probe would cost money and rate limit
+    start = time.perf_counter()
+    if settings.CLAUDE_USE_STUB:
+        return {"status": OK, "mode": "stub", "latency_ms": _elapsed_ms(start)}
+    if not claude_service.is_available():
+        return {"status": FAIL, "error": "ANTHROPIC_API_KEY not set", "latency_ms": _elapsed_ms(start)}
+    return {"status": OK, "mode": "api", "latency_ms": _elapsed_ms(start)}
+
+
+class ReadinessProbe:
+    """
+    Cached, single-flight readiness report.
+
+    Args:
+        ttl: Seconds a report is reused before the checks run again
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._report: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def check(self) -> Tuple[bool, Dict[str, Any]]:
+        """Return (ready, report), running the checks only when the cached report expired."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._report is None or time.monotonic() >= self._expires_at:
+            async with self._lock:
+                # Another probe may have refreshed the report while we waited
+                if self._report is None or time.monotonic() >= self._expires_at:
+                    self._report = await self._run_checks()
+                    self._expires_at = time.monotonic() + self.ttl
+                    return self._report["status"] == "ready", {**self._report, "cached": False}
+        return self._report["status"] == "ready", {**self._report, "cached": True}
+
+    async def _run_checks(self) -> Dict[str, Any]:
+        checks = {"db_pool": check_pools()}
+        checks["database"] = await check_database()
+        if settings.HEALTH_CHECK_CLAUDE:
+            checks["claude"] = check_claude()
+        ready = all(check["status"] == OK for check in checks.values())
+        return {
+            "status": "ready" if ready else "unavailable",
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": checks,
+        }
+
+
+readiness_probe = ReadinessProbe(ttl=settings.HEALTH_CACHE_TTL)
@@ -0,0 +1,155 @@
+"""
+Persistent cache of parsed training-plan PDFs.
+
+Trainers re-upload the same club templates, so parse results are stored in
+the database keyed by the SHA-256 of the PDF bytes together with the Claude
+model and prompt version; changing either naturally misses the old entries.
+The table is bounded to PARSE_CACHE_MAX_ENTRIES rows, evicting the least
+recently used.
+
+The cache is an optimization only: a failed lookup counts as a miss and a
+failed store is skipped, both logged, so parsing never fails because of it.
+"""
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.db.upsert import dialect_insert
+from app.models.parsed_document import ParsedDocument
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCacheCounters:
+    """Process-local hit/miss/eviction/error counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+
+counters = ParseCacheCounters()
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def cache_key(digest: str, model: str, prompt_version: str) -> str:
+    return f"{digest}:{model}:{prompt_version}"
+
+
+def is_enabled() -> bool:
+    return settings.PARSE_CACHE_MAX_ENTRIES > 0
+
+
+async def get_parsed(digest: str, model: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+    """Return the cached parse result and mark it recently used, or None."""
+    if not is_enabled():
+        return None
+    key = cache_key(digest, model, prompt_version)
+    try:
+        async with AsyncSessionLocal() as db:
+            data = (await db.execute(
+                select(ParsedDocument.data).where(ParsedDocument.cache_key == key)
+            )).scalar_one_or_none()
+            if data is not None:
+                await db.execute(
+                    update(ParsedDocument)
+                    .where(ParsedDocument.cache_key == key)
+                    .values(last_used_at=datetime.utcnow(), hit_count=ParsedDocument.hit_count + 1)
+                )
+                await db.commit()
+    except Exception:
+        logger.warning("Parse cache lookup failed; treating it as a miss", exc_info=True)
+        counters.incr("errors")
+        data = None
+    counters.incr("hits" if data is not None else "misses")
+    return data
+
+
+async def store_parsed(digest: str, model: str, prompt_version: str, data: Dict[str, Any]) -> None:
+    """Insert (or replace) a parse result, then evict beyond the size bound."""
+    if not is_enabled():
+        return
+    key = cache_key(digest, model, prompt_version)
+    now = datetime.utcnow()
+    try:
+        async with AsyncSessionLocal() as db:
+            # One statement, so concurrent stores of the same document can't collide
+            stmt = dialect_insert(db.bind.dialect.name, ParsedDocument).values(
+                cache_key=key,
+                content_hash=digest,
+                model=model,
+                prompt_version=prompt_version,
+                data=data,
+                hit_count=0,
+                created_at=now,
+                last_used_at=now,
+            )
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[ParsedDocument.cache_key],
+                set_={
+                    "data": stmt.excluded.data,
+                    "hit_count": stmt.excluded.hit_count,
+                    "created_at": stmt.excluded.created_at,
+                    "last_used_at": stmt.excluded.last_used_at,
+                },
+            ))
+
+            total = (await db.execute(select(func.count()).select_from(ParsedDocument))).scalar()
+            excess = total - settings.PARSE_CACHE_MAX_ENTRIES
+            evicted = 0
+            if excess > 0:
+                stale = select(ParsedDocument.cache_key).order_by(
+                    ParsedDocument.last_used_at.asc()
+                ).limit(excess)
+                result = await db.execute(
+                    delete(ParsedDocument).where(ParsedDocument.cache_key.in_(stale)),
+                    execution_options={"synchronize_session": False},
+                )
+                evicted = result.rowcount
+            await db.commit()
+    except Exception:
+        logger.warning("Parse cache store failed; result not cached", exc_info=True)
+        counters.incr("errors")
+        return
+    counters.incr("evictions", evicted)
+    counters.incr("stores")
+
+
+async def cache_stats() -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        entries = (await db.execute(select(func.count()).select_from(ParsedDocument))).scalar()
+    return {
+        "enabled": is_enabled(),
+        "entries": entries,
+        "max_entries": settings.PARSE_CACHE_MAX_ENTRIES,
+        **counters.snapshot(),
+    }
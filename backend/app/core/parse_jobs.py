@@ -0,0 +1,227 @@
+"""
+DB-backed background jobs for AI parsing of training-plan PDFs.
+
+Uploads are stored as ParseJob rows and return immediately; a small pool of
+asyncio worker tasks started with the app claims pending jobs, runs
+``claude_service.parse_training_plan_pdf`` and writes the result back.
+Retryable failures are re-queued with exponential backoff up to
+PARSE_JOB_MAX_ATTEMPTS. Because state lives in the database, any API process
+can report status, and every process running workers re-queues jobs that
+have been running longer than PARSE_JOB_STALE_AFTER (left behind by a
+crashed process), checking at startup and every half of that interval. A
+worker whose job was re-queued under it discards its result.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.claude_service import claude_service
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.parse_job import ParseJob
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (PENDING, RUNNING)
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+class TooManyJobsError(Exception):
+    pass
+
+
+async def enqueue_parse_job(db: AsyncSession, user_id: int, filename: str, content: bytes) -> ParseJob:
+    """
+    Store a PDF for background parsing and wake the local workers.
+
+    Raises:
+        TooManyJobsError: If the user already has PARSE_JOB_MAX_ACTIVE_PER_USER unfinished jobs
+    """
+    active = (await db.execute(
+        select(func.count(ParseJob.id)).where(
+            ParseJob.user_id == user_id,
+            ParseJob.status.in_(ACTIVE_STATUSES),
+        )
+    )).scalar()
+    if active >= settings.PARSE_JOB_MAX_ACTIVE_PER_USER:
+        raise TooManyJobsError(
+            f"You already have {active} documents being parsed; wait for one to finish"
+        )
+
+    job = ParseJob(
+        user_id=user_id,
+        filename=filename,
+        status=PENDING,
+        pdf_content=content,
+        max_attempts=settings.PARSE_JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    parse_job_runner.notify()
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.PARSE_JOB_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+class ParseJobRunner:
+    """
+    In-process worker pool for ParseJob rows.
+
+    Args:
+        concurrency: Number of jobs processed at once by this process
+        poll_interval: Seconds between queue checks when idle (enqueues in
+            this process wake the workers immediately)
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        if self._tasks or self.concurrency <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        await self.requeue_stale()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"parse-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._requeue_loop(), name="parse-job-requeue"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def requeue_stale(self) -> None:
+        """Put jobs left running by a dead process back on the queue."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.PARSE_JOB_STALE_AFTER)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(ParseJob)
+                .where(ParseJob.status == RUNNING, ParseJob.started_at < cutoff)
+                .values(status=PENDING, next_attempt_at=datetime.utcnow())
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.warning("Re-queued %d stale parse jobs", result.rowcount)
+            self.notify()
+
+    async def _requeue_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.PARSE_JOB_STALE_AFTER / 2)
+            try:
+                await self.requeue_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to re-queue stale parse jobs")
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                claimed = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to claim parse job")
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(*claimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Parse job %s crashed", claimed[0])
+
+    async def _claim(self) -> Optional[Tuple[int, int, str, bytes]]:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            job_id = (await db.execute(
+                select(ParseJob.id)
+                .where(ParseJob.status == PENDING, ParseJob.next_attempt_at <= now)
+                .order_by(ParseJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )).scalar()
+            if job_id is None:
+                return None
+            # Conditional update so two workers can't both take the job where row locks aren't available
+            claimed = await db.execute(
+                update(ParseJob)
+                .where(ParseJob.id == job_id, ParseJob.status == PENDING)
+                .values(status=RUNNING, started_at=now, attempts=ParseJob.attempts + 1)
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return None
+            attempt, filename, content = (await db.execute(
+                select(ParseJob.attempts, ParseJob.filename, ParseJob.pdf_content).where(ParseJob.id == job_id)
+            )).one()
+        return job_id, attempt, filename, content
+
+    async def _run(self, job_id: int, attempt: int, filename: str, content: bytes) -> None:
+        try:
+            result = await claude_service.parse_training_plan_pdf(content, filename)
+        except Exception as e:
+            result = {"success": False, "error": str(e), "data": None, "retryable": True}
+
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ParseJob, job_id)
+            if job is None or job.status != RUNNING or job.attempts != attempt:
+                # Deleted, or re-queued as stale and now owned by another attempt
+                logger.warning("Parse job %s attempt %d no longer owns the job; discarding its result", job_id, attempt)
+                return
+            now = datetime.utcnow()
+            if result["success"]:
+                job.status = SUCCEEDED
+                job.result = result["data"]
+                job.cached = result.get("cached", False)
+                job.error = None
+            elif result.get("retryable") and job.attempts < job.max_attempts:
+                job.status = PENDING
+                job.error = result["error"]
+                job.next_attempt_at = now + retry_delay(job.attempts)
+            else:
+                job.status = FAILED
+                job.error = result["error"]
+
+            if job.status in TERMINAL_STATUSES:
+                job.finished_at = now
+                job.pdf_content = None
+            await db.commit()
+
+        if job.status == PENDING:
+            logger.info("Parse job %s failed (attempt %d), retrying: %s", job_id, job.attempts, job.error)
+
+
+parse_job_runner = ParseJobRunner(
+    concurrency=settings.PARSE_JOB_CONCURRENCY,
+    poll_interval=settings.PARSE_JOB_POLL_INTERVAL,
+)
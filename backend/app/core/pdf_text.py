@@ -0,0 +1,222 @@
+"""
+PDF text extraction off the event loop.
+
+pdfminer is pure Python and holds the GIL for seconds on long documents, so
+extraction runs in a small process pool. Pages are converted one at a time
+and the worker stops as soon as it has ``max_chars`` of text (nothing past
+that is parsed) or the per-document time limit has passed, returning
+whatever it has so far.
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO, StringIO
+from typing import Any, Dict, Optional, Tuple
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionError(Exception):
+    pass
+
+
+class RetryablePDFExtractionError(PDFExtractionError):
+    """Extraction didn't finish for reasons other than the document itself (time limit, lost worker)."""
+
+
+def extract_pdf_text(pdf_content: bytes, max_chars: int, time_limit: float) -> Dict[str, Any]:
+    """
+    Extract text page by page, stopping early at ``max_chars`` or ``time_limit`` seconds.
+
+    Runs inside a pool worker, so it must stay a picklable module-level function.
+    """
+    deadline = time.monotonic() + time_limit
+    rsrcmgr = PDFResourceManager(caching=True)
+    output = StringIO()
+    device = TextConverter(rsrcmgr, output, laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    pages = 0
+    truncated = False
+    timed_out = False
+    try:
+        for page in PDFPage.get_pages(BytesIO(pdf_content), caching=True):
+            if time.monotonic() >= deadline:
+                timed_out = True
+                break
+            interpreter.process_page(page)
+            pages += 1
+            if output.tell() >= max_chars:
+                truncated = True
+                break
+    finally:
+        device.close()
+    return {
+        "text": output.getvalue()[:max_chars],
+        "pages": pages,
+        "truncated": truncated,
+        "timed_out": timed_out,
+    }
+
+
+# Set in each pool worker by _init_worker; the parent learns when a job leaves the queue
+_job_starts = None
+
+
+def _init_worker(job_starts) -> None:
+    global _job_starts
+    _job_starts = job_starts
+
+
+def _extract_job(token: int, pdf_content: bytes, max_chars: int, time_limit: float) -> Dict[str, Any]:
+    _job_starts.put(token)
+    return extract_pdf_text(pdf_content, max_chars, time_limit)
+
+
+class PDFTextExtractor:
+    """
+    Process pool for extract_pdf_text with a per-document time limit.
+
+    Workers check the limit between pages. As a backstop, a document still
+    unfinished twice the limit after a worker picked it up (time spent
+    queued doesn't count) is abandoned: the worker is stuck inside one page
+    and the pool is recycled.
+
+    ProcessPoolExecutor fails every outstanding job once one of its workers
+    dies, so documents lost to a recycle (or to a worker crash) are
+    resubmitted to the fresh pool, up to MAX_ATTEMPTS runs in total. Time
+    limits and lost workers raise RetryablePDFExtractionError.
+    """
+
+    MAX_ATTEMPTS = 2
+
+    def __init__(self, max_workers: int, time_limit: float):
+        self.max_workers = max_workers
+        self.time_limit = time_limit
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._tokens = itertools.count()
+        self._waiting: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = {}
+        self._job_starts = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                context = multiprocessing.get_context("spawn")
+                if self._job_starts is None:
+                    self._job_starts = context.Queue()
+                    threading.Thread(
+                        target=self._read_job_starts, args=(self._job_starts,),
+                        name="pdf-job-starts", daemon=True,
+                    ).start()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._job_starts,),
+                )
+            return self._pool
+
+    def _read_job_starts(self, job_starts) -> None:
+        """Wake the coroutine waiting on each job a worker reports it has started."""
+        while True:
+            token = job_starts.get()
+            if token is None:
+                return
+            with self._lock:
+                waiter = self._waiting.get(token)
+            if waiter is not None:
+                loop, started = waiter
+                try:
+                    loop.call_soon_threadsafe(started.set)
+                except RuntimeError:  # loop already closed
+                    pass
+
+    def _recycle(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, pdf_content: bytes, max_chars: int) -> Dict[str, Any]:
+        """
+        Raises:
+            RetryablePDFExtractionError: On the hard time limit, or when every attempt lost its worker
+        """
+        for _ in range(self.MAX_ATTEMPTS):
+            pool = self._get_pool()
+            try:
+                return await self._extract_in(pool, pdf_content, max_chars)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory) or the pool was recycled for another
+                # document; start a fresh pool and run this document again
+                self._recycle(pool)
+        raise RetryablePDFExtractionError("PDF text extraction failed: worker process lost")
+
+    async def _extract_in(self, pool: ProcessPoolExecutor, pdf_content: bytes, max_chars: int) -> Dict[str, Any]:
+        token = next(self._tokens)
+        started = asyncio.Event()
+        with self._lock:
+            self._waiting[token] = (asyncio.get_running_loop(), started)
+        try:
+            try:
+                future = pool.submit(_extract_job, token, pdf_content, max_chars, self.time_limit)
+            except RuntimeError as e:  # pool shut down by a concurrent recycle
+                raise BrokenProcessPool(str(e)) from e
+            result = asyncio.wrap_future(future)
+            start_wait = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait({result, start_wait}, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            finally:
+                start_wait.cancel()
+        finally:
+            with self._lock:
+                self._waiting.pop(token, None)
+
+        if future.cancelled():
+            # Dropped from the queue when its pool was recycled
+            raise BrokenProcessPool("PDF extraction pool was recycled")
+        if not result.done():
+            hard_limit = self.time_limit * 2
+            try:
+                await asyncio.wait_for(asyncio.shield(result), timeout=hard_limit)
+            except asyncio.TimeoutError:
+                logger.warning("PDF extraction exceeded %.0fs inside a page; recycling pool", hard_limit)
+                # The abandoned job fails with BrokenProcessPool; retrieve it so asyncio doesn't warn
+                result.add_done_callback(lambda f: f.cancelled() or f.exception())
+                self._recycle(pool)
+                raise RetryablePDFExtractionError("PDF text extraction timed out")
+        return result.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            job_starts, self._job_starts = self._job_starts, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if job_starts is not None:
+            job_starts.put(None)
+
+
+pdf_text_extractor = PDFTextExtractor(
+    max_workers=settings.PDF_EXTRACT_WORKERS,
+    time_limit=settings.PDF_EXTRACT_TIMEOUT,
+)
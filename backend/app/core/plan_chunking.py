@@ -0,0 +1,154 @@
+"""
+Split long training-plan text into chunks and merge the per-chunk parses.
+
+Long plans are parsed map-reduce style (see ClaudeAIService): the text is cut
+at week headings and page breaks into chunks small enough for one prompt,
+each chunk is parsed independently, and the partial results are merged here.
+Merging is deterministic: the same chunk results always produce the same
+plan regardless of which chunk finished first.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# "Week 5", "WEEK 12:", "Week 3 -" at the start of a line
+_WEEK_HEADING = re.compile(r"^[ \t]*week[ \t]+\d+\b", re.IGNORECASE | re.MULTILINE)
+# pdfminer ends every page with a form feed
+_PAGE_BREAK = "\f"
+
+
+def _segments(text: str) -> List[str]:
+    """Break text into pieces at page breaks and before week headings."""
+    pieces: List[str] = []
+    for page in text.split(_PAGE_BREAK):
+        starts = [m.start() for m in _WEEK_HEADING.finditer(page)]
+        bounds = [0] + [s for s in starts if s > 0] + [len(page)]
+        pieces.extend(page[a:b] for a, b in zip(bounds, bounds[1:]))
+    return [p for p in pieces if p.strip()]
+
+
+def _hard_split(segment: str, max_chars: int) -> List[str]:
+    """Split an oversized segment at line boundaries (or mid-line as a last resort)."""
+    parts: List[str] = []
+    current = ""
+    for line in segment.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:max_chars])
+            line = line[max_chars:]
+        if len(current) + len(line) > max_chars:
+            parts.append(current)
+            current = ""
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_plan_text(text: str, max_chars: int) -> List[str]:
+    """
+    Pack page/week segments into chunks of at most ``max_chars`` characters.
+
+    Consecutive segments are combined greedily so chunks stay as large as the
+    budget allows; a chunk only starts mid-week when a single week is larger
+    than the budget.
+    """
+    chunks: List[str] = []
+    current = ""
+    for segment in _segments(text):
+        if len(segment) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_hard_split(segment, max_chars))
+            continue
+        if current and len(current) + len(segment) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += segment
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _norm(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sort_position(value: Any) -> Tuple[int, int]:
+    number = _int_or_none(value)
+    return (0, number) if number is not None else (1, 0)
+
+
+def _dedupe(items: Iterable[Dict[str, Any]], key) -> List[Dict[str, Any]]:
+    seen = set()
+    result = []
+    for item in items:
+        k = key(item)
+        if k in seen:
+            continue
+        seen.add(k)
+        result.append(item)
+    return result
+
+
+def merge_parsed_chunks(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk parse results, given in document order.
+
+    - title/description: first non-empty value
+    - weekly_structure: one entry per week (earliest chunk wins), sorted by week
+    - workouts: de-duplicated on (week, day, title), sorted by week then day
+    - nutrition_guidance / goals: de-duplicated, document order
+    - duration_weeks: the largest week seen or declared
+    """
+    def collect(field: str) -> List[Dict[str, Any]]:
+        return [
+            item for chunk in chunks
+            for item in (chunk.get(field) or [])
+            if isinstance(item, dict)
+        ]
+
+    def first(field: str) -> Any:
+        return next((chunk[field] for chunk in chunks if chunk.get(field)), None)
+
+    weekly_structure = _dedupe(
+        (w for w in collect("weekly_structure") if _int_or_none(w.get("week")) is not None),
+        key=lambda w: _int_or_none(w.get("week")),
+    )
+    weekly_structure.sort(key=lambda w: _int_or_none(w["week"]))
+
+    workouts = _dedupe(
+        collect("workouts"),
+        key=lambda w: (_int_or_none(w.get("week")), _int_or_none(w.get("day_of_week")), _norm(w.get("title"))),
+    )
+    # Stable sort keeps document order within a day
+    workouts.sort(key=lambda w: (_sort_position(w.get("week")), _sort_position(w.get("day_of_week"))))
+
+    nutrition_guidance = _dedupe(
+        collect("nutrition_guidance"),
+        key=lambda n: (_norm(n.get("category")), _norm(n.get("recommendation"))),
+    )
+    goals = _dedupe(collect("goals"), key=lambda g: _norm(g.get("title")))
+
+    weeks = [_int_or_none(chunk.get("duration_weeks")) for chunk in chunks]
+    weeks += [_int_or_none(w.get("week")) for w in weekly_structure + workouts]
+    weeks = [w for w in weeks if w is not None]
+
+    return {
+        "title": first("title"),
+        "description": first("description"),
+        "duration_weeks": max(weeks) if weeks else None,
+        "weekly_structure": weekly_structure,
+        "workouts": workouts,
+        "nutrition_guidance": nutrition_guidance,
+        "goals": goals,
+    }
@@ -0,0 +1,120 @@
+"""
+Bulk creation of training plans with their workouts, goals and nutrition.
+
+Plans built from parsed PDFs (and later clones/imports) can carry hundreds of
+child rows. Instead of adding ORM objects one by one, the plan row is flushed
+to get its id and each child table is then written with a single batched
+INSERT (executemany / insertmanyvalues), all in one transaction.
+"""
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.training_plan import TrainingPlan, PlannedWorkout, PlannedGoal, NutritionPlan
+from app.schemas.training_plan import ParsedExercise, ParsedPlanData
+from app.core.plan_queries import load_plan
+
+DEFAULT_DURATION_WEEKS = 12
+
+
+def _as_int(value: Optional[float]) -> Optional[int]:
+    return int(round(value)) if value is not None else None
+
+
+def rows_from_parsed(parsed: ParsedPlanData, plan_start: datetime, plan_end: datetime) -> Dict[str, List[Dict[str, Any]]]:
+    """Child-table rows (without training_plan_id) for an AI-parsed plan."""
+    workouts = []
+    for w in parsed.workouts or []:
+        week = w.week or 1
+        day = w.day_of_week or 1
+        workouts.append({
+            "title": w.title or "Workout",
+            "workout_type": w.workout_type or "general",
+            "scheduled_date": plan_start + timedelta(weeks=week - 1, days=day - 1),
+            "duration_minutes": _as_int(w.duration_minutes),
+            "description": w.description or "",
+            "intensity": w.intensity or "medium",
+            "exercises": json.dumps([e.model_dump() if isinstance(e, ParsedExercise) else e for e in w.exercises or []]),
+            "is_completed": False,
+        })
+
+    goals = [
+        {
+            "title": g.title or "Goal",
+            "goal_type": g.goal_type or "performance",
+            "description": g.description or "",
+            "target_value": g.target_value,
+            "unit": g.unit,
+            "target_date": plan_end,
+            "is_achieved": False,
+        }
+        for g in parsed.goals or []
+    ]
+
+    nutrition_plans = [
+        {
+            "day_of_week": idx % 7,
+            "meal_type": n.category or "general",
+            "description": n.recommendation or "",
+            "notes": n.details or "",
+        }
+        for idx, n in enumerate(parsed.nutrition_guidance or [])
+    ]
+
+    return {"workouts": workouts, "goals": goals, "nutrition_plans": nutrition_plans}
+
+
+def bulk_create_plan(
+    db: Session,
+    plan: TrainingPlan,
+    workouts: Sequence[Dict[str, Any]] = (),
+    goals: Sequence[Dict[str, Any]] = (),
+    nutrition_plans: Sequence[Dict[str, Any]] = (),
+) -> TrainingPlan:
+    """
+    Insert ``plan`` and its child rows in one transaction and return it fully loaded.
+
+    Child rows are plain column dicts; ``training_plan_id`` is filled in here.
+    Runs one INSERT per non-empty child table regardless of row count.
+    """
+    try:
+        db.add(plan)
+        db.flush()
+        for model, rows in (
+            (PlannedWorkout, workouts),
+            (PlannedGoal, goals),
+            (NutritionPlan, nutrition_plans),
+        ):
+            if rows:
+                db.execute(insert(model), [{**row, "training_plan_id": plan.id} for row in rows])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return load_plan(db, plan.id)
+
+
+def create_plan_from_parsed(
+    db: Session,
+    parsed: ParsedPlanData,
+    trainer_id: int,
+    athlete_id: int,
+    start_date: date,
+) -> TrainingPlan:
+    """Create a plan and all its children from an AI-parsed payload."""
+    plan_start = datetime.combine(start_date, datetime.min.time())
+    plan_end = plan_start + timedelta(weeks=parsed.duration_weeks or DEFAULT_DURATION_WEEKS)
+    plan = TrainingPlan(
+        trainer_id=trainer_id,
+        athlete_id=athlete_id,
+        title=parsed.title or "Training Plan",
+        description=parsed.description or "",
+        start_date=plan_start,
+        end_date=plan_end,
+        is_active=True,
+    )
+    return bulk_create_plan(db, plan, **rows_from_parsed(parsed, plan_start, plan_end))
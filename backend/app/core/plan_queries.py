@@ -0,0 +1,71 @@
+"""
+Loading training plans together with their child collections.
+
+The detail view serializes workouts, goals, documents and nutrition plans;
+left to lazy loading that is one query per relationship after the plan
+itself. load_plan fetches the requested relationships with selectinload
+(one extra query each) and marks the rest ``noload`` so serialization can
+never fall back to lazy queries.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, noload, selectinload
+
+from app.models.training_plan import TrainingPlan
+from app.models.user import User, UserRole
+
+PLAN_RELATIONS = {
+    "workouts": TrainingPlan.workouts,
+    "goals": TrainingPlan.goals,
+    "documents": TrainingPlan.documents,
+    "nutrition_plans": TrainingPlan.nutrition_plans,
+}
+
+
+def parse_include(include: Optional[str]) -> Optional[set]:
+    """
+    Parse a comma-separated ``include`` parameter into relation names.
+
+    Returns None (meaning all relations) when the parameter is omitted.
+
+    Raises:
+        ValueError: If a name is not one of PLAN_RELATIONS
+    """
+    if include is None:
+        return None
+    names = {name.strip() for name in include.split(",") if name.strip()}
+    unknown = names - PLAN_RELATIONS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown include value(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(PLAN_RELATIONS)}"
+        )
+    return names
+
+
+def load_plan(
+    db: Session,
+    plan_id: int,
+    include: Optional[Iterable[str]] = None,
+    visible_to: Optional[User] = None,
+) -> Optional[TrainingPlan]:
+    """
+    Load a plan with the given relations (all when ``include`` is None).
+
+    Runs one query for the plan plus one per included relation. With
+    ``visible_to`` the plan is only returned if that user may view it
+    (admin, or the plan's trainer or athlete), checked in the same query.
+    """
+    names = set(PLAN_RELATIONS) if include is None else set(include)
+    options = [
+        selectinload(rel) if name in names else noload(rel)
+        for name, rel in PLAN_RELATIONS.items()
+    ]
+    stmt = select(TrainingPlan).where(TrainingPlan.id == plan_id).options(*options)
+    if visible_to is not None and visible_to.role != UserRole.ADMIN:
+        stmt = stmt.where(or_(
+            TrainingPlan.trainer_id == visible_to.id,
+            TrainingPlan.athlete_id == visible_to.id,
+        ))
+    return db.execute(stmt.execution_options(populate_existing=True)).scalar_one_or_none()
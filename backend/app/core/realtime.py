@@ -0,0 +1,158 @@
+"""
+In-process pub/sub for pushing message events to connected WebSockets.
+
+Each user has a channel (``user:<id>``). Routers publish events after their
+transaction commits; every open socket for that user holds a bounded queue
+that the hub fans events into. Transport between processes is delegated to a
+backend: ``LocalBackend`` delivers within this process only (one worker, or
+development), and a multi-node backend (e.g. Redis pub/sub) implements the
+same three methods and calls ``deliver`` for each message it receives.
+Listeners see every event for every user delivered to this process, which
+lets in-process caches follow changes made on other workers.
+A subscriber that stops reading is disconnected rather than allowed to grow
+memory; the client reconnects and re-fetches.
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], None]
+Listener = Callable[[int, Dict[str, Any]], None]
+
+
+class LocalBackend:
+    """Single-process backend: published messages are delivered straight back to this hub."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, channel: str, data: str) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, data)
+
+
+BACKENDS = {
+    "local": LocalBackend,
+}
+
+
+class SubscriberOverflow(Exception):
+    pass
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    async def get(self) -> Dict[str, Any]:
+        """Next event for this subscriber; raises SubscriberOverflow once it has fallen too far behind."""
+        if self.overflowed:
+            raise SubscriberOverflow()
+        return await self.queue.get()
+
+
+class MessageHub:
+    """
+    Per-user channels fanned out to local subscribers.
+
+    Args:
+        backend: Transport for published events (see BACKENDS)
+        queue_size: Events buffered per subscriber before it is dropped
+    """
+
+    def __init__(self, backend, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._listeners: List[Listener] = []
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @staticmethod
+    def channel(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener(user_id, event)`` for each event delivered to this process."""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        await self.backend.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    async def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        self.published += 1
+        await self.backend.publish(self.channel(user_id), json.dumps(event, default=str))
+
+    async def publish_many(self, user_ids, event: Dict[str, Any]) -> None:
+        for user_id in dict.fromkeys(user_ids):
+            await self.publish(user_id, event)
+
+    def _deliver(self, channel: str, data: str) -> None:
+        subscribers = self._subscribers.get(channel)
+        if not subscribers and not self._listeners:
+            return
+        event = json.loads(data)
+        if self._listeners:
+            user_id = int(channel.split(":", 1)[1])
+            for listener in self._listeners:
+                try:
+                    listener(user_id, event)
+                except Exception:
+                    logger.exception("Realtime listener failed on %s", channel)
+        for sub in subscribers or ():
+            if sub.overflowed:
+                continue
+            try:
+                sub.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                sub.overflowed = True
+                self.dropped += 1
+                logger.warning("Dropping slow realtime subscriber on %s", channel)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[Subscription]:
+        channel = self.channel(user_id)
+        sub = Subscription(self.queue_size)
+        self._subscribers.setdefault(channel, set()).add(sub)
+        try:
+            yield sub
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(sub)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+message_hub = MessageHub(
+    backend=BACKENDS[settings.REALTIME_BACKEND](),
+    queue_size=settings.REALTIME_QUEUE_SIZE,
+)
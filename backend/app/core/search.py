@@ -0,0 +1,205 @@
+"""
+Ranked full-text search over messages, training plans, planned workouts and rides.
+
+On PostgreSQL each of those tables has a generated ``search_vector`` column
+with a GIN index (migration 0005), so matching is an index lookup and
+ranking reads the stored vector rather than re-parsing text. A search runs
+in two steps: one UNION ALL query finds the best ``limit`` ids per type
+(access rules applied in the same query), then one query per type with hits
+loads titles and ts_headline snippets for just those rows.
+
+The vectors aren't mapped on the models, which would make the ORM fetch them
+back after every insert; is_search_object keeps alembic's autogenerate from
+treating them as drift. Other databases (SQLite in development) fall back to
+unranked LIKE matching with the same access rules.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func, literal, literal_column, or_, select, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session, aliased
+
+from app.models.message import Message
+from app.models.ride import Ride
+from app.models.training_plan import PlannedWorkout, TrainingPlan
+from app.models.user import User, UserRole
+from app.schemas.search import SearchResult
+
+# Must match the configuration the generated columns were built with
+SEARCH_CONFIG = "english"
+SEARCH_TYPES = ("message", "training_plan", "planned_workout", "ride")
+SEARCH_TABLES = ("messages", "training_plans", "planned_workouts", "rides")
+SNIPPET_CHARS = 160
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5, StartSel=**, StopSel=**"
+LIKE_ESCAPE = "\\"
+
+
+def is_search_object(obj, name, type_, reflected, compare_to) -> bool:
+    """alembic include_object hook: False for the migration-managed search columns and indexes."""
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name in {f"ix_{table}_search" for table in SEARCH_TABLES}:
+        return False
+    return True
+
+
+def _escape_like(text: str) -> str:
+    """Make LIKE treat ``%``, ``_`` and the escape character in user input literally."""
+    return text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+
+
+def _vector(table: str):
+    return literal_column(f"{table}.search_vector", TSVECTOR)
+
+
+def _plan_visible(user: User):
+    return or_(TrainingPlan.trainer_id == user.id, TrainingPlan.athlete_id == user.id)
+
+
+def _candidates(db: Session, user: User, accessible_ids: Optional[List[int]], q: str, types: Sequence[str], limit: int):
+    """Best ``limit`` (type, id, rank, date) rows per type, merged and cut to ``limit`` overall."""
+    postgres = db.get_bind().dialect.name == "postgresql"
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    term = f"%{_escape_like(q)}%"
+
+    def branch(kind: str, table: str, id_col, date_col, text_cols, *access):
+        if postgres:
+            vector = _vector(table)
+            match = vector.op("@@")(tsquery)
+            rank = func.ts_rank(vector, tsquery)
+        else:
+            match = or_(*(col.ilike(term, escape=LIKE_ESCAPE) for col in text_cols))
+            rank = literal(0.0)
+        stmt = select(
+            literal(kind).label("type"),
+            id_col.label("id"),
+            rank.label("rank"),
+            date_col.label("date"),
+        ).where(match, *access)
+        return stmt.order_by(literal_column("rank").desc(), date_col.desc()).limit(limit)
+
+    branches = []
+    if "message" in types:
+        # Only the user's own conversations, whatever their role
+        branches.append(branch(
+            "message", "messages", Message.id, Message.created_at, [Message.content],
+            or_(Message.sender_id == user.id, Message.recipient_id == user.id),
+        ))
+    plan_access = () if user.role == UserRole.ADMIN else (_plan_visible(user),)
+    if "training_plan" in types:
+        branches.append(branch(
+            "training_plan", "training_plans", TrainingPlan.id, TrainingPlan.created_at,
+            [TrainingPlan.title, TrainingPlan.description], *plan_access,
+        ))
+    if "planned_workout" in types:
+        branches.append(branch(
+            "planned_workout", "planned_workouts", PlannedWorkout.id, PlannedWorkout.scheduled_date,
+            [PlannedWorkout.title, PlannedWorkout.description],
+            PlannedWorkout.training_plan_id == TrainingPlan.id, *plan_access,
+        ))
+    if "ride" in types:
+        ride_access = () if accessible_ids is None else (Ride.user_id.in_(accessible_ids),)
+        branches.append(branch(
+            "ride", "rides", Ride.id, Ride.ride_date, [Ride.title, Ride.route_name], *ride_access,
+        ))
+
+    merged = union_all(*(select(b.subquery()) for b in branches)).subquery()
+    return db.execute(
+        select(merged).order_by(merged.c.rank.desc(), merged.c.date.desc()).limit(limit)
+    ).all()
+
+
+def _snippet(db: Session, col, tsquery):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.ts_headline(SEARCH_CONFIG, func.coalesce(col, ""), tsquery, HEADLINE_OPTIONS)
+    return func.substr(func.coalesce(col, ""), 1, SNIPPET_CHARS)
+
+
+def search(
+    db: Session,
+    user: User,
+    accessible_ids: Optional[List[int]],
+    q: str,
+    types: Sequence[str] = SEARCH_TYPES,
+    limit: int = 20,
+) -> List[SearchResult]:
+    """
+    Best matches for ``q`` across ``types`` that ``user`` may see, best first.
+
+    Each type applies the same rule as its own endpoints: messages the user
+    sent or received, plans (and their workouts) the user trains or is
+    assigned to (all for admins), and rides owned by ``accessible_ids``
+    (from get_accessible_user_ids; None means everyone).
+
+    ``q`` uses web-search syntax on PostgreSQL: quoted phrases, ``or`` and
+    ``-word``.
+    """
+    hits = _candidates(db, user, accessible_ids, q, types, limit)
+    if not hits:
+        return []
+
+    ids: Dict[str, List[int]] = {}
+    for hit in hits:
+        ids.setdefault(hit.type, []).append(hit.id)
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    details: Dict[tuple, dict] = {}
+
+    if "message" in ids:
+        # Named after the other side of the conversation: the recipient when the user sent it
+        sent = Message.sender_id == user.id
+        partner = aliased(User)
+        rows = db.execute(
+            select(Message.id, sent.label("sent"), partner.id.label("partner_id"), partner.full_name, partner.email,
+                   _snippet(db, Message.content, tsquery).label("snippet"))
+            .join(partner, partner.id == case((sent, Message.recipient_id), else_=Message.sender_id))
+            .where(Message.id.in_(ids["message"]))
+        ).all()
+        for row in rows:
+            direction = "to" if row.sent else "from"
+            details[("message", row.id)] = {
+                "title": f"Message {direction} {row.full_name or row.email}",
+                "snippet": row.snippet,
+                "user_id": row.partner_id,
+            }
+    if "training_plan" in ids:
+        rows = db.execute(
+            select(TrainingPlan.id, TrainingPlan.title, TrainingPlan.athlete_id,
+                   _snippet(db, TrainingPlan.description, tsquery).label("snippet"))
+            .where(TrainingPlan.id.in_(ids["training_plan"]))
+        ).all()
+        for row in rows:
+            details[("training_plan", row.id)] = {
+                "title": row.title, "snippet": row.snippet,
+                "training_plan_id": row.id, "user_id": row.athlete_id,
+            }
+    if "planned_workout" in ids:
+        rows = db.execute(
+            select(PlannedWorkout.id, PlannedWorkout.title, PlannedWorkout.training_plan_id, TrainingPlan.athlete_id,
+                   _snippet(db, PlannedWorkout.description, tsquery).label("snippet"))
+            .join(TrainingPlan, TrainingPlan.id == PlannedWorkout.training_plan_id)
+            .where(PlannedWorkout.id.in_(ids["planned_workout"]))
+        ).all()
+        for row in rows:
+            details[("planned_workout", row.id)] = {
+                "title": row.title, "snippet": row.snippet,
+                "training_plan_id": row.training_plan_id, "user_id": row.athlete_id,
+            }
+    if "ride" in ids:
+        rows = db.execute(
+            select(Ride.id, Ride.title, Ride.user_id, _snippet(db, Ride.route_name, tsquery).label("snippet"))
+            .where(Ride.id.in_(ids["ride"]))
+        ).all()
+        for row in rows:
+            details[("ride", row.id)] = {"title": row.title, "snippet": row.snippet, "user_id": row.user_id}
+
+    results = []
+    for hit in hits:
+        detail = details.get((hit.type, hit.id))
+        if detail is None:  # deleted between the two queries
+            continue
+        date = hit.date
+        if isinstance(date, str):  # SQLite returns union columns untyped
+            date = datetime.fromisoformat(date)
+        results.append(SearchResult(type=hit.type, id=hit.id, rank=float(hit.rank or 0), date=date, **detail))
+    return results
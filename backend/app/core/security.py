@@ -1,5 +1,10 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
@@ -15,6 +20,89 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so a small pool keeps hashing off the event loop
+    and the request threadpool. Jobs still queued after ``queue_timeout``
+    seconds are cancelled and the request fails fast with 503.
+    """
+
+    def __init__(self, max_workers: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _job(self, func: Callable, *args) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.total_ms += elapsed_ms
+                self.max_ms = max(self.max_ms, elapsed_ms)
+
+    async def run(self, func: Callable, *args) -> Any:
+        with self._lock:
+            self.queued += 1
+        future = self._executor.submit(self._job, func, *args)
+        result = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(result), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                # Never started: give the slot back and shed the request
+                with self._lock:
+                    self.queued -= 1
+                    self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry"
+                )
+            return await result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queue_timeout_s": self.queue_timeout,
+                "queue_depth": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_hash_ms": round(self.total_ms / self.completed, 1) if self.completed else 0.0,
+                "max_hash_ms": round(self.max_ms, 1),
+            }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,66 @@
+"""
+Cache of each user's unread message count for GET /messages/unread-count.
+
+Entries are filled from conversation_state on a miss and dropped when the
+realtime hub delivers a message or read event that changes the count, so
+workers sharing a pub/sub backend stay current and each change costs one
+indexed query on the next request. Events are published after commit, so a
+count refilled after its event always includes that change. Changes that
+bypass the messages API (account deletion, a conversation_state rebuild), and
+on the default "local" backend any change made through another worker, are
+picked up when the entry's TTL runs out; UNREAD_CACHE_TTL is a few seconds for
+that reason.
+"""
+import threading
+from typing import Any, Dict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.realtime import message_hub
+from app.models.conversation_state import ConversationState
+
+_counts = TTLCache(maxsize=settings.UNREAD_CACHE_SIZE, ttl=settings.UNREAD_CACHE_TTL)
+_lock = threading.Lock()
+# Per-user counter bumped by each invalidation. A fill whose query started
+# before one may have read the count from before that change, so it isn't
+# stored; fills for other users are unaffected.
+_epochs: Dict[int, int] = {}
+
+
+def invalidate_unread_count(user_id: int) -> None:
+    with _lock:
+        _epochs[user_id] = _epochs.get(user_id, 0) + 1
+        _counts.delete(user_id)
+
+
+def _on_event(user_id: int, event: Dict[str, Any]) -> None:
+    if event.get("type") == "message":
+        if event["message"]["recipient_id"] == user_id:
+            invalidate_unread_count(user_id)
+    elif event.get("type") == "read":
+        if event["reader_id"] == user_id:
+            invalidate_unread_count(user_id)
+
+
+message_hub.add_listener(_on_event)
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    count = _counts.get(user_id)
+    if count is not None:
+        return count
+    epoch = _epochs.get(user_id, 0)
+    count = db.query(
+        func.coalesce(func.sum(ConversationState.unread_count), 0)
+    ).filter(ConversationState.user_id == user_id).scalar()
+    with _lock:
+        if _epochs.get(user_id, 0) == epoch:
+            _counts.set(user_id, count)
+    return count
+
+
+def unread_cache_stats() -> dict:
+    return _counts.stats()
@@ -0,0 +1,42 @@
+"""
+Cache of resolved users for get_current_user, keyed by token subject (email).
+
+Only the columns needed to authorize a request and serve /auth/me are kept,
+never the password hash. Admin changes to role, lock state or existence call
+invalidate_cached_user, which only reaches this process; other workers pick
+the change up when the entry's TTL runs out. AUTH_USER_CACHE_TTL is
+therefore a few seconds: enough to absorb bursts of requests from one
+client while keeping a locked or deleted account usable elsewhere only
+briefly.
+"""
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+CACHED_USER_FIELDS = (
+    "id", "email", "full_name", "is_active", "role", "is_locked", "created_at", "updated_at",
+)
+
+_user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+
+
+def get_cached_user(email: str) -> Optional[User]:
+    """Return a detached User built from the cache, or None on a miss."""
+    values = _user_cache.get(email)
+    if values is None:
+        return None
+    return User(**values)
+
+
+def cache_user(user: User) -> None:
+    _user_cache.set(user.email, {field: getattr(user, field) for field in CACHED_USER_FIELDS})
+
+
+def invalidate_cached_user(email: str) -> None:
+    _user_cache.delete(email)
+
+
+def user_cache_stats() -> dict:
+    return _user_cache.stats()
@@ -0,0 +1,155 @@
+"""
+Per-request SQL query accounting.
+
+Engine event listeners record every statement into the QueryStats bound to
+the current context. QueryCounterMiddleware binds one per HTTP request,
+exposes the totals as X-DB-Queries / X-DB-Time headers in debug mode and
+logs statement shapes that repeat within a request (the usual N+1 pattern).
+
+Tests can use ``assert_max_queries`` to fail when code exceeds a query budget:
+
+    with assert_max_queries(5):
+        get_trainer_dashboard(db, trainer.id)
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("db_query_stats", default=None)
+
+# Expanded IN lists, e.g. "IN (%(id_1_1)s, %(id_1_2)s)" or "IN (?, ?, ?)"
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions that differ only in bound values compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Query count, DB time and statement shapes collected for one unit of work."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, elapsed)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect stats for every query run in the current context."""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def untracked() -> Iterator[None]:
+    """Exclude the block's queries from the request's stats (e.g. deliberate polling loops)."""
+    token = _current_stats.set(None)
+    try:
+        yield
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Raise AssertionError if the block runs more than ``limit`` queries."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        shapes = "\n".join(f"  {n}x {shape}" for shape, n in stats.shapes.most_common(5))
+        raise AssertionError(f"Expected at most {limit} queries, ran {stats.count}:\n{shapes}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time so
+    # the next statement on this connection doesn't pop a stale one
+    conn = context.connection
+    if conn is not None and context.statement is not None:
+        starts = conn.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the query listeners to an engine (use ``async_engine.sync_engine`` for async)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryCounterMiddleware:
+    """
+    ASGI middleware that tracks the queries issued while serving each request.
+
+    Args:
+        app: The wrapped ASGI application
+        repeat_threshold: Warn when one statement shape runs more than this many times
+        expose_headers: Add X-DB-Queries and X-DB-Time (ms) to responses
+    """
+
+    def __init__(self, app, repeat_threshold: int = 10, expose_headers: bool = False):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and self.expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time"] = f"{stats.total_time * 1000:.1f}"
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        for shape, n in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %s",
+                scope.get("method"), scope.get("path"), n, shape[:300]
+            )
@@ -0,0 +1,167 @@
+"""
+Database schema management.
+
+The app no longer creates tables when it is imported; the schema is owned by
+the Alembic migrations in backend/alembic and applied as an explicit step
+before the server starts:
+
+    python -m app.db.schema              # upgrade to the latest revision
+    python -m app.db.schema upgrade REV  # upgrade (or move) to a given revision
+    python -m app.db.schema current      # show the applied revision
+
+A database created before migrations existed (tables present but no
+alembic_version table) is adopted rather than re-created: its tables, columns
+and indexes are compared with the schema each revision produces, and it is
+stamped at the newest revision it fully contains. A database that doesn't
+even contain the baseline is refused instead of being stamped over. On
+PostgreSQL the run holds an advisory lock, so containers starting together
+apply migrations one at a time.
+"""
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+# Any constant works; every process migrating this database must use the same one
+MIGRATION_LOCK_ID = 72_340_001
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    if connection is not None:
+        # Picked up by alembic/env.py instead of opening a second connection
+        config.attributes["connection"] = connection
+    return config
+
+
+@contextmanager
+def migration_lock(connection: Connection) -> Iterator[None]:
+    if connection.dialect.name != "postgresql":
+        yield
+        return
+    connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+    connection.commit()
+    try:
+        yield
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+# {table: column names} and the set of index names
+Snapshot = Tuple[Dict[str, Set[str]], Set[str]]
+
+
+def _snapshot(connection: Connection) -> Snapshot:
+    inspector = inspect(connection)
+    tables = [t for t in inspector.get_table_names() if t != "alembic_version"]
+    columns = {t: {c["name"] for c in inspector.get_columns(t)} for t in tables}
+    indexes = {i["name"] for t in tables for i in inspector.get_indexes(t) if i["name"]}
+    return columns, indexes
+
+
+def _missing(expected: Snapshot, actual: Snapshot) -> List[str]:
+    """What ``actual`` lacks from ``expected``; extra tables, columns and indexes are ignored."""
+    (expected_columns, expected_indexes), (actual_columns, actual_indexes) = expected, actual
+    missing = []
+    for table, columns in sorted(expected_columns.items()):
+        if table not in actual_columns:
+            missing.append(f"table {table}")
+        else:
+            missing.extend(f"column {table}.{c}" for c in sorted(columns - actual_columns[table]))
+    missing.extend(f"index {name}" for name in sorted(expected_indexes - actual_indexes))
+    return missing
+
+
+def _revision_snapshots() -> List[Tuple[str, Snapshot]]:
+    """Schema after each revision, oldest first, built by migrating an in-memory SQLite database."""
+    revisions = [
+        script.revision
+        for script in reversed(list(ScriptDirectory.from_config(alembic_config()).walk_revisions()))
+    ]
+    snapshots = []
+    with create_engine("sqlite://").connect() as scratch:
+        config = alembic_config(scratch)
+        for revision in revisions:
+            command.upgrade(config, revision)
+            scratch.commit()
+            snapshots.append((revision, _snapshot(scratch)))
+            scratch.commit()  # inspection opened a transaction; migrations need to begin their own
+    return snapshots
+
+
+def detect_revision(connection: Connection) -> str:
+    """
+    Newest revision whose schema an unversioned database already contains.
+
+    Revisions that change nothing visible on SQLite (PostgreSQL-only DDL) are
+    never chosen over the revision before them, so their idempotent DDL still
+    runs on upgrade.
+
+    Raises:
+        SchemaMismatchError: If the database doesn't contain the baseline schema
+    """
+    actual = _snapshot(connection)
+    snapshots = _revision_snapshots()
+    match, previous = None, None
+    for revision, expected in snapshots:
+        if expected != previous and not _missing(expected, actual):
+            match = revision
+        previous = expected
+    if match is None:
+        baseline, expected = snapshots[0]
+        raise SchemaMismatchError(
+            f"Database has tables but no migration history, and doesn't match revision {baseline}; "
+            f"missing: {', '.join(_missing(expected, actual))}. Repair or recreate it before migrating."
+        )
+    return match
+
+
+def upgrade(revision: str = "head") -> None:
+    from app.db.base import engine
+
+    with engine.connect() as connection, migration_lock(connection):
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "users" in tables:
+            existing = detect_revision(connection)
+            print(f"Existing schema without migration history matches revision {existing}; stamping it")
+            command.stamp(alembic_config(connection), existing)
+        connection.commit()
+        command.upgrade(alembic_config(connection), revision)
+        connection.commit()
+
+
+def current() -> None:
+    from app.db.base import engine
+
+    with engine.connect() as connection:
+        command.current(alembic_config(connection), verbose=True)
+
+
+def main(argv: List[str]) -> None:
+    action = argv[0] if argv else "upgrade"
+    if action == "upgrade":
+        try:
+            upgrade(argv[1] if len(argv) > 1 else "head")
+        except SchemaMismatchError as exc:
+            sys.exit(str(exc))
+    elif action == "current":
+        current()
+    else:
+        sys.exit(f"Unknown command {action!r}; expected 'upgrade [revision]' or 'current'")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
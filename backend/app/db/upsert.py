@@ -0,0 +1,26 @@
+"""
+INSERT ... ON CONFLICT for the supported databases.
+
+PostgreSQL and SQLite both support upserts, but through their own dialect
+``insert`` constructs; pick the one matching the session's database.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(dialect_name: str, table):
+    """
+    An INSERT into ``table`` offering on_conflict_do_update / on_conflict_do_nothing.
+
+    Args:
+        dialect_name: ``session.get_bind().dialect.name`` (``session.bind.dialect.name`` for AsyncSession)
+        table: Mapped class or Table
+    """
+    try:
+        return _DIALECT_INSERTS[dialect_name](table)
+    except KeyError:
+        raise NotImplementedError(f"Upserts are not supported on {dialect_name}") from None
@@ -1,16 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.db.base import Base, engine
-from app.api import auth, rides, workouts, nutrition, goals, trainer_athlete, training_plans, admin, chat, messages, integrations
+from app.core.health import readiness_probe
+from app.db.base import async_engine, engine
+from app.db.query_counter import QueryCounterMiddleware
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.parse_jobs import parse_job_runner
+from app.core.pdf_text import pdf_text_extractor
+from app.core.realtime import message_hub
+from app.api import auth, rides, workouts, nutrition, goals, trainer_athlete, training_plans, admin, chat, messages, integrations, search
+
+
+# The schema is managed by migrations (python -m app.db.schema), not on import;
+# engines connect lazily on first use and are disposed here on shutdown.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await message_hub.start()
+    await parse_job_runner.start()
+    yield
+    await parse_job_runner.stop()
+    await message_hub.stop()
+    pdf_text_extractor.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,6 +42,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
+)
+
+app.add_middleware(
+    QueryCounterMiddleware,
+    repeat_threshold=settings.DB_QUERY_REPEAT_THRESHOLD,
+    expose_headers=settings.DEBUG,
 )
 
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
@@ -39,6 +69,24 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/live")
+def liveness():
+    """Process is up and serving; checks no dependencies."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Dependency checks with per-check latency; 503 tells load balancers to drain this instance."""
+    ready, report = await readiness_probe.check()
+    return JSONResponse(
+        report,
+        status_code=200 if ready else 503,
+        headers={"Cache-Control": "no-store"},
+    )
 app.include_router(chat.router, prefix=f"{settings.API_V1_STR}/chat", tags=["chat"])
 app.include_router(messages.router, prefix=f"{settings.API_V1_STR}/messages", tags=["messages"])
 app.include_router(integrations.router, prefix=f"{settings.API_V1_STR}/integrations", tags=["integrations"])
+app.include_router(search.router, prefix=f"{settings.API_V1_STR}/search", tags=["search"])
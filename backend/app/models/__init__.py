@@ -8,3 +8,7 @@ from .training_plan import TrainingPlan, PlannedWorkout, PlannedGoal, TrainingDo
 from .invite_token import InviteToken
 from .message import Message
 from .integration import Integration, Activity
+from .athlete_stats import AthleteStats
+from .parsed_document import ParsedDocument
+from .parse_job import ParseJob
+from .conversation_state import ConversationState
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from datetime import datetime
+from app.db.base import Base
+
+
+class AthleteStats(Base):
+    """Per-athlete rollup of activity totals, maintained incrementally on write."""
+    __tablename__ = "athlete_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    total_rides = Column(Integer, default=0, nullable=False)
+    total_distance_km = Column(Float, default=0.0, nullable=False)
+    last_ride_date = Column(DateTime)
+
+    total_workouts = Column(Integer, default=0, nullable=False)
+    last_workout_date = Column(DateTime)
+
+    total_goals = Column(Integer, default=0, nullable=False)
+    completed_goals = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def last_activity(self):
+        dates = [d for d in (self.last_ride_date, self.last_workout_date) if d is not None]
+        return max(dates) if dates else None
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from app.db.base import Base
+
+
+class ConversationState(Base):
+    """One participant's view of a conversation, maintained on write (see app.core.conversation_state)."""
+    __tablename__ = "conversation_state"
+    __table_args__ = (
+        # The inbox: a user's conversations, most recent first
+        Index("ix_conversation_state_inbox", "user_id", "last_message_at"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    partner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    last_message_id = Column(Integer, ForeignKey("messages.id"), nullable=False)
+    last_message_at = Column(DateTime, nullable=False)
+    unread_count = Column(Integer, default=0, nullable=False)  # messages from partner not yet read by user
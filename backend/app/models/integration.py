@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,9 @@ from app.db.base import Base
 
 class Integration(Base):
     __tablename__ = "integrations"
+    __table_args__ = (
+        Index("ix_integrations_user_provider", "user_id", "provider"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -22,6 +25,10 @@ class Integration(Base):
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Paginated activity feed, ordered by (activity_date, id)
+        Index("ix_activities_user_date", "user_id", "activity_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,12 @@ from app.db.base import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Unread counts and mark-as-read for a recipient
+        Index("ix_messages_recipient_unread", "recipient_id", "is_read"),
+        # One direction of a conversation in id order; thread pages read both directions
+        Index("ix_messages_thread", "sender_id", "recipient_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,10 @@ from app.db.base import Base
 
 class NutritionLog(Base):
     __tablename__ = "nutrition_logs"
+    __table_args__ = (
+        # Paginated nutrition log list, ordered by (log_date, id)
+        Index("ix_nutrition_logs_user_date", "user_id", "log_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
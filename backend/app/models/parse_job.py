@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, LargeBinary
+from sqlalchemy.orm import deferred
+from datetime import datetime
+from app.db.base import Base
+
+
+class ParseJob(Base):
+    """Queued AI parse of an uploaded training-plan PDF (see app.core.parse_jobs)."""
+    __tablename__ = "parse_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    status = Column(String, default="pending", nullable=False, index=True)  # pending, running, succeeded, failed
+    pdf_content = deferred(Column(LargeBinary))  # cleared once the job finishes; not loaded with status reads
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    error = Column(Text)
+    result = Column(JSON)
+    cached = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from app.db.base import Base
+
+
+class ParsedDocument(Base):
+    """Cached AI parse result for a training-plan PDF, keyed by content hash."""
+    __tablename__ = "parsed_documents"
+
+    # sha256 of the PDF bytes plus model and prompt version (see app.core.parse_cache)
+    cache_key = Column(String, primary_key=True)
+    content_hash = Column(String(64), nullable=False, index=True)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
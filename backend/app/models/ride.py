@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,10 @@ from app.db.base import Base
 
 class Ride(Base):
     __tablename__ = "rides"
+    __table_args__ = (
+        # Serves the paginated ride list: user filter + (ride_date, id) keyset
+        Index("ix_rides_user_date", "user_id", "ride_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,11 @@ from app.db.base import Base
 
 class TrainerAthleteRequest(Base):
     __tablename__ = "trainer_athlete_requests"
+    __table_args__ = (
+        # Pending-request inboxes on either side of the relationship
+        Index("ix_trainer_requests_trainer_status", "trainer_id", "status"),
+        Index("ix_trainer_requests_athlete_status", "athlete_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     athlete_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -22,6 +27,11 @@ class TrainerAthleteRequest(Base):
 
 class TrainerAthleteAssignment(Base):
     __tablename__ = "trainer_athlete_assignments"
+    __table_args__ = (
+        # Permission checks and roster lookups filter on one side plus is_active
+        Index("ix_assignments_trainer_active", "trainer_id", "is_active"),
+        Index("ix_assignments_athlete_active", "athlete_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     trainer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
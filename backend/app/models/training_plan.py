@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,12 @@ from app.db.base import Base
 
 class TrainingPlan(Base):
     __tablename__ = "training_plans"
+    __table_args__ = (
+        # Athlete-level lookups of active plans (calendar, dashboard)
+        Index("ix_training_plans_athlete_active", "athlete_id", "is_active"),
+        # Trainer plan lists and dashboard counts
+        Index("ix_training_plans_trainer_active", "trainer_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     trainer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -29,6 +35,10 @@ class TrainingPlan(Base):
 
 class PlannedWorkout(Base):
     __tablename__ = "planned_workouts"
+    __table_args__ = (
+        # Date-window scans within a plan (calendar) touch only the rows in the window
+        Index("ix_planned_workouts_plan_date", "training_plan_id", "scheduled_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False)
@@ -49,7 +59,7 @@ class PlannedGoal(Base):
     __tablename__ = "planned_goals"
 
     id = Column(Integer, primary_key=True, index=True)
-    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False)
+    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     goal_type = Column(String, nullable=False)
     description = Column(Text)
@@ -66,7 +76,7 @@ class TrainingDocument(Base):
     __tablename__ = "training_documents"
 
     id = Column(Integer, primary_key=True, index=True)
-    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False)
+    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False, index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)  # Path to uploaded file
     file_type = Column(String)  # pdf, txt, etc
@@ -80,7 +90,7 @@ class NutritionPlan(Base):
     __tablename__ = "nutrition_plans"
 
     id = Column(Integer, primary_key=True, index=True)
-    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False)
+    training_plan_id = Column(Integer, ForeignKey("training_plans.id"), nullable=False, index=True)
     day_of_week = Column(String)  # monday, tuesday, etc (optional for specific days)
     meal_type = Column(String)  # breakfast, lunch, dinner, snack
     description = Column(Text)
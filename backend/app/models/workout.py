@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,10 @@ from app.db.base import Base
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        # Paginated workout list, ordered by (workout_date, id)
+        Index("ix_workouts_user_date", "user_id", "workout_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class MessageBase(BaseModel):
@@ -34,6 +34,34 @@ class MessageWithUsers(MessageInDB):
     recipient_email: str
 
 
+class ThreadParticipant(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
+class ThreadMessage(BaseModel):
+    """A message within a thread; the recipient is whichever participant didn't send it."""
+    id: int
+    sender_id: int
+    content: str
+    is_read: bool
+    created_at: datetime
+    read_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MessageThread(BaseModel):
+    participants: List[ThreadParticipant]
+    messages: List[ThreadMessage]  # oldest first
+    next_before_id: Optional[int] = None  # pass as before_id to load older messages
+
+
 class Conversation(BaseModel):
     user_id: int
     user_name: Optional[str] = None
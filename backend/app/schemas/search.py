@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class SearchResult(BaseModel):
+    type: str  # message, training_plan, planned_workout or ride
+    id: int
+    title: str
+    snippet: str  # matched terms wrapped in ** on PostgreSQL
+    rank: float
+    date: Optional[datetime] = None
+    training_plan_id: Optional[int] = None  # plan the result belongs to
+    user_id: Optional[int] = None  # message partner, plan athlete or ride owner
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+import re
+from pydantic import BaseModel, BeforeValidator
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Any, Dict, Optional, List, Union
 
 
 # PlannedWorkout Schemas
@@ -39,6 +40,11 @@ class PlannedWorkout(PlannedWorkoutBase):
         from_attributes = True
 
 
+class CalendarWorkout(PlannedWorkout):
+    plan_title: str
+    athlete_id: int
+
+
 # PlannedGoal Schemas
 class PlannedGoalBase(BaseModel):
     title: str
@@ -179,3 +185,96 @@ class TrainingPlanSummary(TrainingPlanBase):
 
     class Config:
         from_attributes = True
+
+
+# AI-parsed plan payload (output of ClaudeAIService.parse_training_plan_pdf).
+# Fields are lenient because they come from model output: numbers that are
+# used for scheduling or stored in numeric columns take the first number in
+# free text ("Week 2", "5-10", "45 min") and become None when there is none,
+# rather than rejecting the whole plan.
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _first_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        match = _NUMBER.search(value)
+        return float(match.group()) if match else None
+    return None
+
+
+def _lenient_int(value: Any) -> Optional[int]:
+    number = _first_number(value)
+    return int(round(number)) if number is not None else None
+
+
+LenientInt = Annotated[Optional[int], BeforeValidator(_lenient_int)]
+LenientFloat = Annotated[Optional[float], BeforeValidator(_first_number)]
+
+
+class ParsedExercise(BaseModel):
+    """Stored as JSON text on the workout, so values (and extra keys) are kept as given."""
+    name: Optional[str] = None
+    sets: Optional[Union[int, str]] = None  # e.g. 4 or "4x"
+    reps: Optional[Union[int, str]] = None  # e.g. 10 or "8-12"
+    duration_minutes: Optional[Union[float, str]] = None
+    notes: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+
+class ParsedWorkout(BaseModel):
+    title: Optional[str] = None
+    workout_type: Optional[str] = None
+    week: LenientInt = None
+    day_of_week: LenientInt = None
+    duration_minutes: LenientFloat = None
+    intensity: Optional[str] = None
+    description: Optional[str] = None
+    exercises: Optional[List[Union[ParsedExercise, str]]] = None
+
+
+class ParsedGoal(BaseModel):
+    title: Optional[str] = None
+    goal_type: Optional[str] = None
+    description: Optional[str] = None
+    target_value: LenientFloat = None
+    unit: Optional[str] = None
+
+
+class ParsedNutrition(BaseModel):
+    category: Optional[str] = None
+    recommendation: Optional[str] = None
+    details: Optional[str] = None
+
+
+class ParsedPlanData(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    duration_weeks: LenientInt = None
+    workouts: Optional[List[ParsedWorkout]] = None
+    goals: Optional[List[ParsedGoal]] = None
+    nutrition_guidance: Optional[List[ParsedNutrition]] = None
+
+
+# ParseJob Schemas
+class ParseJob(BaseModel):
+    id: int
+    filename: str
+    status: str
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    created_at: datetime
+    next_attempt_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,125 @@
+"""
+Concurrent-request throughput of blocking vs async database access.
+
+Serves three endpoints that each run one query taking ``--latency-ms``
+(pg_sleep on PostgreSQL, a registered sleep() function on SQLite, standing
+in for network round trips) and fires ``--requests`` requests at each,
+``--concurrency`` at a time, through httpx's in-process ASGI transport:
+
+- blocking: ``async def`` route querying through a sync Session, as the
+  chat/Strava/document routes did; every query stalls the event loop
+- threadpool: plain ``def`` route with a sync Session, run in FastAPI's
+  threadpool
+- async: ``async def`` route with an AsyncSession from get_async_db
+
+    cd backend
+    python scripts/bench_async_db.py --requests 200 --concurrency 50 --latency-ms 20
+
+Uses the DATABASE_URL from the environment, or a temporary SQLite file when
+it is unset. Both engines use the app's pool settings, so throughput is
+capped by DB_POOL_SIZE + DB_MAX_OVERFLOW on PostgreSQL.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _sqlite_sleep(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+
+def build_app(latency_ms: int):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import event, text
+
+    from app.db.base import AsyncSessionLocal, SessionLocal, async_engine, engine, get_async_db
+
+    if engine.dialect.name == "sqlite":
+        for target in (engine, async_engine.sync_engine):
+            @event.listens_for(target, "connect")
+            def _register_sleep(dbapi_connection, connection_record):
+                dbapi_connection.create_function("sleep", 1, _sqlite_sleep)
+        query = text("SELECT sleep(:ms)").bindparams(ms=latency_ms)
+    else:
+        query = text("SELECT pg_sleep(:s)").bindparams(s=latency_ms / 1000)
+
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking():
+        db = SessionLocal()
+        try:
+            db.execute(query)
+        finally:
+            db.close()
+        return {}
+
+    @app.get("/threadpool")
+    def threadpool():
+        db = SessionLocal()
+        try:
+            db.execute(query)
+        finally:
+            db.close()
+        return {}
+
+    @app.get("/async")
+    async def async_route(db=Depends(get_async_db)):
+        await db.execute(query)
+        return {}
+
+    return app
+
+
+async def run(app, path: str, requests: int, concurrency: int) -> float:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()  # warm the pools
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not os.environ.get("DATABASE_URL"):
+        tmpdir = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir.name}/bench.db"
+
+    try:
+        app = build_app(args.latency_ms)
+        for path in ("/blocking", "/threadpool", "/async"):
+            rate = asyncio.run(run(app, path, args.requests, args.concurrency))
+            print(
+                f"{path[1:]}: {rate:.0f} req/s "
+                f"({args.requests} requests, {args.concurrency} concurrent, {args.latency_ms} ms per query)"
+            )
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
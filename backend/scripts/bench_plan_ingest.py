@@ -0,0 +1,137 @@
+"""
+Time creating a plan with hundreds of workouts from a parsed payload.
+
+Compares create_plan_from_parsed (one batched INSERT per child table) with
+the previous path, which added one ORM object per row and refreshed each, and
+reports the median time and query count of each:
+
+    cd backend
+    python scripts/bench_plan_ingest.py --workouts 500 --runs 5
+
+Uses the DATABASE_URL from the environment, or a temporary SQLite file when
+it is unset. The schema is migrated first and the benchmark's users and plans
+are deleted afterwards.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def sample_payload(workouts: int, goals: int = 20, nutrition: int = 30) -> dict:
+    """A parsed-PDF payload shaped like real model output, including free-text numbers."""
+    return {
+        "title": "Benchmark plan",
+        "description": "Generated by bench_plan_ingest",
+        "duration_weeks": f"{max(1, workouts // 7)} weeks",
+        "workouts": [
+            {
+                "title": f"Session {i}",
+                "workout_type": "strength" if i % 2 else "cardio",
+                "week": f"Week {i // 7 + 1}",
+                "day_of_week": i % 7 + 1,
+                "duration_minutes": "45-60",
+                "intensity": "medium",
+                "description": "Warm up, main set, cool down",
+                "exercises": [
+                    {"name": "Squat", "sets": "4x", "reps": "8-12"},
+                    {"name": "Plank", "sets": 3, "duration_minutes": 1},
+                ],
+            }
+            for i in range(workouts)
+        ],
+        "goals": [{"title": f"Goal {i}", "target_value": "sub 3h", "unit": "h"} for i in range(goals)],
+        "nutrition_guidance": [
+            {"category": "breakfast", "recommendation": "Oats", "details": "Before long sessions"}
+            for _ in range(nutrition)
+        ],
+    }
+
+
+def create_one_by_one(db, parsed, trainer_id: int, athlete_id: int, start_date: date):
+    """The pre-bulk path: an ORM add and refresh per child row."""
+    from app.core.plan_ingest import DEFAULT_DURATION_WEEKS, rows_from_parsed
+    from app.models.training_plan import NutritionPlan, PlannedGoal, PlannedWorkout, TrainingPlan
+
+    plan_start = datetime.combine(start_date, datetime.min.time())
+    plan_end = plan_start + timedelta(weeks=parsed.duration_weeks or DEFAULT_DURATION_WEEKS)
+    plan = TrainingPlan(
+        trainer_id=trainer_id, athlete_id=athlete_id, title=parsed.title or "Training Plan",
+        description=parsed.description or "", start_date=plan_start, end_date=plan_end, is_active=True,
+    )
+    db.add(plan)
+    db.commit()
+    db.refresh(plan)
+    rows = rows_from_parsed(parsed, plan_start, plan_end)
+    for model, key in ((PlannedWorkout, "workouts"), (PlannedGoal, "goals"), (NutritionPlan, "nutrition_plans")):
+        for row in rows[key]:
+            obj = model(training_plan_id=plan.id, **row)
+            db.add(obj)
+            db.commit()
+            db.refresh(obj)
+    return plan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workouts", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not os.environ.get("DATABASE_URL"):
+        tmpdir = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmpdir.name}/bench.db"
+
+    from app.db import schema
+    from app.db.base import SessionLocal
+    from app.db.query_counter import track_queries
+    from app.core.plan_ingest import create_plan_from_parsed
+    from app.models.training_plan import TrainingPlan
+    from app.models.user import User, UserRole
+    from app.schemas.training_plan import ParsedPlanData
+
+    schema.upgrade()
+    payload = json.loads(json.dumps(sample_payload(args.workouts)))  # as it arrives over HTTP
+
+    db = SessionLocal()
+    trainer = User(email="bench-trainer@example.invalid", hashed_password="x", role=UserRole.TRAINER)
+    athlete = User(email="bench-athlete@example.invalid", hashed_password="x", role=UserRole.ATHLETE)
+    db.add_all([trainer, athlete])
+    db.commit()
+    try:
+        for label, create in (("bulk insert", create_plan_from_parsed), ("one by one", create_one_by_one)):
+            timings, queries = [], []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                with track_queries() as stats:
+                    parsed = ParsedPlanData.model_validate(payload)
+                    create(db, parsed, trainer.id, athlete.id, date.today())
+                timings.append(time.perf_counter() - started)
+                queries.append(stats.count)
+            print(
+                f"{label}: median {statistics.median(timings) * 1000:.0f} ms, "
+                f"{statistics.median(queries):.0f} queries for {args.workouts} workouts over {args.runs} runs"
+            )
+    finally:
+        db.rollback()
+        for plan in db.query(TrainingPlan).filter(TrainingPlan.trainer_id == trainer.id).all():
+            db.delete(plan)
+        db.delete(trainer)
+        db.delete(athlete)
+        db.commit()
+        db.close()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
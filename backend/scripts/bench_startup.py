@@ -0,0 +1,78 @@
+"""
+Time from process start to the first successful /health response.
+
+Starts uvicorn in a subprocess, polls /health until it answers 200 and
+reports the median over several runs. ``--create-all`` runs
+``Base.metadata.create_all`` before the app is imported, as every worker
+used to, for a before/after comparison:
+
+    cd backend
+    python scripts/bench_startup.py --runs 5
+    python scripts/bench_startup.py --runs 5 --create-all
+
+Uses the DATABASE_URL from the environment; migrate it first
+(``python -m app.db.schema``) so both modes start against the same schema.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+SERVE = "import uvicorn; uvicorn.run('app.main:app', host='127.0.0.1', port={port}, log_level='warning')"
+CREATE_ALL = (
+    "from app.db.base import Base, engine; import app.models; "
+    "Base.metadata.create_all(bind=engine); "
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_health(create_all: bool, timeout: float = 60.0) -> float:
+    port = _free_port()
+    code = (CREATE_ALL if create_all else "") + SERVE.format(port=port)
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=BACKEND_DIR, env=os.environ.copy())
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"no /health response within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--create-all", action="store_true", help="emulate the old import-time create_all")
+    args = parser.parse_args()
+
+    timings = [time_to_first_health(args.create_all) for _ in range(args.runs)]
+    mode = "with create_all" if args.create_all else "migrations as a separate step"
+    print(
+        f"{mode}: median {statistics.median(timings) * 1000:.0f} ms, "
+        f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms over {args.runs} runs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Shared fixtures.
+
+The suite runs against a throwaway SQLite database built with the
+migrations, so DATABASE_URL is pointed at it before anything from the app
+is imported. Each test gets a session and starts from empty tables and
+empty in-process caches.
+"""
+import os
+import tempfile
+
+_TEST_DIR = tempfile.mkdtemp(prefix="etape-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DIR}/test.db"
+
+import pytest  # noqa: E402
+
+from app.core import unread_cache, user_cache  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db import schema  # noqa: E402
+from app.db.base import Base, SessionLocal, engine  # noqa: E402
+from app.db.query_counter import assert_max_queries  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    schema.upgrade()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+        # SQLite hands out the emptied tables' ids again
+        user_cache._user_cache.clear()
+        unread_cache._counts.clear()
+        unread_cache._epochs.clear()
+
+
+@pytest.fixture
+def client(db):
+    """TestClient for the app; the lifespan (realtime hub, parse workers) is not started."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def live_client(db):
+    """TestClient with the lifespan running, so realtime events are delivered."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer headers for a user: ``client.get(url, headers=auth_headers(user))``."""
+    def headers(user: User) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+
+    return headers
+
+
+@pytest.fixture
+def make_user(db):
+    """Create and commit a user: ``make_user(UserRole.TRAINER, full_name="Coach")``."""
+    created = []
+
+    def make(role: UserRole = UserRole.ATHLETE, **fields) -> User:
+        user = User(
+            email=fields.pop("email", f"{role.value}{len(created)}@example.com"),
+            hashed_password="not-a-real-hash",
+            role=role,
+            **fields,
+        )
+        db.add(user)
+        db.commit()
+        created.append(user)
+        return user
+
+    return make
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when a block runs more queries than allowed.
+
+        with query_budget(5) as stats:
+            get_trainer_dashboard(db, trainer.id)
+        assert stats.count == 3  # the exact count is available too
+    """
+    return assert_max_queries
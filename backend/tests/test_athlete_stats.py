@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from app.core import athlete_stats
+from app.core.athlete_stats import load_athlete_stats, rebuild_athlete_stats
+from app.db.base import SessionLocal
+from app.models.athlete_stats import AthleteStats
+from app.models.ride import Ride
+from app.models.user import UserRole
+
+
+def add_ride(db, user, km: float) -> None:
+    db.add(Ride(user_id=user.id, title="Ride", distance_km=km, duration_minutes=60,
+                ride_date=datetime(2026, 5, 1)))
+    db.commit()
+
+
+def test_load_builds_missing_rows_without_committing(db, make_user):
+    athlete = make_user(UserRole.ATHLETE)
+    add_ride(db, athlete, 30)
+
+    stats = load_athlete_stats(db, [athlete.id])[athlete.id]
+    assert (stats.total_rides, stats.total_distance_km) == (1, 30)
+
+    db.rollback()
+    assert db.get(AthleteStats, athlete.id) is None
+
+
+def test_load_keeps_a_row_built_concurrently(db, make_user, monkeypatch):
+    athlete = make_user(UserRole.ATHLETE)
+    add_ride(db, athlete, 30)
+    computed_stats = athlete_stats._computed_stats
+
+    def racing(session, user_ids):
+        values = computed_stats(session, user_ids)
+        # Another request builds and commits the same row first
+        with SessionLocal() as other:
+            other.add(AthleteStats(user_id=athlete.id, total_rides=1, total_distance_km=30))
+            other.commit()
+        return values
+
+    monkeypatch.setattr(athlete_stats, "_computed_stats", racing)
+    stats = load_athlete_stats(db, [athlete.id])[athlete.id]
+    db.commit()
+    assert stats.total_rides == 1
+
+
+def test_rebuild_overwrites_drifted_rows(db, make_user):
+    athlete = make_user(UserRole.ATHLETE)
+    add_ride(db, athlete, 30)
+    stats = load_athlete_stats(db, [athlete.id])[athlete.id]
+    stats.total_rides = 7
+    db.commit()
+
+    rebuilt = rebuild_athlete_stats(db, [athlete.id])[athlete.id]
+    assert rebuilt is stats
+    assert (stats.total_rides, stats.total_distance_km) == (1, 30)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.core.dashboard import get_trainer_dashboard
+from app.models.ride import Ride
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.training_plan import PlannedWorkout, TrainingPlan
+from app.models.user import UserRole
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def seed_roster(db, make_user, trainer, athletes: int) -> None:
+    """Give ``trainer`` that many athletes, each with a ride and an active plan."""
+    for i in range(athletes):
+        athlete = make_user(UserRole.ATHLETE, full_name=f"Athlete {i}")
+        db.add(TrainerAthleteAssignment(trainer_id=trainer.id, athlete_id=athlete.id, is_active=True))
+        db.add(Ride(
+            user_id=athlete.id, title="Ride", distance_km=40, duration_minutes=90,
+            # Every other athlete has been quiet for two weeks
+            ride_date=NOW - timedelta(days=14 if i % 2 else 1),
+        ))
+        plan = TrainingPlan(
+            trainer_id=trainer.id, athlete_id=athlete.id, title="Plan",
+            start_date=NOW - timedelta(days=7), end_date=NOW + timedelta(days=21), is_active=True,
+        )
+        db.add(plan)
+        db.flush()
+        db.add_all([
+            PlannedWorkout(training_plan_id=plan.id, title="Done", workout_type="strength",
+                           scheduled_date=NOW - timedelta(days=2), is_completed=True),
+            PlannedWorkout(training_plan_id=plan.id, title="Missed", workout_type="strength",
+                           scheduled_date=NOW - timedelta(days=1), is_completed=False),
+            PlannedWorkout(training_plan_id=plan.id, title="Upcoming", workout_type="strength",
+                           scheduled_date=NOW + timedelta(days=1), is_completed=False),
+        ])
+    db.commit()
+
+
+def dashboard_query_counts(db, query_budget, trainer):
+    """Queries for the first load (stats rollup built) and a repeat load."""
+    counts = []
+    for _ in range(2):
+        db.expire_all()
+        with query_budget(12) as stats:
+            get_trainer_dashboard(db, trainer.id, now=NOW)
+        counts.append(stats.count)
+    return counts
+
+
+def test_dashboard_query_count_does_not_grow_with_roster(db, make_user, query_budget):
+    small = make_user(UserRole.TRAINER, email="small@example.com")
+    seed_roster(db, make_user, small, athletes=1)
+    large = make_user(UserRole.TRAINER, email="large@example.com")
+    seed_roster(db, make_user, large, athletes=25)
+
+    assert dashboard_query_counts(db, query_budget, small) == dashboard_query_counts(db, query_budget, large)
+
+
+def test_dashboard_summary(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    seed_roster(db, make_user, trainer, athletes=4)
+
+    dashboard = get_trainer_dashboard(db, trainer.id, now=NOW)
+
+    assert dashboard["total_athletes"] == 4
+    assert dashboard["active_plans"] == 4
+    assert dashboard["athletes_needing_attention"] == 2
+    assert {s["compliance_rate"] for s in dashboard["athlete_summaries"]} == {50.0}
+    assert {s["active_plans"] for s in dashboard["athlete_summaries"]} == {1}
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core import parse_jobs
+from app.core.config import settings
+from app.api.training_plans import stream_parse_job
+from app.core.parse_jobs import PENDING, RUNNING, SUCCEEDED, ParseJobRunner
+from app.db.base import AsyncSessionLocal
+from app.models.parse_job import ParseJob
+from app.models.user import UserRole
+
+
+def add_job(db, user, **fields) -> ParseJob:
+    fields.setdefault("status", PENDING)
+    job = ParseJob(user_id=user.id, filename="plan.pdf", pdf_content=b"%PDF", **fields)
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_requeue_stale_resets_abandoned_running_jobs(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    stale = add_job(db, trainer, status=RUNNING, attempts=1,
+                    started_at=datetime.utcnow() - timedelta(seconds=settings.PARSE_JOB_STALE_AFTER + 1))
+    fresh = add_job(db, trainer, status=RUNNING, attempts=1, started_at=datetime.utcnow())
+
+    asyncio.run(ParseJobRunner(concurrency=1, poll_interval=1).requeue_stale())
+
+    db.expire_all()
+    assert (stale.status, fresh.status) == (PENDING, RUNNING)
+
+
+def test_result_is_discarded_once_the_job_was_requeued(db, make_user, monkeypatch):
+    trainer = make_user(UserRole.TRAINER)
+    job = add_job(db, trainer)
+    runner = ParseJobRunner(concurrency=1, poll_interval=1)
+
+    async def parse(content, filename):
+        return {"success": True, "error": None, "data": {"title": "Plan"}}
+
+    monkeypatch.setattr(parse_jobs.claude_service, "parse_training_plan_pdf", parse)
+
+    async def scenario():
+        job_id, attempt, filename, content = await runner._claim()
+        # Presumed dead and claimed again by another worker
+        job.status, job.attempts = RUNNING, attempt + 1
+        db.commit()
+        await runner._run(job_id, attempt, filename, content)
+
+    asyncio.run(scenario())
+    db.expire_all()
+    assert (job.status, job.result) == (RUNNING, None)
+
+
+def test_events_end_with_not_found_when_the_job_is_deleted(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_JOB_POLL_INTERVAL", 0.05)
+    trainer = make_user(UserRole.TRAINER)
+    job = add_job(db, trainer)
+
+    # TestClient buffers whole responses, so drive the stream directly
+    async def scenario():
+        async with AsyncSessionLocal() as async_db:
+            response = await stream_parse_job(job.id, db=async_db, current_user=trainer)
+            events = []
+            async for chunk in response.body_iterator:
+                events.append(chunk.split("\n", 1)[0])
+                if len(events) == 1:
+                    db.delete(job)
+                    db.commit()
+            return events
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=5)) == ["event: status", "event: not_found"]
+
+
+def test_events_end_after_a_terminal_status(db, client, auth_headers, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    job = add_job(db, trainer, status=SUCCEEDED, result={"title": "Plan"})
+
+    response = client.get(f"/api/v1/training-plans/parse-pdf/jobs/{job.id}/events", headers=auth_headers(trainer))
+    assert response.text.count("event: status") == 1
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.base import engine
+from app.db.query_counter import statement_shape, track_queries
+
+
+def test_failed_statement_does_not_leave_a_start_time():
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info["query_start_time"] == []
+
+        with track_queries() as stats:
+            conn.execute(text("SELECT 1"))
+        assert stats.count == 1
+        assert conn.info["query_start_time"] == []
+
+
+def test_query_budget_fails_when_exceeded(query_budget):
+    with engine.connect() as conn:
+        with query_budget(2) as stats:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        assert stats.count == 2
+
+        with pytest.raises(AssertionError, match="at most 1 queries, ran 2"):
+            with query_budget(1):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+def test_nested_tracking_rolls_up_to_parent():
+    with engine.connect() as conn:
+        with track_queries() as outer:
+            conn.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                conn.execute(text("SELECT 2"))
+    assert (outer.count, inner.count) == (2, 1)
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT *\n FROM t WHERE id IN (?)"
+    )
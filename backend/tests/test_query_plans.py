@@ -0,0 +1,92 @@
+"""
+The calendar and inbox endpoints must be served from their indexes.
+
+Statements are captured as the endpoints run them and fed back to SQLite's
+EXPLAIN QUERY PLAN, which names the index used for each table it reads.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.training_plan import PlannedWorkout, TrainingPlan
+from app.models.user import UserRole
+
+API = "/api/v1"
+
+
+@pytest.fixture
+def statements(database):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(database, "before_cursor_execute", capture)
+    yield captured
+    event.remove(database, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def pair(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    athlete = make_user(UserRole.ATHLETE)
+    db.add(TrainerAthleteAssignment(trainer_id=trainer.id, athlete_id=athlete.id, is_active=True))
+    plan = TrainingPlan(trainer_id=trainer.id, athlete_id=athlete.id, title="Plan", is_active=True)
+    db.add(plan)
+    db.flush()
+    start = datetime(2026, 6, 1)
+    db.add_all([
+        PlannedWorkout(training_plan_id=plan.id, title=f"Day {i}", workout_type="endurance",
+                       scheduled_date=start + timedelta(days=i))
+        for i in range(30)
+    ])
+    db.commit()
+    return trainer, athlete
+
+
+def query_plans(db, statements, table: str):
+    """EXPLAIN QUERY PLAN details for each captured SELECT that reads ``table``."""
+    plans = []
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+            rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append("\n".join(row[-1] for row in rows))
+    assert plans, f"no SELECT from {table} was captured"
+    return plans
+
+
+def test_calendar_uses_plan_and_schedule_indexes(db, client, auth_headers, pair, statements):
+    _, athlete = pair
+    response = client.get(
+        f"{API}/training-plans/calendar", params={"from": "2026-06-08", "to": "2026-06-15"},
+        headers=auth_headers(athlete),
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 7
+
+    [plan] = query_plans(db, statements, "planned_workouts")
+    assert "INDEX ix_training_plans_athlete_active" in plan
+    assert "INDEX ix_planned_workouts_plan_date" in plan
+
+
+def test_inbox_queries_use_indexes(db, client, auth_headers, pair, statements):
+    trainer, athlete = pair
+    for text in ("Session moved", "Thanks", "See you Tuesday"):
+        response = client.post(f"{API}/messages/", json={"recipient_id": athlete.id, "content": text},
+                               headers=auth_headers(trainer))
+        assert response.status_code == 201
+    statements.clear()
+
+    headers = auth_headers(athlete)
+    assert client.get(f"{API}/messages/conversations", headers=headers).status_code == 200
+    assert client.get(f"{API}/messages/unread-count", headers=headers).json() == {"unread_count": 3}
+    assert len(client.get(f"{API}/messages/thread/{trainer.id}", headers=headers).json()["messages"]) == 3
+
+    # The conversation list and the unread-count fill both read the inbox table
+    for plan in query_plans(db, statements, "conversation_state"):
+        assert "INDEX ix_conversation_state_inbox" in plan
+    for plan in query_plans(db, statements, "messages"):
+        assert "INDEX ix_messages_thread" in plan
+        assert "SCAN messages" not in plan
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.realtime import LocalBackend, MessageHub, SubscriberOverflow, message_hub
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.user import UserRole
+
+API = "/api/v1/messages"
+
+
+@pytest.fixture
+def pair(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    athlete = make_user(UserRole.ATHLETE)
+    db.add(TrainerAthleteAssignment(trainer_id=trainer.id, athlete_id=athlete.id, is_active=True))
+    db.commit()
+    return trainer, athlete
+
+
+def token(headers) -> str:
+    return headers["Authorization"].removeprefix("Bearer ")
+
+
+def wait_for_subscribers(user_id: int, count: int = 1, timeout: float = 2.0):
+    """The socket subscribes just after accept; wait so no event is published before it."""
+    channel = message_hub.channel(user_id)
+    deadline = time.monotonic() + timeout
+    while len(message_hub._subscribers.get(channel, ())) < count:
+        assert time.monotonic() < deadline, f"no subscriber on {channel}"
+        time.sleep(0.01)
+
+
+def test_bad_token_closes_with_policy_violation(live_client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with live_client.websocket_connect(f"{API}/ws?token=not-a-token"):
+            pass
+    assert exc.value.code == 1008
+
+
+def test_recipient_receives_message_event(live_client, auth_headers, pair):
+    trainer, athlete = pair
+    with live_client.websocket_connect(f"{API}/ws?token={token(auth_headers(athlete))}") as ws:
+        wait_for_subscribers(athlete.id)
+        sent = live_client.post(f"{API}/", json={"recipient_id": athlete.id, "content": "Tempo run at 7"},
+                                headers=auth_headers(trainer))
+        assert sent.status_code == 201
+
+        event = ws.receive_json()
+        assert event["type"] == "message"
+        assert event["message"]["id"] == sent.json()["id"]
+        assert event["message"]["content"] == "Tempo run at 7"
+
+
+def test_thread_read_notifies_both_sides(live_client, auth_headers, pair):
+    trainer, athlete = pair
+    sent = live_client.post(f"{API}/", json={"recipient_id": athlete.id, "content": "Log your splits"},
+                            headers=auth_headers(trainer))
+    assert sent.status_code == 201
+
+    with live_client.websocket_connect(f"{API}/ws?token={token(auth_headers(trainer))}") as trainer_ws, \
+            live_client.websocket_connect(f"{API}/ws?token={token(auth_headers(athlete))}") as athlete_ws:
+        wait_for_subscribers(trainer.id)
+        wait_for_subscribers(athlete.id)
+        read = live_client.post(f"{API}/thread/{trainer.id}/read", headers=auth_headers(athlete))
+        assert read.json() == {"marked": 1}
+
+        for ws in (trainer_ws, athlete_ws):
+            event = ws.receive_json()
+            assert event["type"] == "read"
+            assert event["reader_id"] == athlete.id
+            assert event["partner_id"] == trainer.id
+            assert event["marked"] == 1
+
+
+def test_subscription_overflow_raises():
+    async def scenario():
+        hub = MessageHub(LocalBackend(), queue_size=1)
+        await hub.start()
+        async with hub.subscribe(7) as subscription:
+            await hub.publish(7, {"type": "ping"})
+            await hub.publish(7, {"type": "ping"})
+            assert subscription.overflowed
+            with pytest.raises(SubscriberOverflow):
+                await subscription.get()
+        await hub.stop()
+        return hub.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["delivered"] == 1
+    assert stats["dropped"] == 1
+    assert stats["subscribers"] == 0
+
+
+def test_slow_socket_closes_with_try_again_later(live_client, auth_headers, pair, monkeypatch):
+    _, athlete = pair
+    monkeypatch.setattr(message_hub, "queue_size", 1)
+
+    async def burst():
+        # No await yields to the socket between publishes, so its queue fills up
+        for n in range(3):
+            await message_hub.publish(athlete.id, {"type": "test", "n": n})
+
+    with live_client.websocket_connect(f"{API}/ws?token={token(auth_headers(athlete))}") as ws:
+        wait_for_subscribers(athlete.id)
+        live_client.portal.call(burst)
+        with pytest.raises(WebSocketDisconnect) as exc:
+            while True:
+                ws.receive_json()
+    assert exc.value.code == 1013
@@ -0,0 +1,38 @@
+from app.core.search import search
+from app.models.message import Message
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.training_plan import TrainingPlan
+from app.models.user import UserRole
+
+
+def test_message_titles_name_the_other_side(db, make_user):
+    trainer = make_user(UserRole.TRAINER, full_name="Coach Kim")
+    athlete = make_user(UserRole.ATHLETE, full_name="Sam Rider")
+    db.add_all([
+        Message(sender_id=trainer.id, recipient_id=athlete.id, content="Tempo intervals on Tuesday"),
+        Message(sender_id=athlete.id, recipient_id=trainer.id, content="Tempo felt hard"),
+    ])
+    db.commit()
+
+    titles = {r.snippet: (r.title, r.user_id) for r in search(db, trainer, None, "tempo", types=["message"])}
+
+    assert titles == {
+        "Tempo intervals on Tuesday": ("Message to Sam Rider", athlete.id),
+        "Tempo felt hard": ("Message from Sam Rider", athlete.id),
+    }
+
+
+def test_like_fallback_matches_wildcards_literally(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    athlete = make_user(UserRole.ATHLETE)
+    db.add(TrainerAthleteAssignment(trainer_id=trainer.id, athlete_id=athlete.id, is_active=True))
+    for title in ("Build to 50% FTP", "Build to 500 km", "base_block", "base block", "C:\\plans"):
+        db.add(TrainingPlan(trainer_id=trainer.id, athlete_id=athlete.id, title=title, is_active=True))
+    db.commit()
+
+    def titles(q):
+        return {r.title for r in search(db, trainer, None, q, types=["training_plan"])}
+
+    assert titles("50%") == {"Build to 50% FTP"}
+    assert titles("base_") == {"base_block"}
+    assert titles("C:\\") == {"C:\\plans"}
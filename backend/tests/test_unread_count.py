@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import event
+
+from app.core import unread_cache
+from app.db.base import engine
+from app.models.trainer_athlete import TrainerAthleteAssignment
+from app.models.user import UserRole
+
+API = "/api/v1/messages"
+
+
+@pytest.fixture
+def pair(db, make_user):
+    trainer = make_user(UserRole.TRAINER)
+    athlete = make_user(UserRole.ATHLETE)
+    db.add(TrainerAthleteAssignment(trainer_id=trainer.id, athlete_id=athlete.id, is_active=True))
+    db.commit()
+    return trainer, athlete
+
+
+@pytest.fixture
+def long_ttl(monkeypatch):
+    # Entries outlive the test, so any refresh has to come from an event
+    monkeypatch.setattr(unread_cache._counts, "ttl", 3600)
+
+
+def test_matching_etag_returns_empty_304(client, auth_headers, pair):
+    _, athlete = pair
+    headers = auth_headers(athlete)
+    first = client.get(f"{API}/unread-count", headers=headers)
+    assert first.json() == {"unread_count": 0}
+    etag = first.headers["etag"]
+
+    cached = client.get(f"{API}/unread-count", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_weak_etag_matches(client, auth_headers, pair):
+    _, athlete = pair
+    headers = auth_headers(athlete)
+    etag = client.get(f"{API}/unread-count", headers=headers).headers["etag"]
+
+    response = client.get(f"{API}/unread-count", headers={**headers, "If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+
+
+def test_count_follows_send_and_read_events(live_client, auth_headers, pair, long_ttl):
+    trainer, athlete = pair
+    headers = auth_headers(athlete)
+
+    def unread():
+        response = live_client.get(f"{API}/unread-count", headers=headers)
+        return response.json()["unread_count"], response.headers["etag"]
+
+    count, etag = unread()
+    assert count == 0
+
+    sent = live_client.post(f"{API}/", json={"recipient_id": athlete.id, "content": "Rest day tomorrow"},
+                            headers=auth_headers(trainer))
+    assert sent.status_code == 201
+    count, etag_after_send = unread()
+    assert count == 1 and etag_after_send != etag
+
+    assert live_client.post(f"{API}/thread/{trainer.id}/read", headers=headers).json() == {"marked": 1}
+    count, etag_after_read = unread()
+    assert count == 0 and etag_after_read != etag_after_send
+
+
+@pytest.fixture
+def invalidate_during_next_query():
+    """Invalidate a user's count while the next query is running."""
+    pending = []
+
+    def invalidate(conn, cursor, statement, parameters, context, executemany):
+        while pending:
+            unread_cache.invalidate_unread_count(pending.pop())
+
+    event.listen(engine, "before_cursor_execute", invalidate)
+    yield pending.append
+    event.remove(engine, "before_cursor_execute", invalidate)
+
+
+def test_fill_overlapping_an_invalidation_is_not_stored(db, pair, long_ttl, invalidate_during_next_query):
+    _, athlete = pair
+    invalidate_during_next_query(athlete.id)
+
+    assert unread_cache.get_unread_count(db, athlete.id) == 0
+    assert unread_cache._counts.get(athlete.id) is None
+
+
+def test_invalidating_another_user_does_not_discard_a_fill(db, pair, long_ttl, invalidate_during_next_query):
+    trainer, athlete = pair
+    invalidate_during_next_query(trainer.id)
+
+    assert unread_cache.get_unread_count(db, athlete.id) == 0
+    assert unread_cache._counts.get(athlete.id) == 0
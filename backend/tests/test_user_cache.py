@@ -0,0 +1,31 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.auth import get_current_user
+from app.core import cache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lock_made_by_another_worker_applies_once_the_entry_expires(db, make_user, clock):
+    athlete = make_user(UserRole.ATHLETE)
+    token = create_access_token(data={"sub": athlete.email})
+    assert get_current_user(token, db).id == athlete.id
+
+    # Another process locks the account; this process never sees the invalidation
+    athlete.is_locked = True
+    db.commit()
+    assert get_current_user(token, db).id == athlete.id
+
+    clock[0] += settings.AUTH_USER_CACHE_TTL
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token, db)
+    assert exc.value.status_code == 403
@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { aiChatAPI } from '../services/api';
 import { HiChat, HiX, HiPaperAirplane } from 'react-icons/hi';
 import toast from 'react-hot-toast';
@@ -15,6 +15,10 @@ export default function AIChat() {
   ]);
   const [input, setInput] = useState('');
   const [loading, setLoading] = useState(false);
+  const abortRef = useRef<AbortController | null>(null);
+
+  // Abort an in-flight stream when the widget unmounts so the server stops generating
+  useEffect(() => () => abortRef.current?.abort(), []);
 
   const handleSend = async () => {
     if (!input.trim() || loading) return;
@@ -24,17 +28,39 @@ export default function AIChat() {
     setMessages(prev => [...prev, { role: 'user', content: userMessage }]);
     setLoading(true);
 
+    const controller = new AbortController();
+    abortRef.current = controller;
+    let started = false;
+
     try {
-      const result = await aiChatAPI.sendMessage(userMessage);
-      setMessages(prev => [...prev, { role: 'assistant', content: result.response }]);
+      await aiChatAPI.streamMessage(userMessage, (text) => {
+        if (!started) {
+          // First token: swap the typing indicator for the reply being streamed
+          started = true;
+          setLoading(false);
+          setMessages(prev => [...prev, { role: 'assistant', content: text }]);
+          return;
+        }
+        setMessages(prev => {
+          const last = prev[prev.length - 1];
+          return [...prev.slice(0, -1), { ...last, content: last.content + text }];
+        });
+      }, controller.signal);
     } catch (err: any) {
+      if (err.name === 'AbortError') return;
       toast.error('Failed to get response');
       setMessages(prev => [...prev, { role: 'assistant', content: 'Sorry, I encountered an error. Please try again.' }]);
     } finally {
+      abortRef.current = null;
       setLoading(false);
     }
   };
 
+  const handleClose = () => {
+    abortRef.current?.abort();
+    setIsOpen(false);
+  };
+
   const handleKeyPress = (e: React.KeyboardEvent) => {
     if (e.key === 'Enter' && !e.shiftKey) {
       e.preventDefault();
@@ -61,7 +87,7 @@ export default function AIChat() {
           <HiChat className="w-5 h-5" />
           <span className="font-semibold">AI Training Assistant</span>
         </div>
-        <button onClick={() => setIsOpen(false)} className="hover:bg-primary-700 p-1 rounded">
+        <button onClick={handleClose} className="hover:bg-primary-700 p-1 rounded">
           <HiX className="w-5 h-5" />
         </button>
       </div>
@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef, FormEvent } from 'react';
 import { messagesAPI, trainerAthleteAPI } from '../services/api';
-import type { Conversation, MessageWithUsers, User } from '../types';
+import type { Conversation, MessageSocketEvent, ThreadMessage, User } from '../types';
 import { useAuth } from '../context/AuthContext';
 import Layout from '../components/Layout';
 import Card from '../components/ui/Card';
@@ -12,7 +12,9 @@ import toast from 'react-hot-toast';
 export default function Messages() {
   const { user } = useAuth();
   const [conversations, setConversations] = useState<Conversation[]>([]);
-  const [messages, setMessages] = useState<MessageWithUsers[]>([]);
+  const [messages, setMessages] = useState<ThreadMessage[]>([]);
+  const [olderCursor, setOlderCursor] = useState<number | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const [selectedUserId, setSelectedUserId] = useState<number | null>(null);
   const [selectedUserName, setSelectedUserName] = useState<string>('');
   const [newMessage, setNewMessage] = useState('');
@@ -20,18 +22,34 @@ export default function Messages() {
   const [sending, setSending] = useState(false);
   const [availableUsers, setAvailableUsers] = useState<User[]>([]);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const keepScrollRef = useRef(false);
+  const selectedUserIdRef = useRef<number | null>(null);
 
   useEffect(() => {
     loadData();
   }, []);
 
   useEffect(() => {
+    selectedUserIdRef.current = selectedUserId;
     if (selectedUserId) {
       loadMessages(selectedUserId);
     }
   }, [selectedUserId]);
 
   useEffect(() => {
+    return messagesAPI.subscribe(handleSocketEvent, () => {
+      // Events aren't replayed, so catch up on anything sent while disconnected
+      messagesAPI.getConversations().then(setConversations).catch(() => {});
+      if (selectedUserIdRef.current) loadMessages(selectedUserIdRef.current);
+    });
+  }, []);
+
+  useEffect(() => {
+    // Prepending older messages shouldn't jump to the newest one
+    if (keepScrollRef.current) {
+      keepScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages]);
 
@@ -80,14 +98,80 @@ export default function Messages() {
 
   const loadMessages = async (userId: number) => {
     try {
-      const msgs = await messagesAPI.getMessagesWithUser(userId);
-      setMessages(msgs);
-      // Update conversation unread count
-      setConversations(prev => prev.map(c =>
-        c.user_id === userId ? { ...c, unread_count: 0 } : c
-      ));
+      const thread = await messagesAPI.getThread(userId);
+      setMessages(thread.messages);
+      setOlderCursor(thread.next_before_id ?? null);
+      if (conversations.some(c => c.user_id === userId && c.unread_count > 0)) {
+        await messagesAPI.markThreadRead(userId);
+        setConversations(prev => prev.map(c =>
+          c.user_id === userId ? { ...c, unread_count: 0 } : c
+        ));
+      }
+    } catch (err) {
+      toast.error('Failed to load messages');
+    }
+  };
+
+  const handleSocketEvent = (event: MessageSocketEvent) => {
+    if (!user) return;
+    const openId = selectedUserIdRef.current;
+
+    if (event.type === 'message') {
+      const msg = event.message;
+      const incoming = msg.sender_id !== user.id;
+      const partnerId = incoming ? msg.sender_id : msg.recipient_id;
+      const isOpen = partnerId === openId;
+
+      if (isOpen) {
+        // Our own sends are already appended by handleSendMessage
+        setMessages(prev => prev.some(m => m.id === msg.id) ? prev : [...prev, msg]);
+        if (incoming) messagesAPI.markThreadRead(partnerId).catch(() => {});
+      }
+
+      setConversations(prev => {
+        const existing = prev.find(c => c.user_id === partnerId);
+        if (!existing) {
+          // New conversation: fetch it to get the partner's name
+          messagesAPI.getConversations().then(setConversations).catch(() => {});
+          return prev;
+        }
+        const updated = {
+          ...existing,
+          last_message: msg.content.slice(0, 100),
+          last_message_time: msg.created_at,
+          unread_count: existing.unread_count + (incoming && !isOpen ? 1 : 0),
+        };
+        return [updated, ...prev.filter(c => c.user_id !== partnerId)];
+      });
+    } else if (event.type === 'read') {
+      if (event.reader_id === user.id) {
+        // Read in another tab
+        setConversations(prev => prev.map(c =>
+          c.user_id === event.partner_id ? { ...c, unread_count: Math.max(0, c.unread_count - event.marked) } : c
+        ));
+      } else if (event.reader_id === openId) {
+        // Partner read our messages
+        setMessages(prev => prev.map(m =>
+          m.sender_id === user.id && (event.message_id === undefined || m.id === event.message_id)
+            ? { ...m, is_read: true }
+            : m
+        ));
+      }
+    }
+  };
+
+  const loadOlderMessages = async () => {
+    if (!selectedUserId || olderCursor === null) return;
+    setLoadingOlder(true);
+    try {
+      const thread = await messagesAPI.getThread(selectedUserId, olderCursor);
+      keepScrollRef.current = true;
+      setMessages(prev => [...thread.messages, ...prev]);
+      setOlderCursor(thread.next_before_id ?? null);
     } catch (err) {
       toast.error('Failed to load messages');
+    } finally {
+      setLoadingOlder(false);
     }
   };
 
@@ -107,6 +191,7 @@ export default function Messages() {
     const existingConv = conversations.find(c => c.user_id === u.id);
     if (!existingConv) {
       setMessages([]);
+      setOlderCursor(null);
     }
   };
 
@@ -122,13 +207,7 @@ export default function Messages() {
       });
 
       // Add message to list
-      setMessages(prev => [...prev, {
-        ...msg,
-        sender_name: user?.full_name || undefined,
-        sender_email: user?.email || '',
-        recipient_name: selectedUserName || undefined,
-        recipient_email: ''
-      }]);
+      setMessages(prev => [...prev, msg]);
 
       // Update conversations
       const now = new Date().toISOString();
@@ -313,6 +392,18 @@ export default function Messages() {
 
               {/* Messages */}
               <div className="flex-1 overflow-y-auto space-y-4 mb-4">
+                {olderCursor !== null && (
+                  <div className="text-center">
+                    <button
+                      type="button"
+                      onClick={loadOlderMessages}
+                      disabled={loadingOlder}
+                      className="text-sm text-primary-600 hover:text-primary-700 disabled:opacity-50"
+                    >
+                      {loadingOlder ? 'Loading...' : 'Load older messages'}
+                    </button>
+                  </div>
+                )}
                 {messages.length === 0 ? (
                   <div className="text-center py-8 text-gray-500">
                     <p>No messages yet</p>
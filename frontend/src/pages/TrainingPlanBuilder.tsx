@@ -69,13 +69,14 @@ export default function TrainingPlanBuilder() {
     }
     setUploading(true);
     try {
-      const result = await aiPlanBuilderAPI.parsePDF(file);
-      if (result.success && result.parsed_data) {
-        setParsedData(result.parsed_data);
+      const queued = await aiPlanBuilderAPI.createParseJob(file);
+      const job = await aiPlanBuilderAPI.waitForParseJob(queued.id);
+      if (job.status === 'succeeded' && job.result) {
+        setParsedData(job.result);
         setStep('preview');
         toast.success('PDF parsed successfully!');
       } else {
-        toast.error('Failed to parse PDF');
+        toast.error(job.error || 'Failed to parse PDF');
       }
     } catch (err: any) {
       toast.error(err.response?.data?.detail || 'Failed to parse PDF');
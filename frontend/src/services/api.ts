@@ -6,8 +6,12 @@ import type {
   SyncResult,
   Message,
   MessageWithUsers,
+  MessageThread,
   Conversation,
   MessageCreate,
+  MessageSocketEvent,
+  SearchResult,
+  SearchResultType,
   RegisterRequest,
   RegisterWithInviteRequest,
   TokenResponse,
@@ -35,6 +39,8 @@ import type {
   InviteTokenCreate,
   InviteTokenPublic,
   UserCreateRequest,
+  ParseJob,
+  CalendarWorkout,
 } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
@@ -177,8 +183,21 @@ export const trainingPlansAPI = {
     return response.data;
   },
 
-  getById: async (id: number): Promise<TrainingPlan> => {
-    const response = await api.get<TrainingPlan>(`/training-plans/${id}`);
+  // include limits the returned relations, e.g. ['workouts', 'goals'] for calendar-style views
+  getById: async (
+    id: number,
+    include?: Array<'workouts' | 'goals' | 'documents' | 'nutrition_plans'>
+  ): Promise<TrainingPlan> => {
+    const params = include ? { include: include.join(',') } : undefined;
+    const response = await api.get<TrainingPlan>(`/training-plans/${id}`, { params });
+    return response.data;
+  },
+
+  // Planned workouts across the athlete's active plans in [from, to), e.g. one week
+  getCalendar: async (from: string, to: string, athleteId?: number): Promise<CalendarWorkout[]> => {
+    const response = await api.get<CalendarWorkout[]>('/training-plans/calendar', {
+      params: { from, to, athlete_id: athleteId },
+    });
     return response.data;
   },
 
@@ -328,6 +347,53 @@ export const aiChatAPI = {
     const response = await api.post('/chat/', { message });
     return response.data;
   },
+
+  // Streams the reply as server-sent events; axios can't read a streaming body in the browser
+  streamMessage: async (
+    message: string,
+    onText: (text: string) => void,
+    signal?: AbortSignal
+  ): Promise<void> => {
+    const token = localStorage.getItem('token');
+    const response = await fetch(`${API_V1}/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({ message }),
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Chat request failed (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) return;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = 'message';
+        let data = '';
+        for (const line of rawEvent.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        const payload = data ? JSON.parse(data) : {};
+        if (event === 'done') return;
+        if (event === 'error') throw new Error(payload.message);
+        onText(payload.text);
+      }
+    }
+  },
 };
 
 export default api;
@@ -343,6 +409,29 @@ export const aiPlanBuilderAPI = {
     return response.data;
   },
 
+  // Background parsing: queue the upload, then poll until the job finishes
+  createParseJob: async (file: File): Promise<ParseJob> => {
+    const formData = new FormData();
+    formData.append('file', file);
+    const response = await api.post<ParseJob>('/training-plans/parse-pdf/jobs', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
+  getParseJob: async (jobId: number): Promise<ParseJob> => {
+    const response = await api.get<ParseJob>(`/training-plans/parse-pdf/jobs/${jobId}`);
+    return response.data;
+  },
+
+  waitForParseJob: async (jobId: number, intervalMs = 2000): Promise<ParseJob> => {
+    while (true) {
+      const job = await aiPlanBuilderAPI.getParseJob(jobId);
+      if (job.status === 'succeeded' || job.status === 'failed') return job;
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  },
+
   createFromParsed: async (
     athleteId: number,
     parsedData: any,
@@ -432,6 +521,19 @@ export const messagesAPI = {
     return response.data;
   },
 
+  // Newest page first; pass next_before_id from the previous page to load older messages
+  getThread: async (userId: number, beforeId?: number, limit: number = 50): Promise<MessageThread> => {
+    const response = await api.get<MessageThread>(`/messages/thread/${userId}`, {
+      params: { before_id: beforeId, limit },
+    });
+    return response.data;
+  },
+
+  markThreadRead: async (userId: number): Promise<{ marked: number }> => {
+    const response = await api.post(`/messages/thread/${userId}/read`);
+    return response.data;
+  },
+
   sendMessage: async (data: MessageCreate): Promise<Message> => {
     const response = await api.post<Message>('/messages/', data);
     return response.data;
@@ -445,6 +547,56 @@ export const messagesAPI = {
   markAsRead: async (messageId: number): Promise<void> => {
     await api.put(`/messages/${messageId}/read`);
   },
+
+  // Live message events; reconnects with backoff and calls onReconnect so callers can
+  // re-fetch whatever they missed. Returns a function that closes the socket.
+  subscribe: (
+    onEvent: (event: MessageSocketEvent) => void,
+    onReconnect?: () => void
+  ): (() => void) => {
+    const wsBase = API_V1.replace(/^http/, 'ws');
+    let socket: WebSocket | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let attempts = 0;
+    let closed = false;
+
+    const connect = () => {
+      const token = localStorage.getItem('token');
+      if (!token || closed) return;
+      socket = new WebSocket(`${wsBase}/messages/ws?token=${encodeURIComponent(token)}`);
+      socket.onopen = () => {
+        if (attempts > 0) onReconnect?.();
+        attempts = 0;
+      };
+      socket.onmessage = (msg) => {
+        const event = JSON.parse(msg.data) as MessageSocketEvent;
+        if (event.type !== 'ping') onEvent(event);
+      };
+      socket.onclose = (e) => {
+        // 1008: token rejected, retrying won't help
+        if (closed || e.code === 1008) return;
+        attempts += 1;
+        retryTimer = setTimeout(connect, Math.min(30000, 1000 * 2 ** Math.min(attempts, 5)));
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      socket?.close();
+    };
+  },
+};
+
+// Full-text search across messages, plans, planned workouts and rides
+export const searchAPI = {
+  search: async (q: string, types?: SearchResultType[], limit: number = 20): Promise<SearchResult[]> => {
+    const response = await api.get<SearchResult[]>('/search/', {
+      params: { q, types: types?.join(','), limit },
+    });
+    return response.data;
+  },
 };
 
 // Integrations API (Strava, etc.)
@@ -159,6 +159,11 @@ export interface TrainerAssignment {
 }
 
 // Training Plans
+export interface CalendarWorkout extends PlannedWorkout {
+  plan_title: string;
+  athlete_id: number;
+}
+
 export interface TrainingPlan {
   id: number;
   trainer_id: number;
@@ -355,6 +360,28 @@ export interface MessageWithUsers extends Message {
   recipient_email: string;
 }
 
+export interface ThreadParticipant {
+  id: number;
+  full_name?: string;
+  email: string;
+}
+
+// Message within a thread; the recipient is the participant who didn't send it
+export interface ThreadMessage {
+  id: number;
+  sender_id: number;
+  content: string;
+  is_read: boolean;
+  created_at: string;
+  read_at?: string;
+}
+
+export interface MessageThread {
+  participants: ThreadParticipant[];
+  messages: ThreadMessage[]; // oldest first
+  next_before_id?: number | null;
+}
+
 export interface Conversation {
   user_id: number;
   user_name?: string;
@@ -369,6 +396,26 @@ export interface MessageCreate {
   content: string;
 }
 
+// Pushed over the messages WebSocket
+export type MessageSocketEvent =
+  | { type: 'message'; message: Message }
+  | { type: 'read'; reader_id: number; partner_id: number; marked: number; message_id?: number }
+  | { type: 'ping' };
+
+// Search
+export type SearchResultType = 'message' | 'training_plan' | 'planned_workout' | 'ride';
+
+export interface SearchResult {
+  type: SearchResultType;
+  id: number;
+  title: string;
+  snippet: string; // matched terms wrapped in **
+  rank: number;
+  date?: string;
+  training_plan_id?: number;
+  user_id?: number; // message partner, plan athlete or ride owner
+}
+
 // Integrations
 export interface IntegrationStatus {
   provider: string;
@@ -406,3 +453,18 @@ export interface SyncResult {
   activities_synced: number;
   message: string;
 }
+
+export interface ParseJob {
+  id: number;
+  filename: string;
+  status: 'pending' | 'running' | 'succeeded' | 'failed';
+  attempts: number;
+  max_attempts: number;
+  error?: string;
+  result?: any;
+  cached: boolean;
+  created_at: string;
+  next_attempt_at?: string;
+  started_at?: string;
+  finished_at?: string;
+}